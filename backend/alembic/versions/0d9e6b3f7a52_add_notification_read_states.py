@@ -0,0 +1,36 @@
+"""add per-user notification read states
+
+Revision ID: 0d9e6b3f7a52
+Revises: f2c8a5d1e937
+Create Date: 2026-10-17 23:18:45.207713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d9e6b3f7a52'
+down_revision: Union[str, Sequence[str], None] = 'f2c8a5d1e937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('notification_read_states',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('read_through', sa.DateTime(), nullable=True),
+    sa.Column('read_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('notification_read_states')
@@ -0,0 +1,49 @@
+"""add resources table and sync job inventory counts
+
+Revision ID: 2f6a8d14c9e3
+Revises: 7b3e91c0d2a4
+Create Date: 2026-10-17 15:21:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a8d14c9e3'
+down_revision: Union[str, Sequence[str], None] = '7b3e91c0d2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('resources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('resource_type', sa.String(length=255), nullable=True),
+    sa.Column('native_id', sa.String(length=1024), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('policy_fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('violations', sa.Text(), nullable=True),
+    sa.Column('first_seen', sa.DateTime(), nullable=False),
+    sa.Column('last_seen', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['cloud_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'native_id', name='uq_resource_account_native_id')
+    )
+    op.add_column('sync_jobs', sa.Column('resources_total', sa.Integer(), nullable=True))
+    op.add_column('sync_jobs', sa.Column('resources_changed', sa.Integer(), nullable=True))
+    op.add_column('sync_jobs', sa.Column('resources_deleted', sa.Integer(), nullable=True))
+    op.add_column('sync_jobs', sa.Column('resources_skipped', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sync_jobs', 'resources_skipped')
+    op.drop_column('sync_jobs', 'resources_deleted')
+    op.drop_column('sync_jobs', 'resources_changed')
+    op.drop_column('sync_jobs', 'resources_total')
+    op.drop_table('resources')
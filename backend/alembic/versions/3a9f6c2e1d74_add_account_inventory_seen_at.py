@@ -0,0 +1,33 @@
+"""add inventory_seen_at to cloud accounts
+
+Revision ID: 3a9f6c2e1d74
+Revises: 5b1e7c4d2f86
+Create Date: 2026-10-17 23:58:41.118554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a9f6c2e1d74'
+down_revision: Union[str, Sequence[str], None] = '5b1e7c4d2f86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cloud_accounts', sa.Column('inventory_seen_at', sa.DateTime(), nullable=True))
+    # Syncs stopped touching unchanged rows; carry the last full touch over.
+    op.execute(
+        "UPDATE cloud_accounts SET inventory_seen_at = "
+        "(SELECT max(last_seen) FROM resources WHERE resources.account_id = cloud_accounts.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('cloud_accounts', 'inventory_seen_at')
@@ -0,0 +1,41 @@
+"""add notification archive table
+
+Revision ID: 5b1e7c4d2f86
+Revises: 0d9e6b3f7a52
+Create Date: 2026-10-17 23:52:14.846302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c4d2f86'
+down_revision: Union[str, Sequence[str], None] = '0d9e6b3f7a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('notification_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('type', sa.Enum('POLICY_VIOLATION', 'ACCOUNT_SYNC', 'BUILD_COMPLETE', 'PROVISIONING', 'BROADCAST', name='notificationtype', create_type=False), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('policy_id', sa.Integer(), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('occurrences', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notification_archive_created_at_id', 'notification_archive', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_archive_created_at_id', table_name='notification_archive')
+    op.drop_table('notification_archive')
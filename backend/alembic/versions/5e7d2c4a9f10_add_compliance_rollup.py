@@ -0,0 +1,54 @@
+"""add compliance rollup
+
+Revision ID: 5e7d2c4a9f10
+Revises: a3c59e0f2b71
+Create Date: 2026-10-17 10:03:15.527810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7d2c4a9f10'
+down_revision: Union[str, Sequence[str], None] = 'a3c59e0f2b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('compliance_rollup',
+    sa.Column('provider', sa.Enum('AWS', 'AZURE', 'GCP', name='cloudprovider', create_type=False), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('compliant', sa.Integer(), nullable=False),
+    sa.Column('non_compliant', sa.Integer(), nullable=False),
+    sa.Column('warning', sa.Integer(), nullable=False),
+    sa.Column('unknown', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['cloud_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('provider', 'account_id')
+    )
+    # Backfill from the existing evaluations.
+    op.execute(
+        """
+        INSERT INTO compliance_rollup
+            (provider, account_id, compliant, non_compliant, warning, unknown, updated_at)
+        SELECT a.provider, e.account_id,
+               SUM(CASE WHEN e.status = 'COMPLIANT' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN e.status = 'NON_COMPLIANT' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN e.status = 'WARNING' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN e.status = 'UNKNOWN' THEN 1 ELSE 0 END),
+               MAX(e.last_checked_at)
+        FROM policy_evaluations e
+        JOIN cloud_accounts a ON a.id = e.account_id
+        GROUP BY a.provider, e.account_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('compliance_rollup')
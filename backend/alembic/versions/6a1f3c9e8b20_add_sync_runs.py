@@ -0,0 +1,55 @@
+"""add sync runs telemetry table
+
+Revision ID: 6a1f3c9e8b20
+Revises: d5b8f2e61a47
+Create Date: 2026-10-17 21:12:53.407719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1f3c9e8b20'
+down_revision: Union[str, Sequence[str], None] = 'd5b8f2e61a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.Enum('AWS', 'AZURE', 'GCP', name='cloudprovider', create_type=False), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='syncjobstatus', create_type=False), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=False),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('auth_ms', sa.Float(), nullable=True),
+    sa.Column('list_ms', sa.Float(), nullable=True),
+    sa.Column('fetch_ms', sa.Float(), nullable=True),
+    sa.Column('evaluate_ms', sa.Float(), nullable=True),
+    sa.Column('persist_ms', sa.Float(), nullable=True),
+    sa.Column('resources', sa.Integer(), nullable=False),
+    sa.Column('resources_per_second', sa.Float(), nullable=True),
+    sa.Column('api_calls', sa.Integer(), nullable=False),
+    sa.Column('bytes_transferred', sa.BigInteger(), nullable=False),
+    sa.Column('errors', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['cloud_accounts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['job_id'], ['sync_jobs.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_runs_account_started_at', 'sync_runs', ['account_id', 'started_at'], unique=False)
+    op.create_index('ix_sync_runs_started_at', 'sync_runs', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_runs_started_at', table_name='sync_runs')
+    op.drop_index('ix_sync_runs_account_started_at', table_name='sync_runs')
+    op.drop_table('sync_runs')
@@ -0,0 +1,49 @@
+"""add sync jobs queue
+
+Revision ID: 7b3e91c0d2a4
+Revises: e4a0d9b7c512
+Create Date: 2026-10-17 14:02:18.331907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e91c0d2a4'
+down_revision: Union[str, Sequence[str], None] = 'e4a0d9b7c512'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', name='syncjobstatus'), nullable=False),
+    sa.Column('stage', sa.String(length=50), nullable=True),
+    sa.Column('progress', sa.Integer(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('lease_owner', sa.String(length=100), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['cloud_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_jobs_account_id', 'sync_jobs', ['account_id'], unique=False)
+    op.create_index('ix_sync_jobs_status_created_at', 'sync_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_jobs_status_created_at', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_account_id', table_name='sync_jobs')
+    op.drop_table('sync_jobs')
+    sa.Enum(name='syncjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""add an id watermark to notification read states
+
+Revision ID: 8e2b5f0c7d14
+Revises: c4d7e1f09a36
+Create Date: 2026-10-18 01:12:37.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2b5f0c7d14'
+down_revision: Union[str, Sequence[str], None] = 'c4d7e1f09a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notification_read_states', sa.Column('read_through_id', sa.Integer(), nullable=True))
+    # Existing marks covered every notification written so far.
+    op.execute(
+        "UPDATE notification_read_states SET read_through_id = (SELECT max(id) FROM notifications) "
+        "WHERE read_through IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('notification_read_states', 'read_through_id')
@@ -0,0 +1,60 @@
+"""add resource inventory columns, indexes and evaluation resource link
+
+Revision ID: 9c4e1a7b3d58
+Revises: 2f6a8d14c9e3
+Create Date: 2026-10-17 18:02:11.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1a7b3d58'
+down_revision: Union[str, Sequence[str], None] = '2f6a8d14c9e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored snapshots predate region/config and would all hash as changed;
+    # the next sync of each account repopulates them.
+    op.execute("DELETE FROM resources")
+    op.add_column('resources', sa.Column('provider', sa.Enum('AWS', 'AZURE', 'GCP', name='cloudprovider', create_type=False), nullable=False))
+    op.add_column('resources', sa.Column('region', sa.String(length=100), nullable=True))
+    op.add_column('resources', sa.Column('config', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.alter_column('resources', 'violations',
+               existing_type=sa.Text(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='violations::jsonb')
+    op.create_index('ix_resources_type_account', 'resources', ['resource_type', 'account_id'], unique=False)
+    op.create_index('ix_resources_provider_region', 'resources', ['provider', 'region'], unique=False)
+    op.create_index('ix_resources_config', 'resources', ['config'], unique=False, postgresql_using='gin')
+    op.create_index('ix_resources_violations', 'resources', ['violations'], unique=False, postgresql_using='gin')
+    op.add_column('policy_evaluations', sa.Column('resource_ref_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_policy_evaluations_resource_ref_id'), 'policy_evaluations', ['resource_ref_id'], unique=False)
+    op.create_foreign_key('fk_policy_evaluations_resource_ref_id', 'policy_evaluations', 'resources', ['resource_ref_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_policy_evaluations_resource_ref_id', 'policy_evaluations', type_='foreignkey')
+    op.drop_index(op.f('ix_policy_evaluations_resource_ref_id'), table_name='policy_evaluations')
+    op.drop_column('policy_evaluations', 'resource_ref_id')
+    op.drop_index('ix_resources_violations', table_name='resources', postgresql_using='gin')
+    op.drop_index('ix_resources_config', table_name='resources', postgresql_using='gin')
+    op.drop_index('ix_resources_provider_region', table_name='resources')
+    op.drop_index('ix_resources_type_account', table_name='resources')
+    op.alter_column('resources', 'violations',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.Text(),
+               existing_nullable=True,
+               postgresql_using='violations::text')
+    op.drop_column('resources', 'config')
+    op.drop_column('resources', 'region')
+    op.drop_column('resources', 'provider')
@@ -0,0 +1,36 @@
+"""add keyset pagination indexes
+
+Revision ID: a3c59e0f2b71
+Revises: 83116199874d
+Create Date: 2026-10-17 09:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c59e0f2b71'
+down_revision: Union[str, Sequence[str], None] = '83116199874d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_policies_created_at_id', 'policies', ['created_at', 'id'], unique=False)
+    op.create_index('ix_cloud_accounts_created_at_id', 'cloud_accounts', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_policy_evaluations_last_checked_at_id', 'policy_evaluations', ['last_checked_at', 'id'], unique=False
+    )
+    op.create_index('ix_notifications_created_at_id', 'notifications', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_created_at_id', table_name='notifications')
+    op.drop_index('ix_policy_evaluations_last_checked_at_id', table_name='policy_evaluations')
+    op.drop_index('ix_cloud_accounts_created_at_id', table_name='cloud_accounts')
+    op.drop_index('ix_policies_created_at_id', table_name='policies')
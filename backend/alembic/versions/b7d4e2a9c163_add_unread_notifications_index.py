@@ -0,0 +1,31 @@
+"""add partial index on unread notifications
+
+Revision ID: b7d4e2a9c163
+Revises: 6a1f3c9e8b20
+Create Date: 2026-10-17 22:04:31.118205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e2a9c163'
+down_revision: Union[str, Sequence[str], None] = '6a1f3c9e8b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_notifications_unread', 'notifications', ['id'], unique=False,
+        postgresql_where=sa.text('NOT is_read'), sqlite_where=sa.text('is_read = 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_unread', table_name='notifications')
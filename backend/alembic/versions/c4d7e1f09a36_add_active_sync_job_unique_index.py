@@ -0,0 +1,41 @@
+"""allow one active sync job per account
+
+Revision ID: c4d7e1f09a36
+Revises: 3a9f6c2e1d74
+Create Date: 2026-10-18 00:06:12.540921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e1f09a36'
+down_revision: Union[str, Sequence[str], None] = '3a9f6c2e1d74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = "status IN ('QUEUED', 'RUNNING')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the oldest active job per account; duplicates queued by concurrent schedulers are failed.
+    op.execute(
+        "UPDATE sync_jobs SET status = 'FAILED', "
+        "message = 'Duplicate of another active job for this account', lease_owner = NULL, "
+        "finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP "
+        f"WHERE {ACTIVE} AND id NOT IN ("
+        f"SELECT min(id) FROM sync_jobs WHERE {ACTIVE} GROUP BY account_id)"
+    )
+    op.create_index(
+        'uq_sync_jobs_active_account', 'sync_jobs', ['account_id'], unique=True,
+        postgresql_where=sa.text(ACTIVE), sqlite_where=sa.text(ACTIVE),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_sync_jobs_active_account', table_name='sync_jobs')
@@ -0,0 +1,65 @@
+"""add evaluation status history and compliance trends
+
+Revision ID: c81f4b6d3e29
+Revises: 5e7d2c4a9f10
+Create Date: 2026-10-17 11:26:51.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4b6d3e29'
+down_revision: Union[str, Sequence[str], None] = '5e7d2c4a9f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_STATUS = sa.Enum('COMPLIANT', 'NON_COMPLIANT', 'WARNING', 'UNKNOWN', name='compliancestatus', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('evaluation_status_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('evaluation_id', sa.Integer(), nullable=False),
+    sa.Column('policy_id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('previous_status', _STATUS, nullable=True),
+    sa.Column('status', _STATUS, nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_evaluation_status_history_evaluation_id', 'evaluation_status_history', ['evaluation_id'], unique=False)
+    op.create_index('ix_evaluation_status_history_changed_at', 'evaluation_status_history', ['changed_at'], unique=False)
+    op.create_index(
+        'ix_evaluation_status_history_account_changed', 'evaluation_status_history', ['account_id', 'changed_at'], unique=False
+    )
+    op.create_table('compliance_trend_hourly',
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('compliant', sa.Integer(), nullable=False),
+    sa.Column('non_compliant', sa.Integer(), nullable=False),
+    sa.Column('warning', sa.Integer(), nullable=False),
+    sa.Column('unknown', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('bucket_start')
+    )
+    # Seed the trend with today's totals so running sums start from the current state.
+    op.execute(
+        """
+        INSERT INTO compliance_trend_hourly (bucket_start, compliant, non_compliant, warning, unknown)
+        SELECT MAX(updated_at), SUM(compliant), SUM(non_compliant), SUM(warning), SUM(unknown)
+        FROM compliance_rollup
+        HAVING COUNT(*) > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('compliance_trend_hourly')
+    op.drop_index('ix_evaluation_status_history_account_changed', table_name='evaluation_status_history')
+    op.drop_index('ix_evaluation_status_history_changed_at', table_name='evaluation_status_history')
+    op.drop_index('ix_evaluation_status_history_evaluation_id', table_name='evaluation_status_history')
+    op.drop_table('evaluation_status_history')
@@ -0,0 +1,46 @@
+"""add sync batches for bulk syncs
+
+Revision ID: d5b8f2e61a47
+Revises: 9c4e1a7b3d58
+Create Date: 2026-10-17 19:40:26.884130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b8f2e61a47'
+down_revision: Union[str, Sequence[str], None] = '9c4e1a7b3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_batches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.Enum('AWS', 'AZURE', 'GCP', name='cloudprovider', create_type=False), nullable=True),
+    sa.Column('account_status', sa.Enum('CONNECTED', 'PENDING', 'ERROR', name='accountstatus', create_type=False), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('dispatched', sa.Integer(), nullable=False),
+    sa.Column('max_account_id', sa.Integer(), nullable=False),
+    sa.Column('cursors', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('sync_jobs', sa.Column('batch_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_sync_jobs_batch_id'), 'sync_jobs', ['batch_id'], unique=False)
+    op.create_foreign_key('fk_sync_jobs_batch_id', 'sync_jobs', 'sync_batches', ['batch_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_sync_jobs_batch_id', 'sync_jobs', type_='foreignkey')
+    op.drop_index(op.f('ix_sync_jobs_batch_id'), table_name='sync_jobs')
+    op.drop_column('sync_jobs', 'batch_id')
+    op.drop_table('sync_batches')
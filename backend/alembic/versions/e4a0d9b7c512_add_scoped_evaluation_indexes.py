@@ -0,0 +1,35 @@
+"""add account and policy scoped evaluation indexes
+
+Revision ID: e4a0d9b7c512
+Revises: c81f4b6d3e29
+Create Date: 2026-10-17 12:40:08.331976
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a0d9b7c512'
+down_revision: Union[str, Sequence[str], None] = 'c81f4b6d3e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # last_checked_at alone is served by ix_policy_evaluations_last_checked_at_id.
+    op.create_index(
+        'ix_policy_evaluations_account_status', 'policy_evaluations', ['account_id', 'status', 'last_checked_at'], unique=False
+    )
+    op.create_index(
+        'ix_policy_evaluations_policy_status', 'policy_evaluations', ['policy_id', 'status', 'last_checked_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_policy_evaluations_policy_status', table_name='policy_evaluations')
+    op.drop_index('ix_policy_evaluations_account_status', table_name='policy_evaluations')
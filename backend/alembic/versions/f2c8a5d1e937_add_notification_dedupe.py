@@ -0,0 +1,41 @@
+"""add notification dedupe key and occurrence counter
+
+Revision ID: f2c8a5d1e937
+Revises: b7d4e2a9c163
+Create Date: 2026-10-17 22:41:09.530276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a5d1e937'
+down_revision: Union[str, Sequence[str], None] = 'b7d4e2a9c163'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('policy_id', sa.Integer(), nullable=True))
+    op.add_column('notifications', sa.Column('account_id', sa.Integer(), nullable=True))
+    op.add_column('notifications', sa.Column('dedupe_key', sa.String(length=100), nullable=True))
+    op.add_column('notifications', sa.Column('occurrences', sa.Integer(), nullable=False, server_default='1'))
+    op.alter_column('notifications', 'occurrences', server_default=None)
+    op.create_foreign_key('fk_notifications_policy_id', 'notifications', 'policies', ['policy_id'], ['id'], ondelete='SET NULL')
+    op.create_foreign_key('fk_notifications_account_id', 'notifications', 'cloud_accounts', ['account_id'], ['id'], ondelete='SET NULL')
+    op.create_index('ix_notifications_dedupe_key_created_at', 'notifications', ['dedupe_key', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_dedupe_key_created_at', table_name='notifications')
+    op.drop_constraint('fk_notifications_account_id', 'notifications', type_='foreignkey')
+    op.drop_constraint('fk_notifications_policy_id', 'notifications', type_='foreignkey')
+    op.drop_column('notifications', 'occurrences')
+    op.drop_column('notifications', 'dedupe_key')
+    op.drop_column('notifications', 'account_id')
+    op.drop_column('notifications', 'policy_id')
@@ -0,0 +1,96 @@
+"""
+Cloud credential validation with a per-account result cache.
+
+Validating means one authenticated inventory call per account, so results
+are cached for ``CREDENTIAL_VALIDATION_TTL_SECONDS``. Each entry remembers a
+fingerprint of the credential fields it was computed for: editing the
+credential, access method or tenant drops the entry right away (see
+:func:`invalidate`), and an entry made stale by a write in another process
+is recomputed instead of served.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime
+from typing import NamedTuple, Sequence
+
+from app import connectors, models, schemas
+from app.cache import LRUCache
+from app.config import settings
+
+CREDENTIAL_FIELDS = ("access_method", "credential", "tenant_id")
+
+
+class CachedValidation(NamedTuple):
+    fingerprint: str
+    expires_at: float
+    result: schemas.AccountValidationRead
+
+
+validations: LRUCache[int, CachedValidation] = LRUCache(settings.credential_validation_cache_size)
+
+
+def credential_fingerprint(account: models.CloudAccount) -> str:
+    digest = hashlib.sha256()
+    for value in (account.provider.value, account.external_id, *(getattr(account, f) for f in CREDENTIAL_FIELDS)):
+        digest.update(f"{value or ''}\0".encode())
+    return digest.hexdigest()
+
+
+def invalidate(account_id: int) -> None:
+    validations.discard(account_id)
+
+
+def _cached(account: models.CloudAccount, now: float) -> schemas.AccountValidationRead | None:
+    entry = validations.get(account.id)
+    if entry is None or entry.expires_at <= now or entry.fingerprint != credential_fingerprint(account):
+        return None
+    return entry.result.model_copy(update={"cached": True})
+
+
+async def validate_accounts(
+    accounts: Sequence[models.CloudAccount],
+    *,
+    force: bool = False,
+) -> list[schemas.AccountValidationRead]:
+    """
+    Validate the accounts' credentials, serving unexpired cached results.
+
+    Accounts that miss the cache (or all of them, with ``force``) are checked
+    concurrently on the connector loop, at most
+    ``CREDENTIAL_VALIDATION_CONCURRENCY`` at a time. Results come back in
+    the order of ``accounts``.
+    """
+    now = time.monotonic()
+    results: dict[int, schemas.AccountValidationRead] = {}
+    pending: list[models.CloudAccount] = []
+    for account in accounts:
+        cached = None if force else _cached(account, now)
+        if cached is not None:
+            results[account.id] = cached
+        else:
+            pending.append(account)
+
+    if pending:
+        fingerprints = {account.id: credential_fingerprint(account) for account in pending}
+        errors = await asyncio.wrap_future(connectors.runtime.submit(connectors.validate_accounts(
+            [connectors.account_ref(account) for account in pending],
+            settings.credential_validation_concurrency,
+        )))
+        validated_at = datetime.utcnow()
+        expires_at = time.monotonic() + settings.credential_validation_ttl_seconds
+        for account in pending:
+            error = errors[account.id]
+            result = schemas.AccountValidationRead(
+                account_id=account.id,
+                is_valid=error is None,
+                message=error or "Credentials validated successfully",
+                provider=account.provider.value,
+                validated_at=validated_at,
+            )
+            validations.put(account.id, CachedValidation(fingerprints[account.id], expires_at, result))
+            results[account.id] = result
+
+    return [results[account.id] for account in accounts]
@@ -0,0 +1,139 @@
+"""In-process caches for hot read paths."""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from app.config import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    generation: int
+    body: bytes
+    etag: str
+    created_at: float
+
+
+class GenerationCache:
+    """
+    Cache a single rendered response body, invalidated by a generation counter.
+
+    Writers call :meth:`invalidate` after committing; readers recompute only
+    when the generation has moved or the entry is older than ``ttl_seconds``.
+    The TTL bounds staleness from writes made by other worker processes,
+    which cannot bump this process's counter.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._entry: Optional[CachedBody] = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def get(self, render: Callable[[], bytes]) -> CachedBody:
+        entry = self._entry
+        generation = self._generation
+        if (
+            entry is not None
+            and entry.generation == generation
+            and time.monotonic() - entry.created_at < self.ttl_seconds
+        ):
+            return entry
+
+        body = render()
+        entry = CachedBody(
+            generation=generation,
+            body=body,
+            etag='"{}"'.format(hashlib.sha1(body).hexdigest()),
+            created_at=time.monotonic(),
+        )
+        with self._lock:
+            # Only publish if no write landed while rendering.
+            if self._generation == generation:
+                self._entry = entry
+        return entry
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe mapping that keeps at most ``maxsize`` entries, evicting the
+    least recently used one when full.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[K], bool]) -> int:
+        """Drop every entry whose key satisfies ``predicate``; return how many were dropped."""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True when an If-None-Match header covers ``etag``."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+dashboard_cache = GenerationCache(ttl_seconds=settings.dashboard_cache_ttl_seconds)
@@ -1,21 +1,70 @@
 from __future__ import annotations
 
-from pydantic import Field, field_validator
+from typing import Optional
+
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings
 
 
+DEFAULT_JWT_SECRET = "change-me"
+
+
 def _default_cors() -> list[str]:
     return ["http://localhost:5173"]
 
 
 class Settings(BaseSettings):
     app_name: str = Field(default="Cloud Guard Platform", alias="APP_NAME")
+    environment: str = Field(default="development", alias="ENVIRONMENT")
     database_url: str = Field(default="sqlite:///./cloud_guard.db", alias="DATABASE_URL")
     demo_seed: bool = Field(default=True, alias="DEMO_SEED")
     cors_origins: list[str] = Field(default_factory=_default_cors, alias="CORS_ORIGINS")
-    jwt_secret: str = Field(default="change-me", alias="JWT_SECRET")
+    jwt_secret: str = Field(default=DEFAULT_JWT_SECRET, alias="JWT_SECRET")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     access_token_expire_minutes: int = Field(default=60, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    refresh_token_expire_days: int = Field(default=7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    user_cache_ttl_seconds: float = Field(default=60, alias="USER_CACHE_TTL_SECONDS")
+    user_cache_size: int = Field(default=1024, alias="USER_CACHE_SIZE")
+    dashboard_cache_ttl_seconds: float = Field(default=30, alias="DASHBOARD_CACHE_TTL_SECONDS")
+    evaluation_workers: int = Field(default=0, alias="EVALUATION_WORKERS")
+    compiled_policy_cache_size: int = Field(default=1024, alias="COMPILED_POLICY_CACHE_SIZE")
+    sync_workers: int = Field(default=0, alias="SYNC_WORKERS")
+    sync_poll_interval_seconds: float = Field(default=2, alias="SYNC_POLL_INTERVAL_SECONDS")
+    sync_lease_seconds: float = Field(default=300, alias="SYNC_LEASE_SECONDS")
+    sync_scheduler_enabled: bool = Field(default=False, alias="SYNC_SCHEDULER_ENABLED")
+    sync_max_concurrent: int = Field(default=20, alias="SYNC_MAX_CONCURRENT")
+    sync_jitter_ratio: float = Field(default=0.1, alias="SYNC_JITTER_RATIO")
+    sync_schedule_refresh_seconds: float = Field(default=60, alias="SYNC_SCHEDULE_REFRESH_SECONDS")
+    sync_provider_in_flight: dict[str, int] = Field(
+        default_factory=lambda: {"aws": 10, "azure": 5, "gcp": 10}, alias="SYNC_PROVIDER_IN_FLIGHT"
+    )
+    cloud_connector_mode: str = Field(default="live", alias="CLOUD_CONNECTOR_MODE", pattern="^(live|fake)$")
+    connector_concurrency: dict[str, int] = Field(
+        default_factory=lambda: {"aws": 8, "azure": 4, "gcp": 8}, alias="CONNECTOR_CONCURRENCY"
+    )
+    # Inventory API requests per second per provider (token bucket; burst of one second's worth).
+    connector_rate_limits: dict[str, float] = Field(
+        default_factory=lambda: {"aws": 20, "azure": 3, "gcp": 10}, alias="CONNECTOR_RATE_LIMITS"
+    )
+    connector_queue_pages: int = Field(default=8, alias="CONNECTOR_QUEUE_PAGES")
+    connector_timeout_seconds: float = Field(default=30, alias="CONNECTOR_TIMEOUT_SECONDS")
+    fake_cloud_url: Optional[str] = Field(default=None, alias="FAKE_CLOUD_URL")
+    fake_cloud_resources: int = Field(default=1000, alias="FAKE_CLOUD_RESOURCES")
+    fake_cloud_latency_ms: float = Field(default=0, alias="FAKE_CLOUD_LATENCY_MS")
+    credential_validation_ttl_seconds: float = Field(default=300, alias="CREDENTIAL_VALIDATION_TTL_SECONDS")
+    credential_validation_cache_size: int = Field(default=10000, alias="CREDENTIAL_VALIDATION_CACHE_SIZE")
+    credential_validation_concurrency: int = Field(default=16, alias="CREDENTIAL_VALIDATION_CONCURRENCY")
+    notification_stream_heartbeat_seconds: float = Field(default=15, alias="NOTIFICATION_STREAM_HEARTBEAT_SECONDS")
+    notification_stream_queue_size: int = Field(default=256, alias="NOTIFICATION_STREAM_QUEUE_SIZE")
+    notification_stream_poll_seconds: float = Field(default=5, alias="NOTIFICATION_STREAM_POLL_SECONDS")
+    notification_stream_poll_lag_seconds: float = Field(default=60, alias="NOTIFICATION_STREAM_POLL_LAG_SECONDS")
+    notification_writer_flush_ms: float = Field(default=5, alias="NOTIFICATION_WRITER_FLUSH_MS")
+    notification_writer_max_batch: int = Field(default=500, alias="NOTIFICATION_WRITER_MAX_BATCH")
+    notification_writer_durable: bool = Field(default=False, alias="NOTIFICATION_WRITER_DURABLE")
+    notification_writer_timeout_seconds: float = Field(default=30, alias="NOTIFICATION_WRITER_TIMEOUT_SECONDS")
+    notification_dedupe_window_seconds: float = Field(default=3600, alias="NOTIFICATION_DEDUPE_WINDOW_SECONDS")
+    notification_retention_days: int = Field(default=90, alias="NOTIFICATION_RETENTION_DAYS")
+    notification_archive_batch_size: int = Field(default=1000, alias="NOTIFICATION_ARCHIVE_BATCH_SIZE")
 
     model_config = {
         "env_file": ".env",
@@ -32,5 +81,12 @@ class Settings(BaseSettings):
             return _default_cors()
         return list(value)
 
+    @model_validator(mode="after")
+    def require_jwt_secret(self) -> Settings:
+        # Anyone who knows the default could sign tokens for any user.
+        if self.environment != "development" and self.jwt_secret == DEFAULT_JWT_SECRET:
+            raise ValueError(f"JWT_SECRET must be set when ENVIRONMENT is {self.environment!r}")
+        return self
+
 
 settings = Settings()
@@ -0,0 +1,133 @@
+"""Provider inventory connectors.
+
+``fetch_inventory`` is the synchronous entry point used by sync workers; it
+runs the connector for the account's provider on the shared connector loop
+and returns the account's resource snapshots. Pages are collected into one
+list: a sync diffs the complete inventory against the stored one (resources
+missing from it are deleted), so it cannot start before the last page.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app import models
+from app.config import settings
+from app.connectors.aws import AWSConnector
+from app.connectors.azure import AzureConnector
+from app.connectors.base import AccountRef, Connector, ConnectorError, ConnectorRuntime
+from app.connectors.gcp import GCPConnector
+from app.sync_telemetry import SyncMetrics, current_metrics
+
+__all__ = [
+    "AccountRef",
+    "ConnectorError",
+    "account_ref",
+    "fetch_inventory",
+    "get_connector",
+    "shutdown",
+    "validate_accounts",
+]
+
+CONNECTORS: dict[models.CloudProvider, type[Connector]] = {
+    models.CloudProvider.AWS: AWSConnector,
+    models.CloudProvider.AZURE: AzureConnector,
+    models.CloudProvider.GCP: GCPConnector,
+}
+
+runtime = ConnectorRuntime()
+_connectors: dict[models.CloudProvider, Connector] = {}
+
+
+def _fake_cloud_base(provider: models.CloudProvider) -> str:
+    return f"{(settings.fake_cloud_url or 'http://fake-cloud').rstrip('/')}/{provider.value}"
+
+
+def _build(provider: models.CloudProvider) -> Connector:
+    concurrency = settings.connector_concurrency.get(provider.value, 4)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    base_url: Optional[str] = None
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    if settings.cloud_connector_mode == "fake":
+        base_url = _fake_cloud_base(provider)
+        if not settings.fake_cloud_url:
+            from app.connectors import fake_cloud
+
+            transport = httpx.ASGITransport(app=fake_cloud.app)
+    client = httpx.AsyncClient(limits=limits, timeout=settings.connector_timeout_seconds, transport=transport)
+    rate = settings.connector_rate_limits.get(provider.value, 0)
+    return CONNECTORS[provider](client, concurrency, base_url, rate)
+
+
+async def get_connector(provider: models.CloudProvider) -> Connector:
+    """Return the provider's connector, creating it on the connector loop on first use."""
+    connector = _connectors.get(provider)
+    if connector is None:
+        connector = _connectors[provider] = _build(provider)
+    return connector
+
+
+async def _collect(account: AccountRef, metrics: SyncMetrics) -> list[dict]:
+    token = current_metrics.set(metrics)
+    try:
+        connector = await get_connector(account.provider)
+        with metrics.phase("auth"):
+            account = await connector.authenticate(account)
+        resources: list[dict] = []
+        with metrics.phase("list"):
+            async for page in connector.iter_pages(account):
+                resources.extend(page)
+        return resources
+    finally:
+        current_metrics.reset(token)
+
+
+def account_ref(account: models.CloudAccount) -> AccountRef:
+    ref = AccountRef.of(account)
+    if settings.cloud_connector_mode == "fake" and not ref.credential:
+        # The fake cloud ignores credentials; let demo accounts without one sync.
+        ref = ref._replace(credential="fake:fake")
+    return ref
+
+
+def fetch_inventory(account: models.CloudAccount, metrics: Optional[SyncMetrics] = None) -> list[dict]:
+    """Fetch every resource snapshot of the account (blocking), timing and counting calls on ``metrics``."""
+    return runtime.run(_collect(account_ref(account), metrics or SyncMetrics()))
+
+
+async def validate_accounts(accounts: list[AccountRef], concurrency: int) -> dict[int, Optional[str]]:
+    """
+    Check each account's credential with one authenticated call.
+
+    At most ``concurrency`` accounts are checked at once (and each provider's
+    own request limit still applies). Returns the error message per account
+    id, ``None`` when the credential was accepted.
+    """
+    limit = asyncio.Semaphore(max(concurrency, 1))
+
+    async def check(account: AccountRef) -> tuple[int, Optional[str]]:
+        async with limit:
+            connector = await get_connector(account.provider)
+            try:
+                await asyncio.wait_for(connector.validate(account), settings.connector_timeout_seconds)
+            except ConnectorError as exc:
+                return account.id, str(exc)
+            except asyncio.TimeoutError:
+                return account.id, f"{account.provider.value} did not respond within {settings.connector_timeout_seconds:g}s"
+            return account.id, None
+
+    return dict(await asyncio.gather(*(check(account) for account in accounts)))
+
+
+async def _close_clients() -> None:
+    clients = [connector.client for connector in _connectors.values()]
+    _connectors.clear()
+    await asyncio.gather(*(client.aclose() for client in clients))
+
+
+def shutdown() -> None:
+    if _connectors:
+        runtime.run(_close_clients(), timeout=5)
+    runtime.stop()
@@ -0,0 +1,55 @@
+"""Azure inventory through Azure Resource Graph."""
+from __future__ import annotations
+
+from typing import Optional
+
+from app import models
+from app.connectors.base import AccountRef, Connector, ConnectorError, Page, flatten
+
+API_VERSION = "2021-03-01"
+
+ACTIONS_BY_TYPE: dict[str, list[str]] = {
+    "microsoft.storage/storageaccounts": ["Microsoft.Storage/storageAccounts/write"],
+    "microsoft.compute/virtualmachines": ["Microsoft.Compute/virtualMachines/write"],
+    "microsoft.keyvault/vaults": ["Microsoft.KeyVault/vaults/write"],
+    "microsoft.network/networksecuritygroups": ["Microsoft.Network/networkSecurityGroups/write"],
+}
+
+
+class AzureConnector(Connector):
+    provider = models.CloudProvider.AZURE
+    resource_types = tuple(ACTIONS_BY_TYPE)
+    default_base_url = "https://management.azure.com"
+
+    async def fetch_page(self, account: AccountRef, resource_type: str, token: Optional[str]) -> Page:
+        if not account.credential:
+            raise ConnectorError("Azure account has no access token configured")
+        options: dict = {"$top": 1000}
+        if token:
+            options["$skipToken"] = token
+        data = await self.request(
+            "POST",
+            f"{self.base_url}/providers/Microsoft.ResourceGraph/resources",
+            params={"api-version": API_VERSION},
+            headers={"Authorization": f"Bearer {account.credential}"},
+            json={
+                "subscriptions": [account.external_id],
+                "query": f"Resources | where type =~ '{resource_type}' | project id, type, location, properties",
+                "options": options,
+            },
+        )
+        return data.get("data", []), data.get("$skipToken")
+
+    def to_snapshot(self, item: dict) -> dict:
+        resource_type = (item.get("type") or "").lower()
+        context = {f"properties:{key}": value for key, value in flatten(item.get("properties") or {}).items()}
+        if item.get("location"):
+            context["location"] = item["location"]
+        return {
+            "resource_id": item["id"],
+            "resource_type": resource_type,
+            "actions": ACTIONS_BY_TYPE.get(resource_type, []),
+            "context": context,
+            "region": item.get("location"),
+            "configuration": item.get("properties") or {},
+        }
@@ -0,0 +1,208 @@
+"""Shared machinery for provider inventory connectors.
+
+All connectors run on one background event loop per process. Each provider
+gets a long-lived ``httpx.AsyncClient`` (so connections are pooled across
+syncs), a semaphore that caps how many requests to that provider are in
+flight at once, and a token bucket that keeps the request rate under the
+provider's API quota, whichever account or worker thread issued them.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, NamedTuple, Optional, TypeVar
+
+import httpx
+
+from app import models, sync_telemetry
+from app.config import settings
+
+T = TypeVar("T")
+
+Page = tuple[list[dict], Optional[str]]
+
+
+class ConnectorError(RuntimeError):
+    """Raised when a provider inventory request fails."""
+
+
+class TokenBucket:
+    """
+    Allow ``rate`` acquisitions per second on average, with bursts of up to
+    ``burst``. Callers that find the bucket empty sleep until their token
+    accrues. Only used from the connector loop, so needs no lock.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated: Optional[float] = None
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Take the token now, even into debt, so waiters are served in arrival order.
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class AccountRef(NamedTuple):
+    """The account fields connectors need, detached from any database session."""
+
+    id: int
+    provider: models.CloudProvider
+    external_id: str
+    credential: Optional[str]
+
+    @classmethod
+    def of(cls, account: models.CloudAccount) -> AccountRef:
+        return cls(account.id, account.provider, account.external_id, account.credential)
+
+
+def flatten(value: Any, prefix: str = "") -> dict[str, Any]:
+    """Flatten nested configuration into dotted keys, keeping lists as values."""
+    if not isinstance(value, dict):
+        return {prefix: value} if prefix else {}
+    flat: dict[str, Any] = {}
+    for key, item in value.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(item, dict):
+            flat.update(flatten(item, path))
+        else:
+            flat[path] = item
+    return flat
+
+
+class Connector(ABC):
+    """
+    Fetches one provider's inventory as policy-engine resource snapshots.
+
+    Subclasses list the resource types they collect and implement
+    :meth:`fetch_page` for the provider's paginated inventory API and
+    :meth:`to_snapshot` to map its items to snapshots.
+    """
+
+    provider: models.CloudProvider
+    resource_types: tuple[str, ...] = ()
+    default_base_url: str = ""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        concurrency: int,
+        base_url: Optional[str] = None,
+        rate: float = 0,
+    ) -> None:
+        self.client = client
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self._limit = asyncio.Semaphore(concurrency)
+        self.rate_limit = TokenBucket(rate)
+
+    @abstractmethod
+    async def fetch_page(self, account: AccountRef, resource_type: str, token: Optional[str]) -> Page:
+        """Return one page of raw inventory items and the token of the next page."""
+
+    @abstractmethod
+    def to_snapshot(self, item: dict) -> dict:
+        """Map one raw inventory item to a resource snapshot."""
+
+    async def authenticate(self, account: AccountRef) -> AccountRef:
+        """
+        Resolve the account's credential before any inventory call, raising
+        :class:`ConnectorError` if it is unusable. Returns the account to page
+        with, so subclasses can swap in a short-lived token.
+        """
+        if not account.credential:
+            raise ConnectorError(f"{self.provider.value} account has no credential configured")
+        return account
+
+    async def validate(self, account: AccountRef) -> None:
+        """Make one authenticated inventory call; raise :class:`ConnectorError` if it is rejected."""
+        account = await self.authenticate(account)
+        await self.fetch_page(account, self.resource_types[0], None)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        await self.rate_limit.acquire()
+        async with self._limit:
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                response.raise_for_status()
+            except httpx.HTTPError as exc:
+                received = len(exc.response.content) if isinstance(exc, httpx.HTTPStatusError) else 0
+                sync_telemetry.record_call(received, failed=True)
+                raise ConnectorError(f"{self.provider.value} inventory request failed: {exc}") from exc
+            sync_telemetry.record_call(len(response.request.content) + len(response.content))
+            return response.json()
+
+    async def _drain_type(self, account: AccountRef, resource_type: str, pages: asyncio.Queue) -> None:
+        token: Optional[str] = None
+        while True:
+            items, token = await self.fetch_page(account, resource_type, token)
+            if items:
+                await pages.put([self.to_snapshot(item) for item in items])
+            if not token:
+                return
+
+    async def iter_pages(self, account: AccountRef) -> AsyncIterator[list[dict]]:
+        """
+        Stream snapshot pages as they arrive.
+
+        Resource types are paged concurrently (bounded by the provider
+        semaphore) into a bounded queue, so memory stays flat however large
+        the inventory is and a slow consumer applies back-pressure.
+        """
+        pages: asyncio.Queue = asyncio.Queue(maxsize=settings.connector_queue_pages)
+        tasks = [asyncio.create_task(self._drain_type(account, rtype, pages)) for rtype in self.resource_types]
+        done = asyncio.gather(*tasks)
+        try:
+            while not (done.done() and pages.empty()):
+                getter = asyncio.ensure_future(pages.get())
+                await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            done.result()  # surface the first fetch error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class ConnectorRuntime:
+    """Background event loop that owns the pooled clients and provider semaphores."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="connector-loop", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Awaitable[T]) -> concurrent.futures.Future[T]:
+        """Schedule a coroutine on the connector loop; wrap the result with ``asyncio.wrap_future`` to await it."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the connector loop from a synchronous caller."""
+        return self.submit(coro).result(timeout)
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
@@ -0,0 +1,199 @@
+"""Local stand-in for the provider inventory APIs.
+
+Serves the same request and response shapes the connectors use - AWS Config
+``SelectResourceConfig``, Azure Resource Graph and GCP Cloud Asset - from a
+deterministic generator, so syncs can be exercised and benchmarked without
+network access or credentials. Every account gets ``FAKE_CLOUD_RESOURCES``
+resources split across the connector's resource types; the same account id
+always yields the same inventory.
+
+With ``CLOUD_CONNECTOR_MODE=fake`` connectors call this app in-process. It
+can also be run on its own and targeted with ``FAKE_CLOUD_URL``::
+
+    python -m app.connectors.fake_cloud --port 9100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+from typing import Callable, Optional
+
+from fastapi import FastAPI, Header, Request
+
+from app.config import settings
+from app.connectors.aws import ACTIONS_BY_TYPE as AWS_TYPES
+from app.connectors.azure import ACTIONS_BY_TYPE as AZURE_TYPES
+from app.connectors.gcp import ACTIONS_BY_TYPE as GCP_TYPES
+
+app = FastAPI(title="Fake cloud inventory")
+
+
+def _type_size(resource_type: str, types: list[str], total: int) -> int:
+    index = types.index(resource_type)
+    return total // len(types) + (1 if index < total % len(types) else 0)
+
+
+def _page(
+    account: str,
+    resource_type: str,
+    types: list[str],
+    offset: int,
+    limit: int,
+    make: Callable[[random.Random, str, str, int], dict],
+) -> tuple[list[dict], Optional[int]]:
+    if resource_type not in types:
+        return [], None
+    size = _type_size(resource_type, types, settings.fake_cloud_resources)
+    end = min(offset + limit, size)
+    items = [make(random.Random(f"{account}/{resource_type}/{i}"), account, resource_type, i) for i in range(offset, end)]
+    return items, end if end < size else None
+
+
+async def _latency() -> None:
+    if settings.fake_cloud_latency_ms:
+        await asyncio.sleep(settings.fake_cloud_latency_ms / 1000)
+
+
+# -- AWS Config ----------------------------------------------------------------
+def _aws_item(rng: random.Random, account: str, resource_type: str, index: int) -> dict:
+    kind = resource_type.split("::")[-1].lower()
+    name = f"{kind}-{index:06d}"
+    configuration: dict = {}
+    if resource_type == "AWS::S3::Bucket":
+        arn = f"arn:aws:s3:::{account}-{name}"
+        configuration = {
+            "acl": rng.choices(["private", "public-read", "authenticated-read"], weights=[90, 7, 3])[0],
+            "encryption": rng.choice(["AES256", "aws:kms", "none"]),
+        }
+    elif resource_type == "AWS::IAM::User":
+        arn = f"arn:aws:iam::{account}:user/{name}"
+        configuration = {"mfaEnabled": rng.random() > 0.15, "accessKeys": rng.randint(0, 2)}
+    elif resource_type == "AWS::IAM::Role":
+        arn = f"arn:aws:iam::{account}:role/{name}"
+        configuration = {"maxSessionDuration": rng.choice([3600, 7200, 43200])}
+    elif resource_type == "AWS::EC2::Instance":
+        arn = f"arn:aws:ec2:us-east-1:{account}:instance/i-{index:017x}"
+        configuration = {
+            "instanceType": rng.choice(["t3.micro", "m5.large", "c6i.xlarge"]),
+            "metadataOptions": {"httpTokens": rng.choice(["required", "optional"])},
+        }
+    else:
+        arn = f"arn:aws:ec2:us-east-1:{account}:security-group/sg-{index:017x}"
+        configuration = {"ingressOpenToWorld": rng.random() < 0.1}
+    return {"resourceId": name, "resourceType": resource_type, "arn": arn, "configuration": configuration}
+
+
+_AWS_WHERE = re.compile(r"resourceType\s*=\s*'([^']+)'.*accountId\s*=\s*'([^']+)'", re.S)
+
+
+@app.post("/aws/")
+async def aws_select_resource_config(request: Request, x_amz_target: str = Header("")):
+    await _latency()
+    payload = json.loads(await request.body())
+    match = _AWS_WHERE.search(payload.get("Expression", ""))
+    if not match:
+        return {"Results": []}
+    resource_type, account = match.groups()
+    items, next_offset = _page(
+        account, resource_type, list(AWS_TYPES), int(payload.get("NextToken") or 0), int(payload.get("Limit", 100)), _aws_item
+    )
+    response = {"Results": [json.dumps(item) for item in items]}
+    if next_offset is not None:
+        response["NextToken"] = str(next_offset)
+    return response
+
+
+# -- Azure Resource Graph ------------------------------------------------------
+def _azure_item(rng: random.Random, subscription: str, resource_type: str, index: int) -> dict:
+    name = f"{resource_type.split('/')[-1]}{index:06d}"
+    properties: dict = {}
+    if resource_type == "microsoft.storage/storageaccounts":
+        properties = {
+            "minimumTlsVersion": rng.choice(["TLS1_0", "TLS1_2", "TLS1_2", "TLS1_2"]),
+            "allowBlobPublicAccess": rng.random() < 0.1,
+        }
+    elif resource_type == "microsoft.compute/virtualmachines":
+        properties = {"storageProfile": {"osDisk": {"encryptionSettings": {"enabled": rng.random() > 0.2}}}}
+    elif resource_type == "microsoft.keyvault/vaults":
+        properties = {"enableSoftDelete": rng.random() > 0.05, "enablePurgeProtection": rng.random() > 0.5}
+    else:
+        properties = {"securityRules": rng.randint(1, 40)}
+    return {
+        "id": f"/subscriptions/{subscription}/resourceGroups/rg-{index % 17}/providers/{resource_type}/{name}",
+        "type": resource_type,
+        "location": rng.choice(["eastus", "westeurope", "southeastasia"]),
+        "properties": properties,
+    }
+
+
+_AZURE_TYPE = re.compile(r"type\s*=~\s*'([^']+)'")
+
+
+@app.post("/azure/providers/Microsoft.ResourceGraph/resources")
+async def azure_resource_graph(request: Request):
+    await _latency()
+    payload = await request.json()
+    match = _AZURE_TYPE.search(payload.get("query", ""))
+    subscriptions = payload.get("subscriptions") or [""]
+    options = payload.get("options") or {}
+    if not match:
+        return {"data": [], "count": 0}
+    items, next_offset = _page(
+        subscriptions[0], match.group(1).lower(), list(AZURE_TYPES), int(options.get("$skipToken") or 0),
+        int(options.get("$top", 1000)), _azure_item,
+    )
+    response = {"data": items, "count": len(items)}
+    if next_offset is not None:
+        response["$skipToken"] = str(next_offset)
+    return response
+
+
+# -- GCP Cloud Asset Inventory -------------------------------------------------
+def _gcp_item(rng: random.Random, parent: str, asset_type: str, index: int) -> dict:
+    service, kind = asset_type.split("/")
+    data: dict = {}
+    if kind == "Bucket":
+        data = {
+            "iamConfiguration": {"uniformBucketLevelAccess": {"enabled": rng.random() > 0.2}},
+            "publicAccessPrevention": rng.choice(["enforced", "inherited"]),
+        }
+    elif kind == "ServiceAccountKey":
+        data = {"keyType": rng.choice(["USER_MANAGED", "SYSTEM_MANAGED"]), "ageDays": rng.randint(1, 720)}
+    elif kind == "Instance":
+        data = {"shieldedInstanceConfig": {"enableSecureBoot": rng.random() > 0.3}}
+    else:
+        data = {"sourceRanges": rng.choice([["10.0.0.0/8"], ["0.0.0.0/0"]])}
+    return {
+        "name": f"//{service}/{parent}/{kind.lower()}s/{kind.lower()}-{index:06d}",
+        "assetType": asset_type,
+        "resource": {"data": data, "location": "global" if kind == "ServiceAccountKey" else rng.choice(["us-central1", "europe-west1"])},
+    }
+
+
+@app.get("/gcp/v1/{parent:path}/assets")
+async def gcp_list_assets(
+    parent: str,
+    assetTypes: str = "",
+    pageSize: int = 1000,
+    pageToken: str = "",
+):
+    await _latency()
+    items, next_offset = _page(parent, assetTypes, list(GCP_TYPES), int(pageToken or 0), pageSize, _gcp_item)
+    return {"assets": items, "nextPageToken": str(next_offset) if next_offset is not None else ""}
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the fake cloud inventory APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args(argv)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
-
-from datetime import datetime, timedelta
-
-from sqlalchemy import case, func, select
-from sqlalchemy.exc import IntegrityError
+import csv
+import hashlib
+import io
+import json
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import (
+    DateTime, and_, bindparam, case, delete, func, insert, literal, or_, select, text, tuple_, type_coerce, update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session, selectinload
 
-from app import models, schemas
+from app import models, pagination, policy_engine, schemas, sync_telemetry
+from app.notification_writer import notification_row, writer as notification_writer
+from app.cache import dashboard_cache
+from app.config import settings
+from app.connectors.base import flatten
+from app.sync_telemetry import SYNC_PHASES, SyncMetrics
 
 
 # -- User helpers -------------------------------------------------------------
+def get_user(db: Session, user_id: int) -> Optional[models.User]:
+    return db.get(models.User, user_id)
+
+
 def get_user_by_email(db: Session, *, email: str) -> Optional[models.User]:
     stmt = select(models.User).where(models.User.email == email)
     return db.execute(stmt).scalar_one_or_none()
@@ -43,11 +61,20 @@ def create_account(db: Session, account_in: schemas.AccountCreate) -> models.Clo
     db.add(account)
     db.commit()
     db.refresh(account)
+    log_account_provisioning(account)
     return account
 
 
-def log_account_provisioning(db: Session, account: models.CloudAccount) -> None:
-    """Create a cascade of provisioning notifications for a new account."""
+def log_account_provisioning(
+    account: models.CloudAccount, *, durable: Optional[bool] = None
+) -> Optional[list[models.Notification]]:
+    """
+    Create a cascade of provisioning notifications for a new account.
+
+    The notifications go through the coalescing notification writer, so a
+    bulk onboarding shares a few transactions instead of one per account;
+    ``durable`` waits for them to be committed (see :mod:`app.notification_writer`).
+    """
 
     steps = [
         (
@@ -69,16 +96,16 @@ def log_account_provisioning(db: Session, account: models.CloudAccount) -> None:
     ]
 
     now = datetime.utcnow()
-    for index, (title, message) in enumerate(steps):
-        notification = models.Notification(
-            title=title,
-            message=message,
-            type=models.NotificationType.PROVISIONING,
-            created_at=now + timedelta(seconds=index * 2),
-        )
-        db.add(notification)
-
-    db.commit()
+    return notification_writer.submit(
+        [
+            notification_row(
+                schemas.NotificationCreate(title=title, message=message, type=models.NotificationType.PROVISIONING),
+                created_at=now + timedelta(seconds=index * 2),
+            )
+            for index, (title, message) in enumerate(steps)
+        ],
+        durable=durable,
+    )
 
 
 def get_accounts(db: Session) -> list[models.CloudAccount]:
@@ -190,53 +217,25 @@ def update_evaluation(
 
 # -- Dashboard helpers -------------------------------------------------------
 def build_dashboard_snapshot(db: Session) -> schemas.DashboardSnapshot:
-    total_stmt = select(
-        func.count(models.PolicyEvaluation.id),
-        func.sum(
-            case((models.PolicyEvaluation.status == models.ComplianceStatus.COMPLIANT, 1), else_=0)
-        ),
-        func.sum(
-            case((models.PolicyEvaluation.status == models.ComplianceStatus.NON_COMPLIANT, 1), else_=0)
-        ),
-        func.sum(
-            case((models.PolicyEvaluation.status == models.ComplianceStatus.UNKNOWN, 1), else_=0)
-        ),
-    )
-    total_result = db.execute(total_stmt).first()
-
-    total_policies = total_result[0] or 0
-    compliant = total_result[1] or 0
-    non_compliant = total_result[2] or 0
-    unknown = total_result[3] or 0
-
-    summary = schemas.ComplianceSummary(
-        total_policies=total_policies,
-        compliant=compliant,
-        non_compliant=non_compliant,
-        unknown=unknown,
-    )
-
+    """Summarise compliance from the rollup table, reading one row per provider."""
+    rollup = models.ComplianceRollup
+    total = rollup.compliant + rollup.non_compliant + rollup.warning + rollup.unknown
     provider_stmt = (
         select(
-            models.CloudAccount.provider,
-            func.count(func.distinct(models.CloudAccount.id)),
-            func.sum(
-                case((models.PolicyEvaluation.status == models.ComplianceStatus.COMPLIANT, 1), else_=0)
-            ),
-            func.sum(
-                case((models.PolicyEvaluation.status == models.ComplianceStatus.NON_COMPLIANT, 1), else_=0)
-            ),
-            func.sum(
-                case((models.PolicyEvaluation.status == models.ComplianceStatus.UNKNOWN, 1), else_=0)
-            ),
+            rollup.provider,
+            func.count(rollup.account_id),
+            func.sum(total),
+            func.sum(rollup.compliant),
+            func.sum(rollup.non_compliant),
+            func.sum(rollup.unknown),
         )
-        .select_from(models.PolicyEvaluation)
-        .join(models.PolicyEvaluation.account)
-        .group_by(models.CloudAccount.provider)
+        .where(total > 0)
+        .group_by(rollup.provider)
     )
 
     providers: list[schemas.ProviderBreakdown] = []
-    for provider, accounts, ok, issues, pending in db.execute(provider_stmt).all():
+    total_policies = compliant = non_compliant = unknown = 0
+    for provider, accounts, evaluations, ok, issues, pending in db.execute(provider_stmt).all():
         providers.append(
             schemas.ProviderBreakdown(
                 provider=provider,
@@ -246,10 +245,139 @@ def build_dashboard_snapshot(db: Session) -> schemas.DashboardSnapshot:
                 unknown=pending or 0,
             )
         )
+        total_policies += evaluations or 0
+        compliant += ok or 0
+        non_compliant += issues or 0
+        unknown += pending or 0
 
+    summary = schemas.ComplianceSummary(
+        total_policies=total_policies,
+        compliant=compliant,
+        non_compliant=non_compliant,
+        unknown=unknown,
+    )
     return schemas.DashboardSnapshot(summary=summary, providers=providers)
 
 
+def _status_counts():
+    """Per-status SUM(CASE ...) columns over PolicyEvaluation.status, in ComplianceStatus order."""
+    return [
+        func.coalesce(
+            func.sum(case((models.PolicyEvaluation.status == evaluation_status, 1), else_=0)), 0
+        )
+        for evaluation_status in models.ComplianceStatus
+    ]
+
+
+def _status_fields(row: Sequence) -> dict[str, int]:
+    return {evaluation_status.value: count for evaluation_status, count in zip(models.ComplianceStatus, row)}
+
+
+def get_severity_breakdown(db: Session) -> list[schemas.SeverityBreakdown]:
+    """Count policies and evaluation outcomes per policy severity."""
+    stmt = (
+        select(
+            models.Policy.severity,
+            func.count(func.distinct(models.Policy.id)),
+            func.count(models.PolicyEvaluation.id),
+            *_status_counts(),
+        )
+        .select_from(models.Policy)
+        .outerjoin(models.Policy.evaluations)
+        .group_by(models.Policy.severity)
+    )
+    found = {
+        severity: schemas.SeverityBreakdown(
+            severity=severity, policies=policies, evaluations=evaluations, **_status_fields(counts)
+        )
+        for severity, policies, evaluations, *counts in db.execute(stmt).all()
+    }
+    return [
+        found.get(severity) or schemas.SeverityBreakdown(severity=severity)
+        for severity in reversed(models.PolicySeverity)
+    ]
+
+
+def get_category_breakdown(db: Session, limit: int = 5) -> list[schemas.CategoryBreakdown]:
+    """Return the policy categories with the most non-compliant evaluations."""
+    counts = _status_counts()
+    non_compliant = counts[list(models.ComplianceStatus).index(models.ComplianceStatus.NON_COMPLIANT)]
+    stmt = (
+        select(
+            models.Policy.category,
+            func.count(func.distinct(models.Policy.id)),
+            func.count(models.PolicyEvaluation.id),
+            *counts,
+        )
+        .select_from(models.Policy)
+        .outerjoin(models.Policy.evaluations)
+        .group_by(models.Policy.category)
+        .order_by(non_compliant.desc(), models.Policy.category)
+        .limit(limit)
+    )
+    return [
+        schemas.CategoryBreakdown(
+            category=category, policies=policies, evaluations=evaluations, **_status_fields(status_counts)
+        )
+        for category, policies, evaluations, *status_counts in db.execute(stmt).all()
+    ]
+
+
+def get_critical_findings(db: Session, limit: int = 10) -> schemas.CriticalFindings:
+    """Count non-compliant evaluations of critical policies and return the most recent ``limit``."""
+    evaluation = models.PolicyEvaluation
+    criteria = (
+        models.Policy.severity == models.PolicySeverity.CRITICAL,
+        evaluation.status == models.ComplianceStatus.NON_COMPLIANT,
+    )
+    total = db.execute(
+        select(func.count(evaluation.id)).join(evaluation.policy).where(*criteria)
+    ).scalar_one()
+    rows = db.execute(
+        select(
+            evaluation.id,
+            evaluation.policy_id,
+            models.Policy.name,
+            models.Policy.control_id,
+            evaluation.account_id,
+            models.CloudAccount.display_name,
+            models.CloudAccount.provider,
+            evaluation.resource_id,
+            evaluation.last_checked_at,
+        )
+        .join(evaluation.policy)
+        .join(evaluation.account)
+        .where(*criteria)
+        .order_by(evaluation.last_checked_at.desc(), evaluation.id.desc())
+        .limit(limit)
+    ).all()
+    items = [
+        schemas.CriticalFinding(
+            evaluation_id=evaluation_id,
+            policy_id=policy_id,
+            policy_name=policy_name,
+            control_id=control_id,
+            account_id=account_id,
+            account_name=account_name,
+            provider=provider,
+            resource_id=resource_id,
+            last_checked_at=last_checked_at,
+        )
+        for (
+            evaluation_id,
+            policy_id,
+            policy_name,
+            control_id,
+            account_id,
+            account_name,
+            provider,
+            resource_id,
+            last_checked_at,
+        ) in rows
+    ]
+    return schemas.CriticalFindings(total=total, items=items)
+
+
 # -- Notification helpers ----------------------------------------------------
 def create_notification(db: Session, notification_in: schemas.NotificationCreate) -> models.Notification:
     notification = models.Notification(**notification_in.model_dump())
@@ -276,17 +404,14 @@ def mark_notification_read(db: Session, notification_id: int) -> Optional[models
     return notification
 
 
-def mark_all_notifications_read(db: Session) -> int:
-    stmt = select(models.Notification).where(models.Notification.is_read.is_(False))
-    unread = list(db.execute(stmt).scalars())
-    for notification in unread:
-        notification.is_read = True
-    if unread:
-        db.commit()
-    return len(unread)
+# -- Utility helpers ---------------------------------------------------------
+def as_naive_utc(moment: datetime) -> datetime:
+    """Convert an aware datetime to the naive UTC form timestamps are stored in."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
 
 
-# -- Utility helpers ---------------------------------------------------------
 def seed_demo_data(db: Session, *, dataset: Iterable[dict]) -> None:
     for record in dataset:
         model = record["model"]
@@ -303,9 +428,19 @@ def seed_demo_data(db: Session, *, dataset: Iterable[dict]) -> None:
 # Policy CRUD Operations
 # ===========================
 
-def get_policies(db: Session, skip: int = 0, limit: int = 100) -> list[models.Policy]:
-    """Get all policies with optional pagination."""
-    return db.query(models.Policy).offset(skip).limit(limit).all()
+POLICY_PAGE_KEYS = (models.Policy.created_at, models.Policy.id)
+
+
+def get_policies(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> list[models.Policy]:
+    """Get policies in creation order, paged by cursor (or legacy offset)."""
+    stmt = pagination.keyset(
+        select(models.Policy), POLICY_PAGE_KEYS, cursor=cursor, limit=limit, descending=False
+    )
+    if skip and not cursor:
+        stmt = stmt.offset(skip)
+    return list(db.execute(stmt).scalars())
 
 
 def get_policy(db: Session, policy_id: int) -> Optional[models.Policy]:
@@ -338,6 +473,7 @@ def create_policy(db: Session, policy_in: schemas.PolicyCreate) -> models.Policy
     db_policy = models.Policy(**policy_data)
     db.add(db_policy)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_policy)
     return db_policy
 
@@ -365,6 +501,8 @@ def update_policy(
     
     db_policy.updated_at = datetime.utcnow()
     db.commit()
+    dashboard_cache.invalidate()
+    policy_engine.invalidate_compiled_policy(policy_id)
     db.refresh(db_policy)
     return db_policy
 
@@ -375,8 +513,11 @@ def delete_policy(db: Session, policy_id: int) -> bool:
     if not db_policy:
         return False
     
+    record_transitions(db, _removal_transitions(db, models.PolicyEvaluation.policy_id == policy_id))
     db.delete(db_policy)
     db.commit()
+    dashboard_cache.invalidate()
+    policy_engine.invalidate_compiled_policy(policy_id)
     return True
 
 
@@ -384,9 +525,74 @@ def delete_policy(db: Session, policy_id: int) -> bool:
 # Policy Evaluation CRUD Operations
 # ===========================
 
-def get_evaluations(db: Session, skip: int = 0, limit: int = 1000) -> list[models.PolicyEvaluation]:
-    """Get all policy evaluations with optional pagination."""
-    return db.query(models.PolicyEvaluation).offset(skip).limit(limit).all()
+EVALUATION_PAGE_KEYS = (models.PolicyEvaluation.last_checked_at, models.PolicyEvaluation.id)
+
+
+def get_evaluations(
+    db: Session, skip: int = 0, limit: int = 1000, cursor: Optional[str] = None
+) -> list[models.PolicyEvaluation]:
+    """Get the most recently checked evaluations, paged by cursor (or legacy offset)."""
+    stmt = pagination.keyset(
+        select(models.PolicyEvaluation), EVALUATION_PAGE_KEYS, cursor=cursor, limit=limit
+    )
+    if skip and not cursor:
+        stmt = stmt.offset(skip)
+    return list(db.execute(stmt).scalars())
+
+
+EVALUATION_EXPORT_COLUMNS = (
+    "id",
+    "policy_id",
+    "account_id",
+    "status",
+    "last_checked_at",
+    "findings",
+    "resource_id",
+)
+
+
+def iter_evaluation_rows(db: Session, batch_size: int = 1000) -> Iterator[Sequence]:
+    """
+    Stream every evaluation as a plain row tuple.
+
+    Uses ``yield_per`` so the driver fetches through a server-side cursor
+    where supported, keeping memory flat regardless of table size.
+    """
+    table = models.PolicyEvaluation.__table__
+    stmt = (
+        select(*(table.c[name] for name in EVALUATION_EXPORT_COLUMNS))
+        .order_by(table.c.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.execute(stmt).tuples()
+
+
+def get_scoped_evaluations(
+    db: Session,
+    *,
+    account_id: Optional[int] = None,
+    policy_id: Optional[int] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> list[models.PolicyEvaluation]:
+    """Get one account's or policy's evaluations, filtered by status and check time."""
+    evaluation = models.PolicyEvaluation
+    stmt = select(evaluation)
+    if account_id is not None:
+        stmt = stmt.where(evaluation.account_id == account_id)
+    if policy_id is not None:
+        stmt = stmt.where(evaluation.policy_id == policy_id)
+    if status is not None:
+        stmt = stmt.where(evaluation.status == models.ComplianceStatus(status))
+    if since is not None:
+        stmt = stmt.where(evaluation.last_checked_at >= as_naive_utc(since))
+    if until is not None:
+        stmt = stmt.where(evaluation.last_checked_at < as_naive_utc(until))
+    stmt = pagination.keyset(stmt, EVALUATION_PAGE_KEYS, cursor=cursor, limit=limit)
+    return list(db.execute(stmt).scalars())
 
 
 def get_evaluation(db: Session, evaluation_id: int) -> Optional[models.PolicyEvaluation]:
@@ -425,7 +631,10 @@ def create_evaluation(
     
     db_evaluation = models.PolicyEvaluation(**evaluation_in.model_dump())
     db.add(db_evaluation)
+    db.flush()
+    record_transitions(db, [StatusTransition.of(db_evaluation, None, db_evaluation.status)])
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_evaluation)
     return db_evaluation
 
@@ -440,12 +649,15 @@ def update_evaluation(
     if not db_evaluation:
         return None
     
+    previous_status = db_evaluation.status
     update_data = evaluation_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_evaluation, field, value)
     
+    record_transitions(db, [StatusTransition.of(db_evaluation, previous_status, db_evaluation.status)])
     db_evaluation.last_checked_at = datetime.utcnow()
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_evaluation)
     return db_evaluation
 
@@ -456,18 +668,731 @@ def delete_evaluation(db: Session, evaluation_id: int) -> bool:
     if not db_evaluation:
         return False
     
+    record_transitions(db, [StatusTransition.of(db_evaluation, db_evaluation.status, None)])
     db.delete(db_evaluation)
     db.commit()
+    dashboard_cache.invalidate()
     return True
 
 
+EVALUATION_BULK_BATCH_SIZE = 500
+
+
+def _dialect_insert(db: Session):
+    """Return the dialect-specific insert construct that supports ON CONFLICT."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Upserts are not supported on the {dialect} dialect")
+
+
+def bulk_upsert_evaluations(
+    db: Session,
+    items: list[schemas.EvaluationCreate],
+    batch_size: int = EVALUATION_BULK_BATCH_SIZE,
+    *,
+    commit: bool = True,
+) -> schemas.EvaluationBulkResult:
+    """
+    Upsert many evaluations in batched INSERT ... ON CONFLICT statements.
+
+    Rows are keyed on the uq_policy_account constraint. Each batch is one
+    transaction; items referencing unknown policies or accounts are reported
+    as failed, and when the same key appears twice only the last item is
+    written. With ``commit=False`` the batches join the caller's transaction
+    instead: nothing is committed, and a batch that fails to write raises
+    rather than being reported, so the caller can roll back with it.
+    """
+    results: list[Optional[schemas.EvaluationBulkItemResult]] = [None] * len(items)
+
+    def record(index: int, outcome: str, *, id: Optional[int] = None, detail: Optional[str] = None) -> None:
+        results[index] = schemas.EvaluationBulkItemResult(
+            index=index,
+            policy_id=items[index].policy_id,
+            account_id=items[index].account_id,
+            outcome=outcome,
+            id=id,
+            detail=detail,
+        )
+
+    policy_ids = {item.policy_id for item in items}
+    account_ids = {item.account_id for item in items}
+    known_policies = set(
+        db.execute(select(models.Policy.id).where(models.Policy.id.in_(policy_ids))).scalars()
+    )
+    known_accounts = set(
+        db.execute(select(models.CloudAccount.id).where(models.CloudAccount.id.in_(account_ids))).scalars()
+    )
+
+    latest: dict[tuple[int, int], int] = {}
+    for index, item in enumerate(items):
+        if item.policy_id not in known_policies:
+            record(index, "failed", detail=f"Policy with ID {item.policy_id} not found")
+            continue
+        if item.account_id not in known_accounts:
+            record(index, "failed", detail=f"Account with ID {item.account_id} not found")
+            continue
+        key = (item.policy_id, item.account_id)
+        if key in latest:
+            record(latest[key], "skipped", detail=f"Superseded by item {index}")
+        latest[key] = index
+
+    table = models.PolicyEvaluation.__table__
+    insert = _dialect_insert(db)
+    pending = sorted(latest.values())
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        keys = [(items[index].policy_id, items[index].account_id) for index in batch]
+        now = datetime.utcnow()
+        rows = [
+            {
+                "policy_id": items[index].policy_id,
+                "account_id": items[index].account_id,
+                "status": models.ComplianceStatus(items[index].status),
+                "findings": items[index].findings,
+                "resource_id": items[index].resource_id,
+                "last_checked_at": now,
+            }
+            for index in batch
+        ]
+
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.policy_id, table.c.account_id],
+            set_={
+                "status": stmt.excluded.status,
+                "findings": stmt.excluded.findings,
+                "resource_id": stmt.excluded.resource_id,
+                "last_checked_at": stmt.excluded.last_checked_at,
+            },
+        ).returning(table.c.id, table.c.policy_id, table.c.account_id)
+
+        try:
+            existing = {
+                (policy_id, account_id): previous_status
+                for policy_id, account_id, previous_status in db.execute(
+                    select(table.c.policy_id, table.c.account_id, table.c.status)
+                    .where(tuple_(table.c.policy_id, table.c.account_id).in_(keys))
+                    .with_for_update()
+                ).tuples()
+            }
+            written = {(policy_id, account_id): row_id for row_id, policy_id, account_id in db.execute(stmt)}
+
+            record_transitions(
+                db,
+                [
+                    StatusTransition(written[key], key[0], key[1], existing.get(key), row["status"])
+                    for key, row in zip(keys, rows)
+                ],
+            )
+            if commit:
+                db.commit()
+                dashboard_cache.invalidate()
+        except SQLAlchemyError as exc:
+            if not commit:
+                raise
+            db.rollback()
+            for index in batch:
+                record(index, "failed", detail=str(exc.__cause__ or exc))
+            continue
+
+        for index, key in zip(batch, keys):
+            record(index, "updated" if key in existing else "created", id=written.get(key))
+
+    outcomes = [result.outcome for result in results]
+    return schemas.EvaluationBulkResult(
+        created=outcomes.count("created"),
+        updated=outcomes.count("updated"),
+        skipped=outcomes.count("skipped"),
+        failed=outcomes.count("failed"),
+        results=results,
+    )
+
+
+# ===========================
+# Resource Inventory Operations
+# ===========================
+
+RESOURCE_WRITE_BATCH_SIZE = 1000
+RESOURCE_PAGE_KEYS = (models.Resource.id,)
+RESOURCE_COPY_COLUMNS = (
+    "account_id", "provider", "resource_type", "native_id", "region", "config",
+    "content_hash", "policy_fingerprint", "violations", "first_seen", "last_seen",
+)
+COPY_NULL = r"\N"
+
+
+def _snapshot_hash(resource: dict) -> str:
+    canonical = json.dumps(resource, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _policy_fingerprint(policies: Sequence[policy_engine.PolicySource]) -> str:
+    digest = hashlib.sha256()
+    for policy_id, updated_at, _ in policies:
+        digest.update(f"{policy_id}:{updated_at.isoformat() if updated_at else ''};".encode())
+    return digest.hexdigest()
+
+
+def _provider_policies(db: Session, provider: models.CloudProvider) -> list[policy_engine.PolicySource]:
+    rows = db.execute(
+        select(models.Policy.id, models.Policy.updated_at, models.Policy.policy_content)
+        .where(models.Policy.provider == provider)
+        .order_by(models.Policy.id)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def _copy_value(column: str, value) -> str:
+    if value is None:
+        return COPY_NULL
+    if column in ("config", "violations"):
+        return json.dumps(value, separators=(",", ":"))
+    if isinstance(value, models.CloudProvider):
+        return value.name
+    return str(value)
+
+
+def _copy_resources(db: Session, rows: list[dict]) -> None:
+    """Stream new rows through ``COPY ... FROM STDIN`` (psycopg2 only)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(column, row.get(column)) for column in RESOURCE_COPY_COLUMNS])
+    buffer.seek(0)
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY resources ({', '.join(RESOURCE_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer,
+        )
+
+
+def _insert_resources(db: Session, rows: list[dict]) -> None:
+    """Bulk-load new inventory rows: COPY on Postgres, batched executemany elsewhere."""
+    if not rows:
+        return
+    if db.get_bind().dialect.driver == "psycopg2":
+        _copy_resources(db, rows)
+        return
+    for start in range(0, len(rows), RESOURCE_WRITE_BATCH_SIZE):
+        db.execute(insert(models.Resource), rows[start:start + RESOURCE_WRITE_BATCH_SIZE])
+
+
+def _link_evaluation_resources(db: Session, account_id: int, payloads: list[dict]) -> None:
+    """Point the evaluations written from ``payloads`` at their inventory row (``resource_ref_id``)."""
+    if not payloads:
+        return
+    table = models.PolicyEvaluation.__table__
+    db.execute(
+        update(table)
+        .where(table.c.account_id == account_id, table.c.policy_id == bindparam("evaluation_policy_id"))
+        .values(resource_ref_id=bindparam("evaluation_resource_ref_id")),
+        [
+            {
+                "evaluation_policy_id": payload["policy_id"],
+                "evaluation_resource_ref_id": payload.get("resource_ref_id"),
+            }
+            for payload in payloads
+        ],
+    )
+
+
+def _changed_evaluations(db: Session, account_id: int, payloads: list[dict]) -> list[dict]:
+    """Drop payloads that would not change the stored evaluation or its resource link."""
+    current = {
+        policy_id: (status, findings, resource_id, resource_ref_id)
+        for policy_id, status, findings, resource_id, resource_ref_id in db.execute(
+            select(
+                models.PolicyEvaluation.policy_id,
+                models.PolicyEvaluation.status,
+                models.PolicyEvaluation.findings,
+                models.PolicyEvaluation.resource_id,
+                models.PolicyEvaluation.resource_ref_id,
+            ).where(models.PolicyEvaluation.account_id == account_id)
+        )
+    }
+    return [
+        payload
+        for payload in payloads
+        if current.get(payload["policy_id"])
+        != (
+            models.ComplianceStatus(payload["status"]),
+            payload.get("findings"),
+            payload.get("resource_id"),
+            payload.get("resource_ref_id"),
+        )
+    ]
+
+
+def sync_account_inventory(
+    db: Session,
+    account: models.CloudAccount,
+    resources: Sequence[dict],
+    metrics: Optional[SyncMetrics] = None,
+    before_commit: Optional[Callable[[], None]] = None,
+) -> schemas.InventorySyncResult:
+    """
+    Store a complete inventory of the account and re-evaluate only what changed.
+
+    Each snapshot is hashed and compared with the hash stored by the previous
+    sync. New and changed resources are evaluated and their violations
+    stored; resources missing from the inventory are deleted; unchanged ones
+    are skipped. A resource also counts as changed when the provider's
+    policies were edited since it was evaluated. Evaluations are then
+    re-derived from the stored violations, and only those whose outcome
+    moved are written. Resources and evaluations are committed together, so
+    a sync that fails part-way leaves the stored hashes untouched and the
+    next sync evaluates the same resources again; ``before_commit`` runs
+    last inside that transaction and can still abort it by raising (the sync
+    worker checks it still holds the job's lease). Time spent diffing and
+    evaluating, and writing, is added to the ``evaluate`` and ``persist``
+    phases of ``metrics``.
+    """
+    metrics = metrics or SyncMetrics()
+    metrics.resources = len(resources)
+    now = datetime.utcnow()
+    evaluations = schemas.EvaluationBulkResult(created=0, updated=0, skipped=0, failed=0, results=[])
+    scan = None
+
+    with metrics.phase("evaluate"):
+        policies = _provider_policies(db, account.provider)
+        fingerprint = _policy_fingerprint(policies)
+
+        snapshots = {str(resource["resource_id"]): resource for resource in resources}
+        hashes = {native_id: _snapshot_hash(resource) for native_id, resource in snapshots.items()}
+        stored = {
+            native_id: (row_id, content_hash, policy_fingerprint)
+            for row_id, native_id, content_hash, policy_fingerprint in db.execute(
+                select(
+                    models.Resource.id,
+                    models.Resource.native_id,
+                    models.Resource.content_hash,
+                    models.Resource.policy_fingerprint,
+                ).where(models.Resource.account_id == account.id)
+            )
+        }
+        changed = [
+            native_id
+            for native_id, content_hash in hashes.items()
+            if native_id not in stored or stored[native_id][1:] != (content_hash, fingerprint)
+        ]
+        deleted = [row_id for native_id, (row_id, _, _) in stored.items() if native_id not in hashes]
+        if changed or deleted:
+            scan = policy_engine.scan_resources(policies, [snapshots[native_id] for native_id in changed])
+
+    try:
+        with metrics.phase("persist"):
+            if scan is not None:
+                inserts, updates = [], []
+                for native_id in changed:
+                    found = scan.violations.get(native_id)
+                    snapshot = snapshots[native_id]
+                    values = {
+                        "resource_type": snapshot.get("resource_type"),
+                        "region": snapshot.get("region"),
+                        "config": snapshot.get("configuration"),
+                        "content_hash": hashes[native_id],
+                        "policy_fingerprint": fingerprint,
+                        "violations": found or None,
+                        "last_seen": now,
+                    }
+                    if native_id in stored:
+                        updates.append({"id": stored[native_id][0], **values})
+                    else:
+                        inserts.append({
+                            "account_id": account.id,
+                            "provider": account.provider,
+                            "native_id": native_id,
+                            "first_seen": now,
+                            **values,
+                        })
+                _insert_resources(db, inserts)
+                for start in range(0, len(updates), RESOURCE_WRITE_BATCH_SIZE):
+                    db.execute(update(models.Resource), updates[start:start + RESOURCE_WRITE_BATCH_SIZE])
+                for start in range(0, len(deleted), RESOURCE_WRITE_BATCH_SIZE):
+                    db.execute(
+                        delete(models.Resource)
+                        .where(models.Resource.id.in_(deleted[start:start + RESOURCE_WRITE_BATCH_SIZE]))
+                    )
+            # Unchanged rows are not rewritten: they were all seen at inventory_seen_at.
+            account.inventory_seen_at = now
+
+        if scan is not None:
+            with metrics.phase("evaluate"):
+                violating = db.execute(
+                    select(models.Resource.native_id, models.Resource.violations, models.Resource.id)
+                    .where(models.Resource.account_id == account.id, models.Resource.violations.is_not(None))
+                    .order_by(models.Resource.id)
+                )
+                payloads = policy_engine.summarize(
+                    account.id,
+                    policies,
+                    scan.unsupported,
+                    len(hashes),
+                    (
+                        (native_id, {int(policy_id): sids for policy_id, sids in found.items()}, row_id)
+                        for native_id, found, row_id in violating
+                    ),
+                )
+                changed_payloads = _changed_evaluations(db, account.id, payloads)
+            with metrics.phase("persist"):
+                if changed_payloads:
+                    evaluations = bulk_upsert_evaluations(
+                        db, items=[schemas.EvaluationCreate(**payload) for payload in changed_payloads], commit=False
+                    )
+                _link_evaluation_resources(db, account.id, changed_payloads)
+        with metrics.phase("persist"):
+            if before_commit is not None:
+                before_commit()
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if evaluations.created or evaluations.updated:
+        dashboard_cache.invalidate()
+
+    return schemas.InventorySyncResult(
+        total=len(hashes),
+        changed=len(changed),
+        deleted=len(deleted),
+        skipped=len(hashes) - len(changed),
+        evaluations=evaluations,
+    )
+
+
+def _config_filter(db: Session, config: dict):
+    """Match resources whose configuration contains ``config``."""
+    column = models.Resource.config
+    if db.get_bind().dialect.name == "postgresql":
+        # The column is declared as a JSON variant, so coerce it to get the
+        # JSONB operators: jsonb @>, served by the GIN index.
+        return type_coerce(column, postgresql.JSONB).contains(config)
+    clauses = []
+    for path, value in flatten(config).items():
+        extracted = func.json_extract(column, "$." + ".".join(f'"{part}"' for part in path.split(".")))
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value, separators=(",", ":"))
+        clauses.append(extracted.is_(None) if value is None else extracted == value)
+    return and_(*clauses)
+
+
+def _violation_filter(db: Session, policy_id: int):
+    column = models.Resource.violations
+    if db.get_bind().dialect.name == "postgresql":
+        return type_coerce(column, postgresql.JSONB).has_key(str(policy_id))  # jsonb ?, served by the GIN index
+    return func.json_extract(column, f'$."{policy_id}"').is_not(None)
+
+
+def query_resources(
+    db: Session,
+    *,
+    account_id: Optional[int] = None,
+    provider: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    region: Optional[str] = None,
+    config: Optional[dict] = None,
+    policy_id: Optional[int] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> list[models.Resource]:
+    """
+    Search the inventory across accounts.
+
+    ``config`` matches resources whose configuration contains the given
+    document (e.g. ``{"acl": "public-read"}``); ``policy_id`` keeps only
+    resources currently violating that policy.
+    """
+    resource = models.Resource
+    stmt = select(resource)
+    if account_id is not None:
+        stmt = stmt.where(resource.account_id == account_id)
+    if provider is not None:
+        stmt = stmt.where(resource.provider == models.CloudProvider(provider))
+    if resource_type is not None:
+        stmt = stmt.where(resource.resource_type == resource_type)
+    if region is not None:
+        stmt = stmt.where(resource.region == region)
+    if config:
+        stmt = stmt.where(_config_filter(db, config))
+    if policy_id is not None:
+        stmt = stmt.where(_violation_filter(db, policy_id))
+    stmt = pagination.keyset(stmt, RESOURCE_PAGE_KEYS, cursor=cursor, limit=limit, descending=False)
+    return list(db.execute(stmt.options(selectinload(resource.account))).scalars())
+
+
+# ===========================
+# Compliance Rollup Operations
+# ===========================
+
+class StatusTransition(NamedTuple):
+    """One evaluation moving between statuses; ``None`` means created or deleted."""
+    evaluation_id: int
+    policy_id: int
+    account_id: int
+    previous: Optional[models.ComplianceStatus]
+    current: Optional[models.ComplianceStatus]
+
+    @classmethod
+    def of(cls, evaluation: models.PolicyEvaluation, previous, current) -> StatusTransition:
+        return cls(evaluation.id, evaluation.policy_id, evaluation.account_id, previous, current)
+
+
+def _removal_transitions(db: Session, criterion) -> list[StatusTransition]:
+    evaluation = models.PolicyEvaluation
+    rows = db.execute(
+        select(evaluation.id, evaluation.policy_id, evaluation.account_id, evaluation.status).where(criterion)
+    )
+    return [
+        StatusTransition(evaluation_id, policy_id, account_id, previous, None)
+        for evaluation_id, policy_id, account_id, previous in rows
+    ]
+
+
+def _status_or_none(value) -> Optional[models.ComplianceStatus]:
+    return models.ComplianceStatus(value) if value is not None else None
+
+
+def record_transitions(db: Session, transitions: Iterable[StatusTransition]) -> None:
+    """
+    Apply evaluation status changes to the rollup, history and trend tables.
+
+    Runs inside the caller's transaction. Transitions that do not change the
+    status are ignored.
+    """
+    changes = []
+    for transition in transitions:
+        previous = _status_or_none(transition.previous)
+        current = _status_or_none(transition.current)
+        if previous != current:
+            changes.append(transition._replace(previous=previous, current=current))
+    if not changes:
+        return
+
+    now = datetime.utcnow()
+    account_deltas: dict[int, Counter] = defaultdict(Counter)
+    fleet_deltas: Counter = Counter()
+    for change in changes:
+        if change.previous is not None:
+            account_deltas[change.account_id][change.previous] -= 1
+            fleet_deltas[change.previous] -= 1
+        if change.current is not None:
+            account_deltas[change.account_id][change.current] += 1
+            fleet_deltas[change.current] += 1
+
+    apply_rollup_deltas(db, account_deltas)
+    _apply_trend_deltas(db, now, fleet_deltas)
+    db.execute(
+        models.EvaluationStatusHistory.__table__.insert(),
+        [
+            {
+                "evaluation_id": change.evaluation_id,
+                "policy_id": change.policy_id,
+                "account_id": change.account_id,
+                "previous_status": change.previous,
+                "status": change.current,
+                "changed_at": now,
+            }
+            for change in changes
+        ],
+    )
+
+_ROLLUP_COLUMNS = tuple(status.value for status in models.ComplianceStatus)
+
+
+def apply_rollup_deltas(db: Session, deltas: dict[int, Counter]) -> None:
+    """
+    Add per-status count deltas to the compliance rollup, keyed by account id.
+
+    Runs inside the caller's transaction so the rollup commits (or rolls
+    back) together with the evaluation writes it reflects.
+    """
+    deltas = {
+        account_id: counts
+        for account_id, counts in deltas.items()
+        if any(counts.values())
+    }
+    if not deltas:
+        return
+
+    providers = {
+        account_id: provider
+        for account_id, provider in db.execute(
+            select(models.CloudAccount.id, models.CloudAccount.provider).where(
+                models.CloudAccount.id.in_(list(deltas))
+            )
+        )
+    }
+    now = datetime.utcnow()
+    rows = []
+    for account_id, counts in deltas.items():
+        if account_id not in providers:
+            continue
+        row = {"provider": providers[account_id], "account_id": account_id, "updated_at": now}
+        row.update(dict.fromkeys(_ROLLUP_COLUMNS, 0))
+        for evaluation_status, count in counts.items():
+            # Statuses arrive as enum members or their string values.
+            row[models.ComplianceStatus(evaluation_status).value] += count
+        rows.append(row)
+    if not rows:
+        return
+
+    table = models.ComplianceRollup.__table__
+    stmt = _dialect_insert(db)(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.provider, table.c.account_id],
+        set_={
+            **{column: table.c[column] + stmt.excluded[column] for column in _ROLLUP_COLUMNS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+
+def rebuild_compliance_rollup(db: Session) -> int:
+    """Recompute the whole compliance rollup from policy_evaluations to repair drift."""
+    evaluation = models.PolicyEvaluation
+    source = (
+        select(
+            models.CloudAccount.provider,
+            evaluation.account_id,
+            *(
+                func.sum(case((evaluation.status == models.ComplianceStatus(column), 1), else_=0))
+                for column in _ROLLUP_COLUMNS
+            ),
+            func.max(evaluation.last_checked_at),
+        )
+        .join(evaluation.account)
+        .group_by(models.CloudAccount.provider, evaluation.account_id)
+    )
+    table = models.ComplianceRollup.__table__
+    db.execute(delete(table))
+    result = db.execute(
+        table.insert().from_select(
+            ["provider", "account_id", *_ROLLUP_COLUMNS, "updated_at"], source
+        )
+    )
+
+    # Book any drift into the current trend bucket so the cumulative trend
+    # lands on the rebuilt totals.
+    rollup_totals = db.execute(select(*(func.coalesce(func.sum(table.c[c]), 0) for c in _ROLLUP_COLUMNS))).one()
+    trend = models.ComplianceTrendHourly.__table__
+    trend_totals = db.execute(select(*(func.coalesce(func.sum(trend.c[c]), 0) for c in _ROLLUP_COLUMNS))).one()
+    _apply_trend_deltas(
+        db,
+        datetime.utcnow(),
+        Counter({
+            models.ComplianceStatus(column): actual - tracked
+            for column, actual, tracked in zip(_ROLLUP_COLUMNS, rollup_totals, trend_totals)
+        }),
+    )
+    db.commit()
+    dashboard_cache.invalidate()
+    return result.rowcount
+
+
+TREND_BUCKETS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+TREND_MAX_POINTS = 5000
+
+
+def _bucket_floor(moment: datetime, bucket: str) -> datetime:
+    floored = moment.replace(minute=0, second=0, microsecond=0)
+    if bucket in ("daily", "weekly"):
+        floored = floored.replace(hour=0)
+    if bucket == "weekly":
+        floored -= timedelta(days=floored.weekday())
+    return floored
+
+
+def _apply_trend_deltas(db: Session, moment: datetime, deltas: Counter) -> None:
+    """Add fleet-wide status count deltas to the hourly trend bucket containing ``moment``."""
+    row = {"bucket_start": _bucket_floor(moment, "hourly")}
+    row.update(dict.fromkeys(_ROLLUP_COLUMNS, 0))
+    for evaluation_status, count in deltas.items():
+        row[models.ComplianceStatus(evaluation_status).value] += count
+    if not any(row[column] for column in _ROLLUP_COLUMNS):
+        return
+
+    table = models.ComplianceTrendHourly.__table__
+    stmt = _dialect_insert(db)(table).values([row])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.bucket_start],
+        set_={column: table.c[column] + stmt.excluded[column] for column in _ROLLUP_COLUMNS},
+    )
+    db.execute(stmt)
+
+
+def get_compliance_trend(db: Session, start: datetime, end: datetime, bucket: str) -> schemas.ComplianceTrend:
+    """
+    Return fleet compliance counts at the end of each bucket between ``start`` and ``end``.
+
+    Hourly trend rows hold net status deltas, so the state at any point is the
+    running sum; the read touches one aggregate row plus one row per hour in range.
+    """
+    if start >= end:
+        raise ValueError("'from' must be earlier than 'to'")
+    step = TREND_BUCKETS[bucket]
+    first = _bucket_floor(start, bucket)
+    if (end - first) / step > TREND_MAX_POINTS:
+        raise ValueError(f"Range too large for {bucket} buckets (max {TREND_MAX_POINTS} points)")
+
+    trend = models.ComplianceTrendHourly.__table__
+    baseline = db.execute(
+        select(*(func.coalesce(func.sum(trend.c[c]), 0) for c in _ROLLUP_COLUMNS)).where(
+            trend.c.bucket_start < first
+        )
+    ).one()
+    state = dict(zip(_ROLLUP_COLUMNS, baseline))
+    rows = db.execute(
+        select(trend.c.bucket_start, *(trend.c[c] for c in _ROLLUP_COLUMNS))
+        .where(trend.c.bucket_start >= first, trend.c.bucket_start < end)
+        .order_by(trend.c.bucket_start)
+    ).all()
+
+    points: list[schemas.ComplianceTrendPoint] = []
+    position = 0
+    bucket_start = first
+    while bucket_start < end:
+        bucket_end = bucket_start + step
+        while position < len(rows) and rows[position][0] < bucket_end:
+            for column, delta in zip(_ROLLUP_COLUMNS, rows[position][1:]):
+                state[column] += delta
+            position += 1
+        total = sum(state.values())
+        points.append(
+            schemas.ComplianceTrendPoint(
+                bucket_start=bucket_start,
+                total=total,
+                score=round(state["compliant"] * 100 / total, 1) if total else 0.0,
+                **state,
+            )
+        )
+        bucket_start = bucket_end
+
+    return schemas.ComplianceTrend(bucket=bucket, start=first, end=end, points=points)
+
+
 # ===========================
 # Cloud Account CRUD Operations
 # ===========================
 
-def get_accounts(db: Session, skip: int = 0, limit: int = 100) -> list[models.CloudAccount]:
-    """Get all cloud accounts."""
-    return db.query(models.CloudAccount).offset(skip).limit(limit).all()
+ACCOUNT_PAGE_KEYS = (models.CloudAccount.created_at, models.CloudAccount.id)
+
+
+def get_accounts(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> list[models.CloudAccount]:
+    """Get the newest cloud accounts, paged by cursor (or legacy offset)."""
+    stmt = pagination.keyset(select(models.CloudAccount), ACCOUNT_PAGE_KEYS, cursor=cursor, limit=limit)
+    if skip and not cursor:
+        stmt = stmt.offset(skip)
+    return list(db.execute(stmt).scalars())
 
 
 def get_account(db: Session, account_id: int) -> Optional[models.CloudAccount]:
@@ -495,7 +1420,9 @@ def create_account(
     db_account = models.CloudAccount(**account_in.model_dump())
     db.add(db_account)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_account)
+    log_account_provisioning(db_account)
     return db_account
 
 
@@ -515,6 +1442,7 @@ def update_account(
     
     db_account.updated_at = datetime.utcnow()
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_account)
     return db_account
 
@@ -525,45 +1453,807 @@ def delete_account(db: Session, account_id: int) -> bool:
     if not db_account:
         return False
     
+    record_transitions(db, _removal_transitions(db, models.PolicyEvaluation.account_id == account_id))
+    db.execute(delete(models.ComplianceRollup).where(models.ComplianceRollup.account_id == account_id))
+    db.execute(delete(models.SyncRun).where(models.SyncRun.account_id == account_id))
+    db.execute(delete(models.SyncJob).where(models.SyncJob.account_id == account_id))
+    db.execute(delete(models.Resource).where(models.Resource.account_id == account_id))
     db.delete(db_account)
     db.commit()
+    dashboard_cache.invalidate()
     return True
 
 
+# ===========================
+# Sync Job Operations
+# ===========================
+
+SYNC_JOB_MAX_ATTEMPTS = 3
+ACTIVE_SYNC_JOB_STATUSES = (models.SyncJobStatus.QUEUED, models.SyncJobStatus.RUNNING)
+
+
+def get_sync_job(db: Session, job_id: int) -> Optional[models.SyncJob]:
+    """Get a specific sync job by ID."""
+    return db.get(models.SyncJob, job_id)
+
+
+def count_active_sync_jobs(db: Session) -> int:
+    """Count jobs that are queued or running, across all workers."""
+    return db.execute(
+        select(func.count()).select_from(models.SyncJob).where(models.SyncJob.status.in_(ACTIVE_SYNC_JOB_STATUSES))
+    ).scalar_one()
+
+
+def _insert_sync_jobs(db: Session, rows: list[dict]):
+    """INSERT queued jobs, skipping accounts that already have an active one (uq_sync_jobs_active_account)."""
+    table = models.SyncJob.__table__
+    return (
+        _dialect_insert(db)(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[table.c.account_id], index_where=text(models.ACTIVE_SYNC_JOB))
+    )
+
+
+def enqueue_sync_job(db: Session, account_id: int) -> models.SyncJob:
+    """
+    Queue a sync for the account, or return the job already queued or running
+    for it. The check is the insert itself, so concurrent callers (several API
+    processes' schedulers, say) never queue two jobs for one account.
+    """
+    now = datetime.utcnow()
+    db.execute(_insert_sync_jobs(db, [{
+        "account_id": account_id,
+        "status": models.SyncJobStatus.QUEUED,
+        "stage": "queued",
+        "progress": 0,
+        "attempts": 0,
+        "created_at": now,
+        "updated_at": now,
+    }]))
+    db.commit()
+    return db.execute(
+        select(models.SyncJob).where(
+            models.SyncJob.account_id == account_id,
+            models.SyncJob.status.in_(ACTIVE_SYNC_JOB_STATUSES),
+        )
+    ).scalar_one()
+
+
+def _claimable_sync_jobs(now: datetime):
+    return or_(
+        models.SyncJob.status == models.SyncJobStatus.QUEUED,
+        and_(
+            models.SyncJob.status == models.SyncJobStatus.RUNNING,
+            models.SyncJob.lease_expires_at < now,
+        ),
+    )
+
+
+def claim_sync_job(db: Session, worker_id: str, lease_seconds: float) -> Optional[models.SyncJob]:
+    """
+    Lease the oldest claimable job to ``worker_id``.
+
+    Queued jobs and running jobs whose lease has expired (the worker died)
+    are claimable; expired jobs that have used up their attempts are failed
+    instead. Candidates are read with ``FOR UPDATE SKIP LOCKED`` where the
+    database supports it, and the claim itself is a conditional UPDATE, so
+    two workers can never hold the same job.
+    """
+    now = datetime.utcnow()
+    db.execute(
+        update(models.SyncJob)
+        .where(
+            models.SyncJob.status == models.SyncJobStatus.RUNNING,
+            models.SyncJob.lease_expires_at < now,
+            models.SyncJob.attempts >= SYNC_JOB_MAX_ATTEMPTS,
+        )
+        .values(
+            status=models.SyncJobStatus.FAILED,
+            message=f"Worker lease expired {SYNC_JOB_MAX_ATTEMPTS} times",
+            lease_owner=None,
+            finished_at=now,
+            updated_at=now,
+        )
+    )
+    candidates = db.execute(
+        select(models.SyncJob.id)
+        .where(_claimable_sync_jobs(now))
+        .order_by(models.SyncJob.created_at, models.SyncJob.id)
+        .limit(5)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    claimed_id = None
+    for job_id in candidates:
+        result = db.execute(
+            update(models.SyncJob)
+            .where(models.SyncJob.id == job_id, _claimable_sync_jobs(now))
+            .values(
+                status=models.SyncJobStatus.RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=models.SyncJob.attempts + 1,
+                started_at=func.coalesce(models.SyncJob.started_at, now),
+                updated_at=now,
+            )
+        )
+        if result.rowcount == 1:
+            claimed_id = job_id
+            break
+    db.commit()
+    return get_sync_job(db, claimed_id) if claimed_id is not None else None
+
+
+def _owned_sync_job(job_id: int, worker_id: str):
+    return and_(
+        models.SyncJob.id == job_id,
+        models.SyncJob.lease_owner == worker_id,
+        models.SyncJob.status == models.SyncJobStatus.RUNNING,
+    )
+
+
+def report_sync_job_progress(
+    db: Session,
+    job_id: int,
+    worker_id: str,
+    *,
+    stage: str,
+    progress: int,
+    lease_seconds: float,
+) -> bool:
+    """Record progress and renew the lease; returns False if the worker no longer holds it."""
+    now = datetime.utcnow()
+    result = db.execute(
+        update(models.SyncJob)
+        .where(_owned_sync_job(job_id, worker_id))
+        .values(
+            stage=stage,
+            progress=progress,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            updated_at=now,
+        )
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def hold_sync_job_lease(db: Session, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+    """
+    Renew an unexpired lease inside the caller's transaction, without
+    committing; returns False if the worker no longer holds it. The UPDATE
+    keeps the job row locked until the caller commits, so a sync's writes are
+    committed only while its worker still owns the job.
+    """
+    now = datetime.utcnow()
+    result = db.execute(
+        update(models.SyncJob)
+        .where(_owned_sync_job(job_id, worker_id), models.SyncJob.lease_expires_at >= now)
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds), updated_at=now)
+    )
+    return result.rowcount == 1
+
+
+def finish_sync_job(
+    db: Session,
+    job_id: int,
+    worker_id: str,
+    *,
+    succeeded: bool,
+    message: Optional[str] = None,
+    inventory: Optional[schemas.InventorySyncResult] = None,
+) -> bool:
+    """Mark a leased job succeeded or failed and release the lease."""
+    now = datetime.utcnow()
+    values = dict(
+        status=models.SyncJobStatus.SUCCEEDED if succeeded else models.SyncJobStatus.FAILED,
+        stage="done" if succeeded else models.SyncJob.stage,
+        message=message,
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+    if succeeded:
+        values["progress"] = 100
+    if inventory is not None:
+        values.update(
+            resources_total=inventory.total,
+            resources_changed=inventory.changed,
+            resources_deleted=inventory.deleted,
+            resources_skipped=inventory.skipped,
+        )
+    result = db.execute(update(models.SyncJob).where(_owned_sync_job(job_id, worker_id)).values(**values))
+    db.commit()
+    return result.rowcount == 1
+
+
+def _batch_accounts(batch: models.SyncBatch, provider: models.CloudProvider):
+    account = models.CloudAccount
+    criteria = [account.provider == provider, account.id <= batch.max_account_id]
+    if batch.account_status is not None:
+        criteria.append(account.status == batch.account_status)
+    return and_(*criteria)
+
+
+def create_sync_batch(
+    db: Session,
+    *,
+    provider: Optional[str] = None,
+    account_status: Optional[str] = None,
+) -> models.SyncBatch:
+    """Record a bulk sync of the matching accounts and enqueue its first jobs."""
+    account = models.CloudAccount
+    stmt = select(func.count(), func.max(account.id))
+    if provider is not None:
+        stmt = stmt.where(account.provider == models.CloudProvider(provider))
+    if account_status is not None:
+        stmt = stmt.where(account.status == models.AccountStatus(account_status))
+    total, max_account_id = db.execute(stmt).one()
+
+    now = datetime.utcnow()
+    batch = models.SyncBatch(
+        provider=models.CloudProvider(provider) if provider is not None else None,
+        account_status=models.AccountStatus(account_status) if account_status is not None else None,
+        total=total,
+        max_account_id=max_account_id or 0,
+        cursors={},
+        created_at=now,
+        dispatched_at=now if total == 0 else None,
+    )
+    db.add(batch)
+    db.commit()
+    dispatch_sync_batches(db)
+    db.refresh(batch)
+    return batch
+
+
+def _active_jobs_by_provider(db: Session) -> Counter:
+    rows = db.execute(
+        select(models.CloudAccount.provider, func.count())
+        .join(models.SyncJob, models.SyncJob.account_id == models.CloudAccount.id)
+        .where(models.SyncJob.status.in_(ACTIVE_SYNC_JOB_STATUSES))
+        .group_by(models.CloudAccount.provider)
+    )
+    return Counter({provider: count for provider, count in rows})
+
+
+def _enqueue_batch_jobs(db: Session, batch_id: int, account_ids: list[int]) -> None:
+    """Queue jobs for the accounts, adopting jobs already active for any of them."""
+    if not account_ids:
+        return
+    now = datetime.utcnow()
+    db.execute(_insert_sync_jobs(db, [
+        {
+            "account_id": account_id,
+            "batch_id": batch_id,
+            "status": models.SyncJobStatus.QUEUED,
+            "stage": "queued",
+            "progress": 0,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for account_id in account_ids
+    ]))
+    db.execute(
+        update(models.SyncJob)
+        .where(
+            models.SyncJob.account_id.in_(account_ids),
+            models.SyncJob.status.in_(ACTIVE_SYNC_JOB_STATUSES),
+            models.SyncJob.batch_id.is_(None),
+        )
+        .values(batch_id=batch_id)
+    )
+
+
+_batch_dispatch_lock = threading.Lock()
+
+
+def dispatch_sync_batches(db: Session) -> int:
+    """
+    Enqueue the next accounts of open bulk syncs; returns how many were dispatched.
+
+    Each provider is topped up to ``SYNC_PROVIDER_IN_FLIGHT`` queued or
+    running jobs, and the fleet to ``SYNC_MAX_CONCURRENT``, so the queue
+    stays the same size however many accounts a batch covers. Batches are
+    served oldest first. Safe to call from any worker or process:
+    dispatchers take turns on the open batches' row locks (and, for
+    databases without them, a process-wide lock).
+    """
+    with _batch_dispatch_lock:
+        return _dispatch_sync_batches(db)
+
+
+def _dispatch_sync_batches(db: Session) -> int:
+    batches = db.execute(
+        select(models.SyncBatch)
+        .where(models.SyncBatch.dispatched_at.is_(None))
+        .order_by(models.SyncBatch.id)
+        .with_for_update()
+    ).scalars().all()
+    if not batches:
+        db.rollback()
+        return 0
+
+    active = _active_jobs_by_provider(db)
+    capacity = settings.sync_max_concurrent - sum(active.values())
+    dispatched = 0
+    for batch in batches:
+        cursors = dict(batch.cursors or {})
+        providers = [batch.provider] if batch.provider is not None else list(models.CloudProvider)
+        for provider in providers:
+            after = cursors.get(provider.value, 0)
+            room = min(settings.sync_provider_in_flight.get(provider.value, 1) - active[provider], capacity)
+            if after >= batch.max_account_id or room <= 0:
+                continue
+            account_ids = list(db.execute(
+                select(models.CloudAccount.id)
+                .where(_batch_accounts(batch, provider), models.CloudAccount.id > after)
+                .order_by(models.CloudAccount.id)
+                .limit(room)
+            ).scalars())
+            if account_ids:
+                _enqueue_batch_jobs(db, batch.id, account_ids)
+            # A short page means nothing is left for this provider.
+            cursors[provider.value] = account_ids[-1] if len(account_ids) == room else batch.max_account_id
+            active[provider] += len(account_ids)
+            capacity -= len(account_ids)
+            batch.dispatched += len(account_ids)
+            dispatched += len(account_ids)
+        batch.cursors = cursors
+        if all(cursors.get(provider.value, 0) >= batch.max_account_id for provider in providers):
+            batch.dispatched_at = datetime.utcnow()
+    db.commit()
+    return dispatched
+
+
+def count_open_sync_batches(db: Session) -> int:
+    """Count bulk syncs that still have accounts to enqueue."""
+    return db.execute(
+        select(func.count()).select_from(models.SyncBatch).where(models.SyncBatch.dispatched_at.is_(None))
+    ).scalar_one()
+
+
+def get_sync_batch(db: Session, batch_id: int) -> Optional[models.SyncBatch]:
+    """Get a specific bulk sync by ID."""
+    return db.get(models.SyncBatch, batch_id)
+
+
+def get_sync_batches(db: Session, *, limit: int = 20) -> list[models.SyncBatch]:
+    """Get the most recent bulk syncs."""
+    return list(db.execute(
+        select(models.SyncBatch).order_by(models.SyncBatch.id.desc()).limit(limit)
+    ).scalars())
+
+
+def get_sync_batch_progress(db: Session, batch: models.SyncBatch) -> schemas.SyncBatchRead:
+    """Aggregate the batch's job statuses and progress, overall and per provider."""
+    rows = db.execute(
+        select(
+            models.CloudAccount.provider,
+            models.SyncJob.status,
+            func.count(),
+            func.coalesce(func.sum(models.SyncJob.progress), 0),
+        )
+        .join(models.CloudAccount, models.CloudAccount.id == models.SyncJob.account_id)
+        .where(models.SyncJob.batch_id == batch.id)
+        .group_by(models.CloudAccount.provider, models.SyncJob.status)
+    ).all()
+
+    providers: dict[models.CloudProvider, Counter] = defaultdict(Counter)
+    progress_points = 0
+    for provider, job_status, count, progress in rows:
+        providers[provider][models.SyncJobStatus(job_status).value] += count
+        progress_points += progress if job_status in ACTIVE_SYNC_JOB_STATUSES else 100 * count
+    totals: Counter = sum(providers.values(), Counter())
+    finished = totals["succeeded"] + totals["failed"]
+    return schemas.SyncBatchRead(
+        id=batch.id,
+        provider=batch.provider.value if batch.provider else None,
+        account_status=batch.account_status.value if batch.account_status else None,
+        total=batch.total,
+        dispatched=batch.dispatched,
+        waiting=max(batch.total - batch.dispatched, 0),
+        queued=totals["queued"],
+        running=totals["running"],
+        succeeded=totals["succeeded"],
+        failed=totals["failed"],
+        progress=progress_points // batch.total if batch.total else 100,
+        done=batch.dispatched_at is not None and finished == sum(totals.values()),
+        created_at=batch.created_at,
+        dispatched_at=batch.dispatched_at,
+        providers=[
+            schemas.SyncBatchProviderProgress(
+                provider=provider.value,
+                queued=counts["queued"],
+                running=counts["running"],
+                succeeded=counts["succeeded"],
+                failed=counts["failed"],
+            )
+            for provider, counts in sorted(providers.items(), key=lambda item: item[0].value)
+        ],
+    )
+
+
+SYNC_RUN_PAGE_KEYS = (models.SyncRun.started_at, models.SyncRun.id)
+SYNC_RUN_METRICS = (
+    "duration_ms", "auth_ms", "list_ms", "fetch_ms", "evaluate_ms", "persist_ms",
+    "resources_per_second", "api_calls", "bytes_transferred", "errors",
+)
+SYNC_RUN_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def record_sync_run(
+    db: Session,
+    *,
+    job_id: Optional[int],
+    account_id: int,
+    metrics: SyncMetrics,
+    error: Optional[str] = None,
+) -> models.SyncRun:
+    """Store the timings and counters of one finished sync attempt."""
+    account = get_account(db, account_id)
+    phases = {f"{phase}_ms": metrics.phases_ms.get(phase) for phase in SYNC_PHASES}
+    run = models.SyncRun(
+        job_id=job_id,
+        account_id=account_id,
+        provider=account.provider,
+        status=models.SyncJobStatus.FAILED if error else models.SyncJobStatus.SUCCEEDED,
+        error=error,
+        started_at=metrics.started_at,
+        finished_at=datetime.utcnow(),
+        duration_ms=metrics.duration_ms,
+        resources=metrics.resources,
+        resources_per_second=metrics.resources_per_second(),
+        api_calls=metrics.api_calls,
+        bytes_transferred=metrics.bytes_transferred,
+        errors=metrics.errors,
+        **phases,
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def get_account_sync_runs(
+    db: Session,
+    account_id: int,
+    *,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> list[models.SyncRun]:
+    """Get an account's sync runs, most recent first."""
+    stmt = select(models.SyncRun).where(models.SyncRun.account_id == account_id)
+    stmt = pagination.keyset(stmt, SYNC_RUN_PAGE_KEYS, cursor=cursor, limit=limit)
+    return list(db.execute(stmt).scalars())
+
+
+def _sync_run_percentiles(db: Session, criteria: list) -> list[schemas.SyncRunPercentiles]:
+    columns = [getattr(models.SyncRun, metric) for metric in SYNC_RUN_METRICS]
+    if db.get_bind().dialect.name == "postgresql":
+        row = db.execute(
+            select(*(
+                aggregate
+                for column in columns
+                for aggregate in (
+                    *(func.percentile_cont(fraction).within_group(column) for fraction in SYNC_RUN_PERCENTILES),
+                    func.max(column),
+                )
+            )).where(*criteria)
+        ).one()
+        width = len(SYNC_RUN_PERCENTILES) + 1
+        stats = [row[index:index + width] for index in range(0, len(row), width)]
+    else:
+        values: list[list[float]] = [[] for _ in columns]
+        for row in db.execute(select(*columns).where(*criteria)):
+            for series, value in zip(values, row):
+                if value is not None:
+                    series.append(value)
+        stats = []
+        for series in values:
+            series.sort()
+            stats.append(
+                [sync_telemetry.percentile(series, fraction) for fraction in SYNC_RUN_PERCENTILES] + [series[-1]]
+                if series else [None] * (len(SYNC_RUN_PERCENTILES) + 1)
+            )
+    return [
+        schemas.SyncRunPercentiles(metric=metric, p50=p50, p90=p90, p99=p99, max=maximum)
+        for metric, (p50, p90, p99, maximum) in zip(SYNC_RUN_METRICS, stats)
+    ]
+
+
+def summarize_sync_runs(
+    db: Session,
+    *,
+    since: datetime,
+    until: Optional[datetime] = None,
+    provider: Optional[str] = None,
+    slowest: int = 10,
+) -> schemas.SyncRunSummary:
+    """Fleet-wide percentiles of sync run metrics over a time window, with the slowest runs."""
+    run = models.SyncRun
+    criteria = [run.started_at >= as_naive_utc(since)]
+    if until is not None:
+        criteria.append(run.started_at < as_naive_utc(until))
+    if provider is not None:
+        criteria.append(run.provider == models.CloudProvider(provider))
+
+    runs, failed = db.execute(
+        select(func.count(), func.count(case((run.status == models.SyncJobStatus.FAILED, 1)))).where(*criteria)
+    ).one()
+    return schemas.SyncRunSummary(
+        since=since,
+        until=until,
+        provider=provider,
+        runs=runs,
+        failed=failed,
+        metrics=_sync_run_percentiles(db, criteria) if runs else [],
+        slowest=list(db.execute(
+            select(run).where(*criteria).order_by(run.duration_ms.desc()).limit(slowest)
+        ).scalars()),
+    )
+
+
 # ===========================
 # Notification CRUD Operations
 # ===========================
 
-def get_notifications(db: Session, skip: int = 0, limit: int = 100) -> list[models.Notification]:
-    """Get all notifications."""
-    return db.query(models.Notification).order_by(
-        models.Notification.created_at.desc()
-    ).offset(skip).limit(limit).all()
+NOTIFICATION_PAGE_KEYS = (models.Notification.created_at, models.Notification.id)
+
+
+def get_notifications(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> list[models.Notification]:
+    """Get the newest notifications, paged by cursor (or legacy offset)."""
+    stmt = pagination.keyset(
+        select(models.Notification), NOTIFICATION_PAGE_KEYS, cursor=cursor, limit=limit
+    )
+    if skip and not cursor:
+        stmt = stmt.offset(skip)
+    return list(db.execute(stmt).scalars())
 
 
 def create_notification(
     db: Session,
     notification_in: schemas.NotificationCreate
 ) -> models.Notification:
-    """Create a new notification."""
-    db_notification = models.Notification(**notification_in.model_dump())
-    db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
-    return db_notification
+    """
+    Create a notification, or bump the repeat count of a recent one with the
+    same type, policy and account. Written through the notification writer
+    (committed before returning) and published to open notification streams.
+    """
+    return notification_writer.submit([notification_in], durable=True)[0]
+
+
+def get_notifications_after(
+    db: Session, after_id: int, limit: int = 100, created_since: Optional[datetime] = None
+) -> list[models.Notification]:
+    """
+    Notifications with ids past ``after_id``, in id order (stream resume and
+    catch-up); with ``created_since``, only those created since then.
+    """
+    stmt = select(models.Notification).where(models.Notification.id > after_id)
+    if created_since is not None:
+        stmt = stmt.where(models.Notification.created_at >= created_since)
+    return list(db.execute(stmt.order_by(models.Notification.id).limit(limit)).scalars())
+
+
+def get_latest_notification_id(db: Session) -> int:
+    return db.execute(select(func.max(models.Notification.id))).scalar() or 0
+
+
+# Read state is tracked per user when the caller is known: everything
+# created up to the user's ``read_through`` mark is read, as long as it already
+# existed when the mark was set (``read_through_id``: notifications are dated
+# when submitted and may be written after a mark with an earlier date). So
+# are the few notifications past it they opened one by one (``read_ids``,
+# keyed by id with the ``created_at`` they were read at, so a repeat bumped by
+# deduplication reads as unread again). Anonymous callers share the legacy
+# ``is_read`` flag.
+
+def get_notification_read_state(db: Session, user_id: int) -> Optional[models.NotificationReadState]:
+    return db.get(models.NotificationReadState, user_id)
+
+
+def _notification_read_state_for_update(db: Session, user_id: int) -> models.NotificationReadState:
+    state = db.execute(
+        select(models.NotificationReadState)
+        .where(models.NotificationReadState.user_id == user_id)
+        .with_for_update()
+    ).scalar_one_or_none()
+    if state is None:
+        if db.get(models.User, user_id) is None:
+            raise ValueError(f"Unknown user {user_id}")
+        state = models.NotificationReadState(user_id=user_id, read_ids={})
+        db.add(state)
+    return state
+
+
+def _under_read_mark(state: models.NotificationReadState, notification_id: int, created_at: datetime) -> bool:
+    return (
+        state.read_through is not None
+        and created_at <= state.read_through
+        and notification_id <= (state.read_through_id or 0)
+    )
 
 
-def mark_notification_read(db: Session, notification_id: int) -> Optional[models.Notification]:
-    """Mark a notification as read."""
-    db_notification = db.query(models.Notification).filter(
-        models.Notification.id == notification_id
-    ).first()
-    
+def is_notification_read(state: Optional[models.NotificationReadState], notification: models.Notification) -> bool:
+    if state is None:
+        return False
+    if _under_read_mark(state, notification.id, notification.created_at):
+        return True
+    return state.read_ids.get(str(notification.id)) == notification.created_at.isoformat()
+
+
+def _unread_criteria(state: Optional[models.NotificationReadState]) -> list:
+    notification = models.Notification
+    if state is None:
+        return []
+    criteria = []
+    if state.read_through is not None:
+        criteria.append(or_(
+            notification.created_at > state.read_through, notification.id > (state.read_through_id or 0)
+        ))
+    if state.read_ids:
+        read = [(int(key), datetime.fromisoformat(value)) for key, value in state.read_ids.items()]
+        criteria.append(tuple_(notification.id, notification.created_at).not_in(read))
+    return criteria
+
+
+def _compact_notification_read_state(db: Session, state: models.NotificationReadState) -> None:
+    """
+    Advance ``read_through`` over individually read notifications up to the
+    oldest unread one (never past now), and ``read_through_id`` to the
+    newest notification below it.
+    """
+    notification = models.Notification
+    oldest_unread = db.execute(select(func.min(notification.created_at)).where(*_unread_criteria(state))).scalar()
+    stmt = select(func.max(notification.created_at), func.max(notification.id)).where(
+        notification.created_at <= datetime.utcnow()
+    )
+    if oldest_unread is not None:
+        stmt = stmt.where(notification.created_at < oldest_unread)
+    read_through, through_id = db.execute(stmt).one()
+    if read_through is None or (state.read_through is not None and read_through <= state.read_through):
+        return
+    state.read_through = read_through
+    state.read_through_id = max(through_id, state.read_through_id or 0)
+    state.read_ids = {
+        key: value for key, value in state.read_ids.items()
+        if not _under_read_mark(state, int(key), datetime.fromisoformat(value))
+    }
+
+
+def notifications_for_user(
+    db: Session, notifications: Sequence[models.Notification], user_id: Optional[int]
+) -> list[schemas.NotificationRead]:
+    """Notifications as the user sees them, with ``is_read`` from their read state."""
+    if user_id is None:
+        return [schemas.NotificationRead.model_validate(notification) for notification in notifications]
+    state = get_notification_read_state(db, user_id)
+    return [
+        schemas.NotificationRead.model_validate(notification).model_copy(
+            update={"is_read": is_notification_read(state, notification)}
+        )
+        for notification in notifications
+    ]
+
+
+def count_unread_notifications(db: Session, user_id: Optional[int] = None) -> int:
+    """Count unread notifications: a range count past the user's mark, or the partial unread index."""
+    stmt = select(func.count()).select_from(models.Notification)
+    if user_id is None:
+        return db.execute(stmt.where(~models.Notification.is_read)).scalar_one()
+    return db.execute(stmt.where(*_unread_criteria(get_notification_read_state(db, user_id)))).scalar_one()
+
+
+def mark_notification_read(
+    db: Session, notification_id: int, user_id: Optional[int] = None
+) -> Optional[models.Notification]:
+    """Mark a notification as read (for ``user_id`` only, when given)."""
+    db_notification = db.get(models.Notification, notification_id)
     if not db_notification:
         return None
-    
-    db_notification.is_read = True
+
+    if user_id is None:
+        db_notification.is_read = True
+    else:
+        state = _notification_read_state_for_update(db, user_id)
+        if not is_notification_read(state, db_notification):
+            state.read_ids = {**state.read_ids, str(db_notification.id): db_notification.created_at.isoformat()}
+            _compact_notification_read_state(db, state)
     db.commit()
     db.refresh(db_notification)
     return db_notification
 
+
+def mark_all_notifications_read(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Mark every unread notification read. Per user this just moves their
+    ``read_through`` mark to the newest notification (or to now, with the few
+    notifications dated later kept in ``read_ids``) and ``read_through_id``
+    to the newest id; anonymously it is one UPDATE over the partial unread
+    index.
+    """
+    if user_id is None:
+        stmt = (
+            update(models.Notification)
+            .where(~models.Notification.is_read)
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        updated = db.execute(stmt).rowcount
+        db.commit()
+        return updated
+
+    state = _notification_read_state_for_update(db, user_id)
+    updated = count_unread_notifications(db, user_id)
+    notification = models.Notification
+    latest, latest_id = db.execute(select(func.max(notification.created_at), func.max(notification.id))).one()
+    state.read_ids = {}
+    if latest_id is not None:
+        state.read_through = min(latest, datetime.utcnow())
+        state.read_through_id = latest_id
+        # Provisioning steps are dated a few seconds ahead.
+        state.read_ids = {
+            str(notification_id): created_at.isoformat()
+            for notification_id, created_at in db.execute(
+                select(notification.id, notification.created_at).where(notification.created_at > state.read_through)
+            )
+        }
+    db.commit()
+    return updated
+
+
+NOTIFICATION_ARCHIVE_PAGE_KEYS = (models.NotificationArchive.created_at, models.NotificationArchive.id)
+NOTIFICATION_ARCHIVE_COLUMNS = (
+    "id", "type", "title", "message", "policy_id", "account_id", "occurrences", "created_at",
+)
+
+
+def archive_notifications(db: Session, *, older_than: datetime, batch_size: int) -> int:
+    """
+    Move notifications created before ``older_than`` to ``notification_archive``.
+
+    Rows move oldest first, ``batch_size`` at a time, each batch copied and
+    deleted in its own short transaction so writers are never blocked for
+    long. Returns how many notifications were archived.
+    """
+    notification = models.Notification
+    archived = 0
+    while True:
+        ids = list(db.execute(
+            select(notification.id)
+            .where(notification.created_at < older_than)
+            .order_by(notification.created_at, notification.id)
+            .limit(batch_size)
+        ).scalars())
+        if not ids:
+            break
+        db.execute(
+            insert(models.NotificationArchive).from_select(
+                [*NOTIFICATION_ARCHIVE_COLUMNS, "archived_at"],
+                select(
+                    *(getattr(notification, column) for column in NOTIFICATION_ARCHIVE_COLUMNS),
+                    literal(datetime.utcnow(), DateTime),
+                ).where(notification.id.in_(ids)),
+            )
+        )
+        db.execute(delete(notification).where(notification.id.in_(ids)))
+        db.commit()
+        archived += len(ids)
+        if len(ids) < batch_size:
+            break
+    return archived
+
+
+def get_archived_notifications(
+    db: Session, *, limit: int = 100, cursor: Optional[str] = None
+) -> list[models.NotificationArchive]:
+    """Archived notifications, newest first, paged by cursor."""
+    stmt = pagination.keyset(
+        select(models.NotificationArchive), NOTIFICATION_ARCHIVE_PAGE_KEYS, cursor=cursor, limit=limit
+    )
+    return list(db.execute(stmt).scalars())
+
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import time
 from collections.abc import Generator
+from typing import NamedTuple, Optional
 
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app import crud, schemas
+from app.cache import LRUCache
+from app.config import settings
 from app.database import SessionLocal
-from app.security import PasswordManager
+from app.security import PasswordManager, TokenClaims, TokenError, decode_token
 
 _password_manager = PasswordManager()
+_bearer = HTTPBearer(auto_error=False)
+
+
+class CachedUser(NamedTuple):
+    expires_at: float
+    user: schemas.UserRead
+
+
+# Users looked up for authenticated requests, kept for USER_CACHE_TTL_SECONDS.
+user_cache: LRUCache[int, CachedUser] = LRUCache(settings.user_cache_size)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -18,5 +35,52 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def get_token_claims(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> TokenClaims:
+    """Verify the bearer access token from its signature alone; no database access."""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    try:
+        return decode_token(credentials.credentials)
+    except TokenError as exc:
+        raise _unauthorized(str(exc)) from exc
+
+
+def get_current_user_id(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> Optional[int]:
+    """The caller's user id when a bearer token is sent, or None for anonymous callers."""
+    return None if credentials is None else get_token_claims(credentials).user_id
+
+
+def get_cached_user(db: Session, user_id: int) -> Optional[schemas.UserRead]:
+    now = time.monotonic()
+    entry = user_cache.get(user_id)
+    if entry is not None and entry.expires_at > now:
+        return entry.user
+    user = crud.get_user(db, user_id)
+    if user is None:
+        user_cache.discard(user_id)
+        return None
+    read = schemas.UserRead.model_validate(user)
+    user_cache.put(user_id, CachedUser(now + settings.user_cache_ttl_seconds, read))
+    return read
+
+
+def get_current_user(
+    claims: TokenClaims = Depends(get_token_claims), db: Session = Depends(get_db)
+) -> schemas.UserRead:
+    """The authenticated, active user, from the user cache when possible."""
+    user = get_cached_user(db, claims.user_id)
+    if user is None:
+        raise _unauthorized("User no longer exists")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return user
+
+
 def get_password_manager() -> PasswordManager:
     return _password_manager
@@ -0,0 +1,64 @@
+"""Streaming serialisers for large table exports."""
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+from collections.abc import Iterator
+from datetime import date, datetime
+
+from app import crud
+from app.database import get_db_session
+
+EXPORT_CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value: object) -> object:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _chunked_rows(chunk_rows: int) -> Iterator[list[tuple]]:
+    # The request-scoped session is closed before a streaming body is sent,
+    # so the export owns its session for the lifetime of the response.
+    db = get_db_session()
+    try:
+        chunk: list[tuple] = []
+        for row in crud.iter_evaluation_rows(db, batch_size=chunk_rows):
+            chunk.append(tuple(_plain(value) for value in row))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        db.close()
+
+
+def evaluations_ndjson(chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield evaluations as newline-delimited JSON, one chunk of rows at a time."""
+    columns = crud.EVALUATION_EXPORT_COLUMNS
+    for chunk in _chunked_rows(chunk_rows):
+        yield "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in chunk)
+
+
+def evaluations_csv(chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield evaluations as CSV with a header row, one chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(crud.EVALUATION_EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for chunk in _chunked_rows(chunk_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
@@ -16,9 +16,12 @@ from passlib.context import CryptContext
 # Imports
 from app.config import settings
 from app.database import Base, SessionLocal, engine
-from app.routers import accounts, auth, dashboard, notifications, policies
-from app import crud, schemas
+from app.routers import accounts, auth, dashboard, notifications, policies, resources, sync_jobs
+from app import connectors, crud, policy_engine, schemas, sync_scheduler, sync_worker
+from app.notification_bus import bus as notification_bus
+from app.notification_writer import writer as notification_writer
 from app.security import PasswordManager
+from app.pagination import NEXT_CURSOR_HEADER
 
 # ============ DEMO SEED IMPORT - REMOVE THIS LINE FOR PRODUCTION ============
 from app.seed import demo_records
@@ -33,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # --- DEBUGGING: Log Validation Errors to Vercel Console ---
@@ -47,12 +51,18 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # ----------------------------------------------------------
 
 # Include Routers
-for router in (auth.router, accounts.router, policies.router, dashboard.router, notifications.router):
+for router in (
+    auth.router, accounts.router, policies.router, dashboard.router, notifications.router, resources.router,
+    sync_jobs.router,
+):
     app.include_router(router)
 
 # API Router
 api_router = APIRouter(prefix="/api")
-for router in (auth.router, accounts.router, policies.router, dashboard.router, notifications.router):
+for router in (
+    auth.router, accounts.router, policies.router, dashboard.router, notifications.router, resources.router,
+    sync_jobs.router,
+):
     api_router.include_router(router)
 app.include_router(api_router)
 
@@ -165,6 +175,7 @@ def seed_demo_data(db: Session):
             instance = PolicyEvaluation(**eval_data)
             db.add(instance)
         db.commit()
+        crud.rebuild_compliance_rollup(db)
         print(f"✅ Created {len(evaluations)} policy evaluations")
         
         print(f"🔔 Creating {len(notifications)} notifications...")
@@ -208,6 +219,24 @@ def on_startup() -> None:
     else:
         print("⏭️  Skipping database initialization (Build mode)")
 
+@app.on_event("startup")
+def start_sync_workers() -> None:
+    if settings.sync_workers > 0:
+        sync_worker.pool.start()
+    if settings.sync_scheduler_enabled:
+        sync_scheduler.scheduler.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    sync_scheduler.scheduler.stop(timeout=5)
+    sync_worker.pool.stop(timeout=5)
+    notification_writer.stop(timeout=5)
+    notification_bus.stop(timeout=5)
+    connectors.shutdown()
+    policy_engine.shutdown_executor()
+
+
 @app.get("/debug/counts")
 def debug_counts():
     """Debug endpoint to check database counts"""
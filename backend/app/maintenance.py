@@ -0,0 +1,61 @@
+"""Operational maintenance commands.
+
+Usage::
+
+    python -m app.maintenance rebuild-rollup
+    python -m app.maintenance archive-notifications [--days 90]
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+
+from app import crud
+from app.config import settings
+from app.database import get_db_session
+
+
+def rebuild_rollup(args: argparse.Namespace) -> None:
+    db = get_db_session()
+    try:
+        rows = crud.rebuild_compliance_rollup(db)
+    finally:
+        db.close()
+    print(f"Rebuilt compliance rollup: {rows} account rows")
+
+
+def archive_notifications(args: argparse.Namespace) -> None:
+    db = get_db_session()
+    try:
+        archived = crud.archive_notifications(
+            db,
+            older_than=datetime.utcnow() - timedelta(days=args.days),
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+    print(f"Archived {archived} notifications older than {args.days} days")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Cloud Guard maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-rollup", help="Recompute compliance_rollup from policy_evaluations"
+    )
+    rebuild.set_defaults(handler=rebuild_rollup)
+
+    archive = commands.add_parser(
+        "archive-notifications", help="Move notifications past the retention period to notification_archive"
+    )
+    archive.add_argument("--days", type=int, default=settings.notification_retention_days)
+    archive.add_argument("--batch-size", type=int, default=settings.notification_archive_batch_size)
+    archive.set_defaults(handler=archive_notifications)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,29 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import (
+    JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Date,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
+# JSONB on Postgres so documents can be indexed and queried by containment.
+JSONDocument = JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), "postgresql")
+
 
 class CloudProvider(str, enum.Enum):
     AWS = "aws"
@@ -54,6 +62,13 @@ class NotificationType(str, enum.Enum):
     BROADCAST = "broadcast"
 
 
+class SyncJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -71,7 +86,10 @@ class User(Base):
 
 class CloudAccount(Base):
     __tablename__ = "cloud_accounts"
-    __table_args__ = (UniqueConstraint("provider", "external_id", name="uq_provider_account"),)
+    __table_args__ = (
+        UniqueConstraint("provider", "external_id", name="uq_provider_account"),
+        Index("ix_cloud_accounts_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     provider: Mapped[CloudProvider] = mapped_column(Enum(CloudProvider), index=True)
@@ -87,6 +105,9 @@ class CloudAccount(Base):
     sync_frequency: Mapped[str] = mapped_column(String(50), default="Daily")
     auto_sync: Mapped[bool] = mapped_column(Boolean, default=True)
     last_synced_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # When a complete inventory was last stored; every resource row still held
+    # for the account was present then.
+    inventory_seen_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     
     owner_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -100,7 +121,10 @@ class CloudAccount(Base):
 
 class Policy(Base):
     __tablename__ = "policies"
-    __table_args__ = (UniqueConstraint("provider", "control_id", name="uq_policy_provider_control"),)
+    __table_args__ = (
+        UniqueConstraint("provider", "control_id", name="uq_policy_provider_control"),
+        Index("ix_policies_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     provider: Mapped[CloudProvider] = mapped_column(Enum(CloudProvider), index=True)
@@ -133,7 +157,12 @@ class Policy(Base):
 
 class PolicyEvaluation(Base):
     __tablename__ = "policy_evaluations"
-    __table_args__ = (UniqueConstraint("policy_id", "account_id", name="uq_policy_account"),)
+    __table_args__ = (
+        UniqueConstraint("policy_id", "account_id", name="uq_policy_account"),
+        Index("ix_policy_evaluations_last_checked_at_id", "last_checked_at", "id"),
+        Index("ix_policy_evaluations_account_status", "account_id", "status", "last_checked_at"),
+        Index("ix_policy_evaluations_policy_status", "policy_id", "status", "last_checked_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     policy_id: Mapped[int] = mapped_column(Integer, ForeignKey("policies.id"), nullable=False)
@@ -142,17 +171,274 @@ class PolicyEvaluation(Base):
     last_checked_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     findings: Mapped[str | None] = mapped_column(Text, nullable=True)
     resource_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Inventory row of the resource named by resource_id; set by syncs that change the evaluation.
+    resource_ref_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("resources.id", ondelete="SET NULL"), nullable=True, index=True
+    )
 
     policy: Mapped[Policy] = relationship("Policy", back_populates="evaluations")
     account: Mapped[CloudAccount] = relationship("CloudAccount", back_populates="evaluations")
+    resource: Mapped[Resource | None] = relationship("Resource")
+
+
+class ComplianceRollup(Base):
+    """Per-account evaluation counts by status, maintained alongside every evaluation write."""
+
+    __tablename__ = "compliance_rollup"
+
+    provider: Mapped[CloudProvider] = mapped_column(Enum(CloudProvider), primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("cloud_accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Column names match ComplianceStatus values so deltas can be applied by status.
+    compliant: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    non_compliant: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    warning: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    unknown: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class EvaluationStatusHistory(Base):
+    """Append-only log of evaluation status transitions."""
+
+    __tablename__ = "evaluation_status_history"
+    __table_args__ = (
+        Index("ix_evaluation_status_history_account_changed", "account_id", "changed_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # No foreign keys: history outlives the evaluations, policies and accounts it describes.
+    evaluation_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    policy_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    account_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    previous_status: Mapped[ComplianceStatus | None] = mapped_column(Enum(ComplianceStatus), nullable=True)
+    status: Mapped[ComplianceStatus | None] = mapped_column(Enum(ComplianceStatus), nullable=True)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ComplianceTrendHourly(Base):
+    """Net fleet-wide change in evaluation counts per status within each hour."""
+
+    __tablename__ = "compliance_trend_hourly"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    compliant: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    non_compliant: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    warning: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    unknown: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class SyncBatch(Base):
+    """
+    Bulk sync of every account matching a provider and/or status filter.
+
+    Accounts are enqueued gradually, in id order per provider, so only a
+    bounded number of the batch's jobs are queued or running at a time;
+    ``cursors`` records the last account id dispatched for each provider.
+    """
+
+    __tablename__ = "sync_batches"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    provider: Mapped[CloudProvider | None] = mapped_column(Enum(CloudProvider), nullable=True)
+    account_status: Mapped[AccountStatus | None] = mapped_column(Enum(AccountStatus), nullable=True)
+    total: Mapped[int] = mapped_column(Integer, nullable=False)
+    dispatched: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Accounts created after the batch are not part of it.
+    max_account_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    cursors: Mapped[dict] = mapped_column(JSONDocument, default=dict, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    dispatched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+# Jobs still to run or running; an account has at most one of them.
+ACTIVE_SYNC_JOB = "status IN ('QUEUED', 'RUNNING')"
+
+
+class SyncJob(Base):
+    """Queued account sync, claimed by a background worker under a time-limited lease."""
+
+    __tablename__ = "sync_jobs"
+    __table_args__ = (
+        Index("ix_sync_jobs_status_created_at", "status", "created_at"),
+        Index(
+            "uq_sync_jobs_active_account",
+            "account_id",
+            unique=True,
+            postgresql_where=text(ACTIVE_SYNC_JOB),
+            sqlite_where=text(ACTIVE_SYNC_JOB),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("cloud_accounts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status: Mapped[SyncJobStatus] = mapped_column(Enum(SyncJobStatus), default=SyncJobStatus.QUEUED, nullable=False)
+    stage: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    lease_owner: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Inventory counts of the completed sync; skipped resources were unchanged and not re-evaluated.
+    resources_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    resources_changed: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    resources_deleted: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    resources_skipped: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    batch_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("sync_batches.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+
+    account: Mapped[CloudAccount] = relationship("CloudAccount")
+
+
+class SyncRun(Base):
+    """Timings and counters of one attempt at syncing an account."""
+
+    __tablename__ = "sync_runs"
+    __table_args__ = (
+        Index("ix_sync_runs_account_started_at", "account_id", "started_at"),
+        Index("ix_sync_runs_started_at", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("sync_jobs.id", ondelete="SET NULL"), nullable=True
+    )
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("cloud_accounts.id", ondelete="CASCADE"), nullable=False
+    )
+    provider: Mapped[CloudProvider] = mapped_column(Enum(CloudProvider), nullable=False)
+    status: Mapped[SyncJobStatus] = mapped_column(Enum(SyncJobStatus), nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Wall-clock milliseconds; a phase is NULL when the run never reached it.
+    duration_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    auth_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    list_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    fetch_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    evaluate_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    persist_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    resources: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    resources_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)
+    api_calls: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    bytes_transferred: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    errors: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class Resource(Base):
+    """Last synced snapshot of a cloud resource, with its policy violations."""
+
+    __tablename__ = "resources"
+    __table_args__ = (
+        UniqueConstraint("account_id", "native_id", name="uq_resource_account_native_id"),
+        Index("ix_resources_type_account", "resource_type", "account_id"),
+        Index("ix_resources_provider_region", "provider", "region"),
+        # Containment (@>) and key (?) lookups on config and violations; Postgres only.
+        Index("ix_resources_config", "config", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index("ix_resources_violations", "violations", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    account_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("cloud_accounts.id", ondelete="CASCADE"), nullable=False
+    )
+    provider: Mapped[CloudProvider] = mapped_column(Enum(CloudProvider), nullable=False)
+    resource_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    native_id: Mapped[str] = mapped_column(String(1024), nullable=False)
+    region: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    config: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
+    # sha256 of the snapshot, and of the policy versions it was last evaluated against.
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    policy_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    # {policy_id: [Sid, ...]} of the Deny statements the resource matched; NULL when none.
+    violations: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
+    first_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Stamped when the row is inserted or its snapshot changes; see seen_at.
+    last_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    account: Mapped[CloudAccount] = relationship("CloudAccount")
+
+    @property
+    def seen_at(self) -> datetime:
+        """When the resource was last present in a sync of its account."""
+        inventory_seen_at = self.account.inventory_seen_at
+        return max(self.last_seen, inventory_seen_at) if inventory_seen_at else self.last_seen
 
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_created_at_id", "created_at", "id"),
+        # Partial index over unread rows only: unread counts and mark-all-read
+        # touch just the unread notifications, however large the table grows.
+        Index(
+            "ix_notifications_unread",
+            "id",
+            postgresql_where=text("NOT is_read"),
+            sqlite_where=text("is_read = 0"),
+        ),
+        Index("ix_notifications_dedupe_key_created_at", "dedupe_key", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
     type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), default=NotificationType.BROADCAST)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    policy_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("policies.id", ondelete="SET NULL"), nullable=True
+    )
+    account_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("cloud_accounts.id", ondelete="SET NULL"), nullable=True
+    )
+    # "<type>:<policy_id>:<account_id>" for notifications about a policy or
+    # account; repeats within the dedupe window bump ``occurrences`` instead
+    # of adding rows (see app.notification_writer).
+    dedupe_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    occurrences: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+
+class NotificationArchive(Base):
+    """Notifications past the retention period (``python -m app.maintenance archive-notifications``)."""
+
+    __tablename__ = "notification_archive"
+    __table_args__ = (Index("ix_notification_archive_created_at_id", "created_at", "id"),)
+
+    # Keeps the notification's original id.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    type: Mapped[NotificationType] = mapped_column(Enum(NotificationType), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    policy_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    account_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    occurrences: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class NotificationReadState(Base):
+    """
+    One user's notification read state, in constant space: notifications
+    created up to ``read_through`` with ids up to ``read_through_id`` are
+    read, plus those in ``read_ids``.
+    """
+
+    __tablename__ = "notification_read_states"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    read_through: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Newest notification id when read_through was set, so notifications
+    # written later with an earlier created_at still read as unread.
+    read_through_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # {notification id: created_at it was read at} for notifications read
+    # individually past read_through; folded into read_through as it advances.
+    read_ids: Mapped[dict] = mapped_column(JSONDocument, nullable=False, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
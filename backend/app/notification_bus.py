@@ -0,0 +1,225 @@
+"""In-process pub/sub feeding ``GET /notifications/stream``.
+
+Writers publish notifications after committing them; each open stream holds
+a bounded queue on its own event loop. Events are serialised once per
+publish, not once per subscriber. A subscriber that falls behind is not
+allowed to grow its queue: it is flagged as overflowed and catches up from
+the database instead (see :mod:`app.routers.notifications`).
+
+Notifications committed by other processes reach the bus through a single
+poller per process, which runs only while a stream is open. Ids are handed
+out before commit, so a poll cannot stop at the highest id it has read: each
+poll re-reads the notifications created in the last
+``NOTIFICATION_STREAM_POLL_LAG_SECONDS`` and publishes the ones it has not
+published yet, plus the ones deduplication bumped since (their
+``occurrences`` grew and their ``created_at`` moved into the window).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import select, tuple_
+
+from app import models, schemas
+from app.config import settings
+from app.database import SessionLocal
+
+POLL_BATCH = 500
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationEvent(NamedTuple):
+    id: int
+    occurrences: int
+    created_at: datetime
+    data: str
+
+
+def to_event(notification: models.Notification) -> NotificationEvent:
+    return NotificationEvent(
+        notification.id,
+        notification.occurrences,
+        notification.created_at,
+        schemas.NotificationRead.model_validate(notification).model_dump_json(),
+    )
+
+
+def to_events(notifications: Iterable[models.Notification]) -> list[NotificationEvent]:
+    events = []
+    for notification in notifications:
+        try:
+            events.append(to_event(notification))
+        except ValueError:  # a row the read schema rejects; the list endpoint still serves it
+            logger.exception("Could not serialise notification %s for streaming", notification.id)
+    return events
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[NotificationEvent] = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def _offer(self, event: NotificationEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class NotificationBus:
+    def __init__(self, queue_size: int, poll_interval: float, poll_lag: float) -> None:
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.poll_lag = timedelta(seconds=poll_lag)
+        self._lock = threading.Lock()
+        self._subscriptions: set[Subscription] = set()
+        # Start of the window the next poll reads, and the occurrences
+        # published so far for each notification created inside it (locally
+        # or by the poller), so neither publishes a row twice. None while no
+        # stream is open.
+        self._window_start: Optional[datetime] = None
+        self._published: dict[int, tuple[int, datetime]] = {}
+        self._poller: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber on the running event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def watch(self) -> None:
+        """
+        Make sure notifications from other processes are published, starting
+        the poller if it is not running. Called by a stream once it has caught
+        up from the database; the poller's first read covers the lag window.
+        """
+        if self.poll_interval <= 0:
+            return
+        with self._lock:
+            if self._poller is not None:
+                return
+            self._window_start = datetime.utcnow() - self.poll_lag
+            self._stopping.clear()
+            self._poller = threading.Thread(target=self._poll_loop, name="notification-poller", daemon=True)
+            self._poller.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            poller = self._poller
+        self._stopping.set()
+        if poller is not None:
+            poller.join(timeout)
+
+    def publish(self, notifications: Iterable[models.Notification]) -> None:
+        """Hand committed notifications to every subscriber; callable from any thread."""
+        notifications = list(notifications)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            if self._window_start is not None:
+                for n in notifications:
+                    if n.created_at >= self._window_start:
+                        self._published[n.id] = (n.occurrences, n.created_at)
+        if subscriptions and notifications:
+            self._offer(subscriptions, to_events(notifications))
+
+    def _offer(self, subscriptions: list[Subscription], events: list[NotificationEvent]) -> None:
+        for subscription in subscriptions:
+            for event in events:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._offer, event)
+                except RuntimeError:  # the subscriber's loop has shut down
+                    self.unsubscribe(subscription)
+                    break
+
+    def _poll_loop(self) -> None:
+        while not self._stopping.wait(self.poll_interval):
+            with self._lock:
+                if not self._subscriptions:
+                    self._reset()
+                    return
+            try:
+                self._poll()
+            except Exception:  # noqa: BLE001 - keep polling; streams resume from the database
+                logger.exception("Could not poll for new notifications")
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._poller, self._window_start = None, None
+        self._published.clear()
+
+    def _poll(self) -> None:
+        """
+        Publish the notifications in the window that are new or were bumped
+        since they were published. Only ids, counts and timestamps are read
+        for the whole window; full rows are loaded for the ones to publish.
+        """
+        polled_at = datetime.utcnow()
+        with self._lock:
+            window_start = self._window_start
+        if window_start is None:
+            return
+        notification = models.Notification
+        after: Optional[tuple[datetime, int]] = None
+        with SessionLocal() as db:
+            while True:
+                stmt = select(notification.id, notification.occurrences, notification.created_at).where(
+                    notification.created_at >= window_start
+                )
+                if after is not None:
+                    stmt = stmt.where(tuple_(notification.created_at, notification.id) > after)
+                rows = db.execute(
+                    stmt.order_by(notification.created_at, notification.id).limit(POLL_BATCH)
+                ).all()
+                if not rows:
+                    break
+                after = (rows[-1].created_at, rows[-1].id)
+                with self._lock:
+                    changed = [
+                        row.id for row in rows
+                        if self._published.get(row.id, (0,))[0] < row.occurrences
+                    ]
+                if changed:
+                    fresh = list(db.scalars(
+                        select(notification).where(notification.id.in_(changed)).order_by(notification.id)
+                    ))
+                    with self._lock:
+                        subscriptions = list(self._subscriptions)
+                        fresh = [
+                            n for n in fresh
+                            if self._published.get(n.id, (0,))[0] < n.occurrences
+                        ]
+                        for n in fresh:
+                            self._published[n.id] = (n.occurrences, n.created_at)
+                    self._offer(subscriptions, to_events(fresh))
+                if len(rows) < POLL_BATCH:
+                    break
+        with self._lock:
+            if self._window_start is None:
+                return
+            self._window_start = max(self._window_start, polled_at - self.poll_lag)
+            self._published = {
+                i: seen for i, seen in self._published.items() if seen[1] >= self._window_start
+            }
+
+
+bus = NotificationBus(
+    queue_size=settings.notification_stream_queue_size,
+    poll_interval=settings.notification_stream_poll_seconds,
+    poll_lag=settings.notification_stream_poll_lag_seconds,
+)
@@ -0,0 +1,247 @@
+"""Coalescing writer for notifications raised by background work.
+
+Provisioning and syncs raise notifications in bursts, and committing each one
+separately turns a bulk onboarding into thousands of tiny transactions.
+:data:`writer` instead buffers submitted notifications for
+``NOTIFICATION_WRITER_FLUSH_MS`` and writes everything collected so far as
+multi-row INSERTs in a single transaction, then publishes the rows to open
+notification streams. Notifications about the same policy and account are
+deduplicated on the way (see :func:`store_notifications`).
+
+Submissions are fire-and-forget by default: the caller returns as soon as
+its notifications are buffered. With ``durable=True`` (or
+``NOTIFICATION_WRITER_DURABLE=true``) :meth:`NotificationWriter.submit`
+blocks until they are committed and returns the stored rows, or raises if
+they could not be written within ``NOTIFICATION_WRITER_TIMEOUT_SECONDS``.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Any, Iterable, NamedTuple, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.config import settings
+from app.database import SessionLocal
+from app.notification_bus import bus
+
+logger = logging.getLogger(__name__)
+
+
+class Submission(NamedTuple):
+    rows: list[dict[str, Any]]
+    done: Optional[Future]
+
+
+def dedupe_key(
+    type: models.NotificationType, policy_id: Optional[int], account_id: Optional[int]
+) -> Optional[str]:
+    """Key shared by repeats of a policy or account notification; None for anything else."""
+    if policy_id is None and account_id is None:
+        return None
+    return f"{type.value}:{policy_id or ''}:{account_id or ''}"
+
+
+def notification_row(
+    notification: schemas.NotificationCreate, created_at: Optional[datetime] = None
+) -> dict[str, Any]:
+    row = notification.model_dump()
+    row["type"] = models.NotificationType(row["type"])
+    row["created_at"] = created_at or datetime.utcnow()
+    row["dedupe_key"] = dedupe_key(row["type"], row.get("policy_id"), row.get("account_id"))
+    row["occurrences"] = 1
+    return row
+
+
+def store_notifications(db: Session, rows: list[dict[str, Any]]) -> list[models.Notification]:
+    """
+    Write notification rows, returning the stored notification for each row.
+
+    Rows sharing a dedupe key with a notification created inside
+    ``NOTIFICATION_DEDUPE_WINDOW_SECONDS`` bump that notification instead of
+    adding one: its ``occurrences`` grows, it takes the newest title, message
+    and ``created_at`` and turns unread again. Everything else is written
+    with one multi-row INSERT .. RETURNING, sorted by parameter order so the
+    rows line up with their submissions (SQLite cannot batch an ordered
+    RETURNING and inserts them one by one in the same transaction).
+    """
+    notification = models.Notification
+    stored: list[Optional[models.Notification]] = [None] * len(rows)
+    inserts: list[tuple[dict[str, Any], list[int]]] = []
+    repeats: dict[str, list[int]] = {}
+    for index, row in enumerate(rows):
+        if row.get("dedupe_key") is None:
+            inserts.append((row, [index]))
+        else:
+            repeats.setdefault(row["dedupe_key"], []).append(index)
+
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.notification_dedupe_window_seconds)
+    for key, indices in repeats.items():
+        latest = rows[indices[-1]]
+        current = (
+            select(func.max(notification.id))
+            .where(notification.dedupe_key == key, notification.created_at >= cutoff)
+            .scalar_subquery()
+        )
+        bumped = db.scalars(
+            update(notification)
+            .where(notification.id == current)
+            .values(
+                occurrences=notification.occurrences + len(indices),
+                title=latest["title"],
+                message=latest["message"],
+                created_at=latest["created_at"],
+                is_read=False,
+            )
+            .returning(notification)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if bumped is None:
+            inserts.append(({**latest, "occurrences": len(indices)}, indices))
+        else:
+            for index in indices:
+                stored[index] = bumped
+
+    if inserts:
+        inserted = db.scalars(
+            insert(notification).returning(notification, sort_by_parameter_order=True),
+            [row for row, _ in inserts],
+        ).all()
+        for row, (_, indices) in zip(inserted, inserts):
+            for index in indices:
+                stored[index] = row
+    return stored
+
+
+class NotificationWriter:
+    def __init__(self, flush_interval: float, max_batch: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: list[Submission] = []
+        self._pending_rows = 0
+        self._writing = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="notification-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Write whatever is still buffered, then stop the writer thread."""
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def submit(
+        self,
+        notifications: Iterable[schemas.NotificationCreate | dict[str, Any]],
+        *,
+        durable: Optional[bool] = None,
+    ) -> Optional[list[models.Notification]]:
+        """
+        Queue notifications (schemas or ``Notification`` column dicts) for the
+        next flush. Durable submissions wait for the commit and return the rows.
+        """
+        rows = [n if isinstance(n, dict) else notification_row(n) for n in notifications]
+        if not rows:
+            return [] if durable else None
+        durable = settings.notification_writer_durable if durable is None else durable
+        done: Optional[Future] = Future() if durable else None
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        with self._condition:
+            self._pending.append(Submission(rows, done))
+            self._pending_rows += len(rows)
+            self._condition.notify_all()
+        return done.result(settings.notification_writer_timeout_seconds) if done is not None else None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is written; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                # Give the burst a moment to accumulate before writing it.
+                deadline = time.monotonic() + self.flush_interval
+                while self._pending_rows < self.max_batch and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch, self._pending, self._pending_rows = self._pending, [], 0
+                self._writing = True
+            try:
+                self._write(batch)
+            except Exception as exc:  # noqa: BLE001 - keep the writer alive for later submissions
+                logger.exception("Notification writer failed on a batch of %d submission(s)", len(batch))
+                for submission in batch:
+                    if submission.done is not None and not submission.done.done():
+                        submission.done.set_exception(exc)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, batch: list[Submission]) -> None:
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            notifications = store_notifications(db, [row for submission in batch for row in submission.rows])
+            db.commit()
+        except Exception as exc:  # noqa: BLE001 - isolate the submission that failed
+            db.rollback()
+            if len(batch) > 1:
+                for submission in batch:
+                    self._write([submission])
+                return
+            logger.exception("Could not write %d notification(s)", len(batch[0].rows))
+            if batch[0].done is not None:
+                batch[0].done.set_exception(exc)
+            return
+        finally:
+            db.close()
+
+        offset = 0
+        for submission in batch:
+            if submission.done is not None:
+                submission.done.set_result(notifications[offset:offset + len(submission.rows)])
+            offset += len(submission.rows)
+        try:
+            bus.publish(list({notification.id: notification for notification in notifications}.values()))
+        except Exception:  # noqa: BLE001 - the rows are committed; streams catch up from the database
+            logger.exception("Could not publish %d notification(s)", len(notifications))
+
+
+writer = NotificationWriter(
+    flush_interval=settings.notification_writer_flush_ms / 1000,
+    max_batch=settings.notification_writer_max_batch,
+)
@@ -0,0 +1,71 @@
+"""Opaque keyset (cursor) pagination helpers."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row on a page as an opaque token."""
+    plain = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Decode a cursor produced by :func:`encode_cursor` for the given sort keys."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid pagination cursor")
+
+    decoded: list[Any] = []
+    for key, value in zip(keys, values):
+        if key.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as exc:
+                raise ValueError("Invalid pagination cursor") from exc
+        decoded.append(value)
+    return decoded
+
+
+def keyset(
+    stmt: Select,
+    keys: Sequence[InstrumentedAttribute],
+    *,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> Select:
+    """
+    Order ``stmt`` by ``keys`` and continue after ``cursor``.
+
+    The row-value comparison lets the database seek straight into a composite
+    index on ``keys``, so every page costs the same as the first one.
+    """
+    if cursor:
+        after = decode_cursor(cursor, keys)
+        row = tuple_(*keys)
+        stmt = stmt.where(row < tuple_(*after) if descending else row > tuple_(*after))
+    order = [key.desc() if descending else key.asc() for key in keys]
+    return stmt.order_by(*order).limit(limit)
+
+
+def next_cursor(items: Sequence[Any], keys: Sequence[InstrumentedAttribute], limit: int) -> Optional[str]:
+    """Return the cursor for the page after ``items``, or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor([getattr(last, key.key) for key in keys])
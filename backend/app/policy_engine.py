@@ -0,0 +1,432 @@
+"""Evaluate IAM/SCP-style policy documents against resource configuration snapshots.
+
+A snapshot describes one resource as a request context::
+
+    {
+        "resource_id": "arn:aws:s3:::prod-data-bucket",
+        "actions": ["s3:PutBucketAcl"],
+        "context": {"s3:x-amz-acl": "public-read"},
+    }
+
+A resource violates a policy when any ``Deny`` statement matches one of its
+actions, its resource id and all of the statement's conditions. Documents
+without IAM ``Statement`` entries (Azure policy rules, GCP org constraints)
+are reported as ``unknown``.
+
+Sweeps split the resources into chunks and evaluate every policy against each
+chunk in a process pool, then fold the per-resource violations into one result
+per (policy, account). Compiled policies are kept in a per-process LRU keyed on
+``(policy_id, updated_at)``, so editing a policy never serves a stale entry;
+the writing process also drops the old entries eagerly.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from app.cache import LRUCache
+from app.config import settings
+
+EVALUATION_CHUNK_RESOURCES = 2000
+MAX_REPORTED_VIOLATIONS = 5
+
+
+class PolicyDocumentError(ValueError):
+    """Raised when a policy document cannot be parsed."""
+
+
+# -- Compilation ---------------------------------------------------------------
+def _wildcard_regex(patterns: Iterable[str], *, ignore_case: bool) -> re.Pattern:
+    parts = []
+    for pattern in patterns:
+        parts.append("".join(".*" if ch == "*" else "." if ch == "?" else re.escape(ch) for ch in pattern))
+    return re.compile("(?:{})\\Z".format("|".join(parts) or "(?!)"), re.IGNORECASE if ignore_case else 0)
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _as_number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_NUMERIC_OPS: dict[str, Callable[[float, float], bool]] = {
+    "NumericEquals": lambda a, b: a == b,
+    "NumericLessThan": lambda a, b: a < b,
+    "NumericLessThanEquals": lambda a, b: a <= b,
+    "NumericGreaterThan": lambda a, b: a > b,
+    "NumericGreaterThanEquals": lambda a, b: a >= b,
+}
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """One ``Operator: {key: values}`` entry, compiled to a predicate over the context."""
+
+    key: str
+    negated: bool
+    if_exists: bool
+    null_check: Optional[bool]
+    test: Callable[[list[Any]], bool]
+
+    def holds(self, context: dict[str, list[Any]]) -> bool:
+        actual = context.get(self.key)
+        if self.null_check is not None:
+            return (actual is None) == self.null_check
+        if actual is None:
+            # Missing keys satisfy negated operators and ...IfExists operators.
+            return self.negated or self.if_exists
+        matched = self.test(actual)
+        return not matched if self.negated else matched
+
+
+def _compile_condition(operator: str, key: str, raw_values: Any) -> CompiledCondition:
+    values = [_as_text(v) for v in _as_list(raw_values)]
+    op = operator.split(":", 1)[-1]  # ForAnyValue:/ForAllValues: use any-match semantics here
+    if_exists = op.endswith("IfExists")
+    if if_exists:
+        op = op[: -len("IfExists")]
+    key = key.lower()
+
+    if op == "Null":
+        return CompiledCondition(key, False, False, values[0].lower() == "true" if values else True, lambda _: True)
+
+    negated = "Not" in op
+    base = op.replace("Not", "", 1) if negated else op
+
+    if base in ("StringEquals", "ArnEquals"):
+        expected = set(values)
+        test = lambda actual: any(_as_text(a) in expected for a in actual)  # noqa: E731
+    elif base == "StringEqualsIgnoreCase":
+        expected = {v.lower() for v in values}
+        test = lambda actual: any(_as_text(a).lower() in expected for a in actual)  # noqa: E731
+    elif base in ("StringLike", "ArnLike"):
+        matcher = _wildcard_regex(values, ignore_case=False)
+        test = lambda actual: any(matcher.match(_as_text(a)) for a in actual)  # noqa: E731
+    elif base == "Bool":
+        expected = {v.lower() for v in values}
+        test = lambda actual: any(_as_text(a).lower() in expected for a in actual)  # noqa: E731
+    elif base in _NUMERIC_OPS or op == "NumericNotEquals":
+        compare = _NUMERIC_OPS["NumericEquals" if op == "NumericNotEquals" else base]
+        negated = op == "NumericNotEquals"
+        numbers = [n for n in (_as_number(v) for v in values) if n is not None]
+
+        def test(actual, compare=compare, numbers=numbers):
+            return any(
+                (number := _as_number(a)) is not None and any(compare(number, n) for n in numbers)
+                for a in actual
+            )
+    else:
+        raise PolicyDocumentError(f"Unsupported condition operator: {operator}")
+
+    return CompiledCondition(key, negated, if_exists, None, test)
+
+
+@dataclass(frozen=True)
+class CompiledStatement:
+    sid: str
+    deny: bool
+    actions: Optional[re.Pattern]
+    not_actions: Optional[re.Pattern]
+    resources: Optional[re.Pattern]
+    not_resources: Optional[re.Pattern]
+    conditions: tuple[CompiledCondition, ...]
+
+    def matches(self, resource_id: str, actions: Sequence[str], context: dict[str, list[Any]]) -> bool:
+        if self.actions is not None and not any(self.actions.match(a) for a in actions):
+            return False
+        if self.not_actions is not None and all(self.not_actions.match(a) for a in actions):
+            return False
+        if self.resources is not None and not self.resources.match(resource_id):
+            return False
+        if self.not_resources is not None and self.not_resources.match(resource_id):
+            return False
+        return all(condition.holds(context) for condition in self.conditions)
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    statements: tuple[CompiledStatement, ...]
+
+    @property
+    def supported(self) -> bool:
+        return bool(self.statements)
+
+    def violations(self, resource_id: str, actions: Sequence[str], context: dict[str, list[Any]]) -> list[str]:
+        """Return the Sids of the Deny statements the resource matches."""
+        return [
+            statement.sid
+            for statement in self.statements
+            if statement.deny and statement.matches(resource_id, actions, context)
+        ]
+
+
+def compile_policy(policy_content: Optional[str]) -> CompiledPolicy:
+    """Parse a policy document and pre-compile its matchers and conditions."""
+    if not policy_content:
+        return CompiledPolicy(statements=())
+    try:
+        document = json.loads(policy_content)
+    except ValueError as exc:
+        raise PolicyDocumentError(f"Policy content is not valid JSON: {exc}") from exc
+    if not isinstance(document, dict) or "Statement" not in document:
+        return CompiledPolicy(statements=())
+
+    statements = []
+    for index, raw in enumerate(_as_list(document["Statement"])):
+        if not isinstance(raw, dict):
+            raise PolicyDocumentError(f"Statement {index} is not an object")
+        effect = str(raw.get("Effect", "")).lower()
+        if effect not in ("allow", "deny"):
+            raise PolicyDocumentError(f"Statement {index} has invalid Effect {raw.get('Effect')!r}")
+
+        def patterns(name: str, *, ignore_case: bool) -> Optional[re.Pattern]:
+            if name not in raw:
+                return None
+            return _wildcard_regex(map(str, _as_list(raw[name])), ignore_case=ignore_case)
+
+        conditions = tuple(
+            _compile_condition(operator, key, values)
+            for operator, block in (raw.get("Condition") or {}).items()
+            for key, values in block.items()
+        )
+        statements.append(
+            CompiledStatement(
+                sid=str(raw.get("Sid") or f"Statement{index}"),
+                deny=effect == "deny",
+                actions=patterns("Action", ignore_case=True),
+                not_actions=patterns("NotAction", ignore_case=True),
+                resources=patterns("Resource", ignore_case=False),
+                not_resources=patterns("NotResource", ignore_case=False),
+                conditions=conditions,
+            )
+        )
+    return CompiledPolicy(statements=tuple(statements))
+
+
+PolicySource = tuple[int, Optional[datetime], Optional[str]]
+
+compiled_policies: LRUCache[tuple[int, Optional[datetime]], CompiledPolicy] = LRUCache(
+    maxsize=settings.compiled_policy_cache_size
+)
+
+
+def get_compiled_policy(policy_id: int, updated_at: Optional[datetime], policy_content: Optional[str]) -> CompiledPolicy:
+    """Return the compiled form of a policy version, compiling it on a cache miss."""
+    key = (policy_id, updated_at)
+    compiled = compiled_policies.get(key)
+    if compiled is None:
+        compiled = compile_policy(policy_content)
+        compiled_policies.put(key, compiled)
+    return compiled
+
+
+def invalidate_compiled_policy(policy_id: int) -> None:
+    """Drop every cached version of a policy in this process."""
+    compiled_policies.discard_where(lambda key: key[0] == policy_id)
+
+
+# -- Evaluation ----------------------------------------------------------------
+UNSUPPORTED_DOCUMENT = "Policy document has no IAM statements to evaluate."
+
+# policy_id -> Sids of the Deny statements a resource matches
+ResourceViolations = dict[int, list[str]]
+
+
+@dataclass
+class ViolationScan:
+    """Per-resource violations found in a set of snapshots."""
+
+    unsupported: dict[int, str] = field(default_factory=dict)
+    violations: dict[str, ResourceViolations] = field(default_factory=dict)
+
+    def merge(self, other: ViolationScan) -> None:
+        self.unsupported.update(other.unsupported)
+        self.violations.update(other.violations)
+
+
+@dataclass
+class PolicyTally:
+    """Violations of one policy across an account's resources."""
+
+    violation_count: int = 0
+    violations: list[tuple[str, list[str]]] = field(default_factory=list)
+    # Inventory row of the first violating resource, when it is stored.
+    resource_ref_id: Optional[int] = None
+
+
+def _normalise_snapshot(resource: dict) -> tuple[str, list[str], dict[str, list[Any]]]:
+    context = {str(key).lower(): _as_list(value) for key, value in (resource.get("context") or {}).items()}
+    return str(resource["resource_id"]), [str(a) for a in _as_list(resource.get("actions"))], context
+
+
+def scan_chunk(policies: Sequence[PolicySource], resources: Sequence[dict]) -> ViolationScan:
+    """Evaluate every policy against a chunk of resource snapshots."""
+    scan = ViolationScan()
+    compiled_policies = []
+    for policy_id, updated_at, policy_content in policies:
+        try:
+            compiled = get_compiled_policy(policy_id, updated_at, policy_content)
+        except PolicyDocumentError as exc:
+            scan.unsupported[policy_id] = str(exc)
+            continue
+        if not compiled.supported:
+            scan.unsupported[policy_id] = UNSUPPORTED_DOCUMENT
+            continue
+        compiled_policies.append((policy_id, compiled))
+
+    for resource in resources:
+        resource_id, actions, context = _normalise_snapshot(resource)
+        found = {}
+        for policy_id, compiled in compiled_policies:
+            sids = compiled.violations(resource_id, actions, context)
+            if sids:
+                found[policy_id] = sids
+        if found:
+            scan.violations[resource_id] = found
+    return scan
+
+
+def _to_evaluation(policy_id: int, account_id: int, evaluated: int, tally: PolicyTally) -> dict:
+    if evaluated == 0:
+        return {
+            "policy_id": policy_id,
+            "account_id": account_id,
+            "status": "unknown",
+            "findings": "No resources in snapshot.",
+        }
+    if tally.violation_count == 0:
+        return {
+            "policy_id": policy_id,
+            "account_id": account_id,
+            "status": "compliant",
+            "findings": f"{evaluated} resources evaluated, no violations.",
+        }
+    details = "; ".join(f"{resource_id} ({', '.join(sids)})" for resource_id, sids in tally.violations)
+    return {
+        "policy_id": policy_id,
+        "account_id": account_id,
+        "status": "non_compliant",
+        "resource_id": tally.violations[0][0][:255],
+        "resource_ref_id": tally.resource_ref_id,
+        "findings": f"{tally.violation_count} of {evaluated} resources violate the policy: {details}",
+    }
+
+
+def summarize(
+    account_id: int,
+    policies: Sequence[PolicySource],
+    unsupported: dict[int, str],
+    evaluated: int,
+    violations: Iterable[tuple[str, ResourceViolations, Optional[int]]],
+) -> list[dict]:
+    """
+    Fold per-resource violations into one evaluation payload per policy.
+
+    ``evaluated`` is the number of resources the account has; ``violations``
+    holds ``(resource_id, violations, row_id)`` and only needs to cover the
+    resources that violate something. ``row_id`` is the resource's inventory
+    row, or None when it is not stored; non-compliant payloads carry the
+    first one as ``resource_ref_id``.
+    """
+    tallies = {policy_id: PolicyTally() for policy_id, _, _ in policies if policy_id not in unsupported}
+    for resource_id, found, row_id in violations:
+        for policy_id, sids in found.items():
+            tally = tallies.get(policy_id)
+            if tally is None:
+                continue
+            tally.violation_count += 1
+            if not tally.violations:
+                tally.resource_ref_id = row_id
+            if len(tally.violations) < MAX_REPORTED_VIOLATIONS:
+                tally.violations.append((resource_id, sids))
+
+    payloads = []
+    for policy_id, _, _ in policies:
+        if policy_id in unsupported:
+            payloads.append({
+                "policy_id": policy_id,
+                "account_id": account_id,
+                "status": "unknown",
+                "findings": unsupported[policy_id],
+            })
+        else:
+            payloads.append(_to_evaluation(policy_id, account_id, evaluated, tallies[policy_id]))
+    return payloads
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Return the shared evaluation process pool, starting it on first use.
+
+    Workers are started from a fork server (or spawned where there is none)
+    rather than forked from the API process, which by then runs threads
+    holding locks: sync workers, the notification writer, connector pools.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.evaluation_workers or os.cpu_count(), mp_context=context
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+
+
+def scan_resources(
+    policies: Sequence[PolicySource],
+    resources: Sequence[dict],
+    *,
+    executor: Optional[Executor] = None,
+    chunk_size: int = EVALUATION_CHUNK_RESOURCES,
+) -> ViolationScan:
+    """
+    Find the violations of ``policies`` (``(policy_id, updated_at,
+    policy_content)`` rows) in each resource snapshot.
+
+    Small inputs are evaluated inline; larger ones are split into resource
+    chunks and fanned out over ``executor`` (the shared process pool by default).
+    """
+    policies = list(policies)
+    chunks = [resources[start:start + chunk_size] for start in range(0, len(resources), chunk_size)] or [[]]
+    if len(chunks) == 1:
+        return scan_chunk(policies, chunks[0])
+
+    pool = executor or get_executor()
+    scan = ViolationScan()
+    for partial in pool.map(scan_chunk, [policies] * len(chunks), chunks):
+        scan.merge(partial)
+    return scan
+
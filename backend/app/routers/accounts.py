@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List
-from app import crud, schemas
-from app.models import NotificationType
-from app.deps import get_db
+from typing import List, Optional
+from app import account_validation, crud, pagination, schemas, sync_worker
+from app.deps import get_current_user, get_db
 from app.database import get_db_session
 from app.models import CloudAccount, CloudProvider, AccountStatus
 from app.schemas import CloudAccountCreate, CloudAccountUpdate, CloudAccountResponse
@@ -17,11 +16,29 @@ router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
 @router.get("/", response_model=list[schemas.AccountRead])
-def list_accounts(db: Session = Depends(get_db)):
-    return crud.get_accounts(db)
+def list_accounts(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        accounts = crud.get_accounts(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = pagination.next_cursor(accounts, crud.ACCOUNT_PAGE_KEYS, limit)
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return accounts
 
 
-@router.post("/", response_model=schemas.AccountRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=schemas.AccountRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_user)],
+)
 def create_account(account_in: schemas.AccountCreate, db: Session = Depends(get_db)):
     try:
         account = crud.create_account(db, account_in=account_in)
@@ -34,7 +51,7 @@ def create_account(account_in: schemas.AccountCreate, db: Session = Depends(get_
     return account
 
 
-@router.patch("/{account_id}", response_model=schemas.AccountRead)
+@router.patch("/{account_id}", response_model=schemas.AccountRead, dependencies=[Depends(get_current_user)])
 def update_account(
     account_id: int,
     account_in: schemas.AccountUpdate,
@@ -46,7 +63,7 @@ def update_account(
     return account
 
 
-@router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_user)])
 def delete_account(account_id: int, db: Session = Depends(get_db)):
     deleted = crud.delete_account(db, account_id=account_id)
     if not deleted:
@@ -54,27 +71,100 @@ def delete_account(account_id: int, db: Session = Depends(get_db)):
     return None
 
 
-@router.post("/{account_id}/sync", response_model=schemas.AccountRead)
-def sync_account(account_id: int, db: Session = Depends(get_db)):
+@router.get("/{account_id}/evaluations", response_model=list[schemas.EvaluationRead])
+def list_account_evaluations(
+    account_id: int,
+    response: Response,
+    status_filter: Optional[str] = Query(
+        None, alias="status", pattern="^(compliant|non_compliant|warning|unknown)$"
+    ),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Evaluations for one account, most recently checked first."""
+    if not crud.get_account(db, account_id=account_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    try:
+        evaluations = crud.get_scoped_evaluations(
+            db,
+            account_id=account_id,
+            status=status_filter,
+            since=since,
+            until=until,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = pagination.next_cursor(evaluations, crud.EVALUATION_PAGE_KEYS, limit)
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return evaluations
+
+
+@router.get("/{account_id}/sync-runs", response_model=list[schemas.SyncRunRead])
+def list_account_sync_runs(
+    account_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Telemetry of the account's sync attempts, most recent first."""
+    if not crud.get_account(db, account_id=account_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    try:
+        runs = crud.get_account_sync_runs(db, account_id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = pagination.next_cursor(runs, crud.SYNC_RUN_PAGE_KEYS, limit)
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return runs
+
+
+@router.post(
+    "/{account_id}/evaluate",
+    response_model=schemas.InventorySyncResult,
+    dependencies=[Depends(get_current_user)],
+)
+def evaluate_account(
+    account_id: int,
+    payload: schemas.ResourceSnapshotBatch,
+    db: Session = Depends(get_db),
+):
+    """
+    Replace the account's inventory with the posted snapshots and evaluate it.
+
+    Only new or changed snapshots are evaluated; unchanged ones are counted
+    as skipped and resources missing from the batch are removed.
+    """
     account = crud.get_account(db, account_id=account_id)
     if not account:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    resources = [resource.model_dump() for resource in payload.resources]
+    return crud.sync_account_inventory(db, account, resources)
 
-    # In a real implementation, this would trigger a sync job
-    # For now, we'll just update the sync timestamp
-    from datetime import datetime
-    account_update = schemas.AccountUpdate(last_sync_at=datetime.utcnow())
-    updated = crud.update_account(db, account_id=account_id, account_in=account_update)
-    if updated:
-        crud.create_notification(
-            db,
-            schemas.NotificationCreate(
-                title="Manual sync requested",
-                message=f"{updated.display_name} is syncing now.",
-                type=NotificationType.ACCOUNT_SYNC,
-            ),
-        )
-    return updated
+
+@router.post(
+    "/{account_id}/sync",
+    response_model=schemas.SyncJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_user)],
+)
+def sync_account(account_id: int, response: Response, db: Session = Depends(get_db)):
+    """Queue a background sync and return the job; poll `GET /sync-jobs/{id}` for progress."""
+    account = crud.get_account(db, account_id=account_id)
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+
+    job = crud.enqueue_sync_job(db, account_id=account_id)
+    sync_worker.pool.wake()
+    response.headers["Location"] = f"/sync-jobs/{job.id}"
+    return job
 
 
 def get_db():
@@ -86,7 +176,12 @@ def get_db():
         db.close()
 
 
-@router.post("/", response_model=CloudAccountResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=CloudAccountResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_user)],
+)
 async def create_cloud_account(
     account_data: CloudAccountCreate,
     db: Session = Depends(get_db)
@@ -130,6 +225,7 @@ async def create_cloud_account(
     db.add(new_account)
     db.commit()
     db.refresh(new_account)
+    crud.log_account_provisioning(new_account)
     
     # TODO: Trigger async validation and provisioning process
     # This would validate credentials and update status to CONNECTED or ERROR
@@ -193,7 +289,7 @@ async def get_cloud_account(
     return account
 
 
-@router.put("/{account_id}", response_model=CloudAccountResponse)
+@router.put("/{account_id}", response_model=CloudAccountResponse, dependencies=[Depends(get_current_user)])
 async def update_cloud_account(
     account_id: int,
     account_data: CloudAccountUpdate,
@@ -225,11 +321,13 @@ async def update_cloud_account(
     
     db.commit()
     db.refresh(account)
+    if update_data.keys() & set(account_validation.CREDENTIAL_FIELDS):
+        account_validation.invalidate(account_id)
     
     return account
 
 
-@router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_user)])
 async def delete_cloud_account(
     account_id: int,
     db: Session = Depends(get_db)
@@ -253,19 +351,26 @@ async def delete_cloud_account(
     return None
 
 
-@router.post("/{account_id}/sync", response_model=CloudAccountResponse)
+@router.post(
+    "/{account_id}/sync",
+    response_model=schemas.SyncJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_user)],
+)
 async def sync_cloud_account(
     account_id: int,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Trigger a manual sync for a cloud account.
     
-    This endpoint initiates a sync operation that:
-    1. Validates the account credentials
-    2. Fetches the latest resources and configurations
-    3. Updates policy evaluations
-    4. Updates the last_synced_at timestamp
+    The sync runs on a background worker, which:
+    1. Fetches the latest resources and configurations
+    2. Updates policy evaluations
+    3. Updates the last_synced_at timestamp
+    
+    Returns the queued job (or the one already in progress for this account).
     """
     account = db.query(CloudAccount).filter(CloudAccount.id == account_id).first()
     
@@ -275,35 +380,49 @@ async def sync_cloud_account(
             detail=f"Account with ID {account_id} not found"
         )
     
-    # TODO: Implement actual sync logic here
-    # This would:
-    # 1. Validate credentials
-    # 2. Fetch resources from cloud provider
-    # 3. Update policy evaluations
-    # 4. Update status
-    
-    account.last_synced_at = datetime.utcnow()
-    account.updated_at = datetime.utcnow()
-    
-    # For now, just mark as connected if it was pending
-    if account.status == AccountStatus.PENDING:
-        account.status = AccountStatus.CONNECTED
-    
-    db.commit()
-    db.refresh(account)
+    job = crud.enqueue_sync_job(db, account_id=account_id)
+    sync_worker.pool.wake()
+    response.headers["Location"] = f"/sync-jobs/{job.id}"
+    return job
+
+
+@router.post("/validate", response_model=schemas.AccountValidationBatchResult, dependencies=[Depends(get_current_user)])
+async def validate_cloud_accounts(
+    batch: schemas.AccountValidationBatch,
+    db: Session = Depends(get_db)
+):
+    """
+    Validate the credentials of many accounts at once.
     
-    return account
+    Cached results are reused unless `force` is set; the rest are checked
+    concurrently with a bounded number of provider calls in flight.
+    """
+    account_ids = list(dict.fromkeys(batch.account_ids))
+    accounts = db.query(CloudAccount).filter(CloudAccount.id.in_(account_ids)).all()
+    by_id = {account.id: account for account in accounts}
+    results = await account_validation.validate_accounts(
+        [by_id[account_id] for account_id in account_ids if account_id in by_id],
+        force=batch.force,
+    )
+    return schemas.AccountValidationBatchResult(
+        results=results,
+        not_found=[account_id for account_id in account_ids if account_id not in by_id],
+    )
 
 
-@router.get("/{account_id}/validate", response_model=dict)
+@router.get("/{account_id}/validate", response_model=schemas.AccountValidationRead)
 async def validate_cloud_account(
     account_id: int,
+    force: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Validate cloud account credentials without performing a full sync.
     
-    Returns validation status and any error messages.
+    Makes one authenticated call to the provider's inventory API. Results
+    are cached for a few minutes (`cached` is true when served from cache)
+    and dropped when the credential, access method or tenant changes; pass
+    `force=true` to check again regardless.
     """
     account = db.query(CloudAccount).filter(CloudAccount.id == account_id).first()
     
@@ -313,14 +432,5 @@ async def validate_cloud_account(
             detail=f"Account with ID {account_id} not found"
         )
     
-    # TODO: Implement actual validation logic
-    # This would attempt to authenticate with the cloud provider
-    # using the stored credentials
-    
-    return {
-        "account_id": account_id,
-        "is_valid": True,
-        "message": "Credentials validated successfully",
-        "provider": account.provider.value,
-        "validated_at": datetime.utcnow().isoformat()
-    }
+    [result] = await account_validation.validate_accounts([account], force=force)
+    return result
@@ -4,7 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
-from app.deps import get_db, get_password_manager
+from app.config import settings
+from app.deps import get_cached_user, get_current_user, get_db, get_password_manager
+from app.security import REFRESH_TOKEN, TokenError, create_access_token, create_refresh_token, decode_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -13,7 +15,16 @@ def _password_manager():
     return get_password_manager()
 
 
-@router.post("/register", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
+def _token_response(user: schemas.UserRead) -> schemas.TokenResponse:
+    return schemas.TokenResponse(
+        **user.model_dump(),
+        access_token=create_access_token(user.id),
+        refresh_token=create_refresh_token(user.id),
+        expires_in=settings.access_token_expire_minutes * 60,
+    )
+
+
+@router.post("/register", response_model=schemas.TokenResponse, status_code=status.HTTP_201_CREATED)
 def register_user(
     user_in: schemas.UserCreate,
     db: Session = Depends(get_db),
@@ -23,14 +34,15 @@ def register_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     password_manager = _password_manager()
     user = crud.create_user(db, user_in=user_in, password_hasher=password_manager.hash)
-    return user
+    return _token_response(schemas.UserRead.model_validate(user))
 
 
-@router.post("/login", response_model=schemas.UserRead)
+@router.post("/login", response_model=schemas.TokenResponse)
 def login_user(
     credentials: schemas.UserLogin,
     db: Session = Depends(get_db),
 ):
+    """Check the credentials and issue an access token and a refresh token alongside the user."""
     password_manager = _password_manager()
     user = crud.authenticate_user(
         db,
@@ -40,4 +52,24 @@ def login_user(
     )
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return _token_response(schemas.UserRead.model_validate(user))
+
+
+@router.post("/refresh", response_model=schemas.TokenResponse)
+def refresh_tokens(body: schemas.TokenRefresh, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new token pair."""
+    try:
+        claims = decode_token(body.refresh_token, REFRESH_TOKEN)
+    except TokenError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+    user = get_cached_user(db, claims.user_id)
+    if user is None or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is no longer active")
+    return _token_response(user)
+
+
+@router.get("/me", response_model=schemas.UserRead)
+def read_current_user(user: schemas.UserRead = Depends(get_current_user)):
     return user
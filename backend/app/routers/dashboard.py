@@ -1,14 +1,72 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
+from app.cache import dashboard_cache, etag_matches
 from app.deps import get_db
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/summary", response_model=schemas.DashboardSnapshot)
-def get_summary(db: Session = Depends(get_db)):
-    return crud.build_dashboard_snapshot(db)
+def get_summary(
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    entry = dashboard_cache.get(
+        lambda: crud.build_dashboard_snapshot(db).model_dump_json().encode("utf-8")
+    )
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/severity", response_model=list[schemas.SeverityBreakdown])
+def get_severity_breakdown(db: Session = Depends(get_db)):
+    """Policies and evaluation outcomes per severity, from critical to low."""
+    return crud.get_severity_breakdown(db)
+
+
+@router.get("/categories", response_model=list[schemas.CategoryBreakdown])
+def get_category_breakdown(
+    limit: int = Query(default=5, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Policy categories ranked by non-compliant evaluations."""
+    return crud.get_category_breakdown(db, limit=limit)
+
+
+@router.get("/critical-findings", response_model=schemas.CriticalFindings)
+def get_critical_findings(
+    limit: int = Query(default=10, ge=0, le=100),
+    db: Session = Depends(get_db),
+):
+    """Total non-compliant evaluations of critical policies plus the most recent few."""
+    return crud.get_critical_findings(db, limit=limit)
+
+
+@router.get("/trends", response_model=schemas.ComplianceTrend)
+def get_trends(
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    bucket: str = Query(default="daily", pattern="^(hourly|daily|weekly)$"),
+    db: Session = Depends(get_db),
+):
+    """
+    Compliance counts and score at the end of each bucket.
+
+    - **from** / **to**: time range (default: the last 30 days)
+    - **bucket**: `hourly`, `daily` (default) or `weekly`
+    """
+    end = crud.as_naive_utc(end) if end else datetime.utcnow()
+    start = crud.as_naive_utc(start) if start else end - timedelta(days=30)
+    try:
+        return crud.get_compliance_trend(db, start=start, end=end, bucket=bucket)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -1,33 +1,230 @@
 """Notification API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app import crud, schemas
-from app.deps import get_db
+from app import crud, pagination, schemas
+from app.config import settings
+from app.database import SessionLocal
+from app.deps import get_current_user_id, get_db
+from app.notification_bus import NotificationEvent, bus, to_events
+
+STREAM_REPLAY_BATCH = 200
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
 @router.get("/", response_model=list[schemas.NotificationRead])
-def list_notifications(db: Session = Depends(get_db)):
-    return crud.get_notifications(db)
+def list_notifications(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    user_id: Optional[int] = Depends(get_current_user_id),
+):
+    """Newest notifications first; `is_read` reflects the caller's own read state."""
+    try:
+        notifications = crud.get_notifications(db, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = pagination.next_cursor(notifications, crud.NOTIFICATION_PAGE_KEYS, limit)
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return crud.notifications_for_user(db, notifications, user_id)
+
+
+@router.get("/archive", response_model=list[schemas.NotificationArchiveRead])
+def list_archived_notifications(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Notifications moved out by the retention policy, newest first."""
+    try:
+        notifications = crud.get_archived_notifications(db, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = pagination.next_cursor(notifications, crud.NOTIFICATION_ARCHIVE_PAGE_KEYS, limit)
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return notifications
+
+
+def _latest_notification_id() -> int:
+    with SessionLocal() as db:
+        return crud.get_latest_notification_id(db)
+
+
+def _notifications_after(
+    after_id: int, created_since: Optional[datetime] = None
+) -> tuple[list[NotificationEvent], Optional[int]]:
+    """The events after ``after_id``, and the last id read (None when there was nothing)."""
+    with SessionLocal() as db:
+        notifications = crud.get_notifications_after(
+            db, after_id, limit=STREAM_REPLAY_BATCH, created_since=created_since
+        )
+        return to_events(notifications), notifications[-1].id if notifications else None
+
+
+def _frame(event: NotificationEvent, *, with_id: bool = True) -> str:
+    # Only notifications newer than everything sent so far carry an id, so
+    # the client's Last-Event-ID never moves backwards; repeats and late
+    # commits with lower ids are sent without one.
+    event_id = f"id: {event.id}\n" if with_id else ""
+    return f"{event_id}event: notification\ndata: {event.data}\n\n"
+
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[int] = Query(None, ge=0),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID", ge=0),
+):
+    """
+    Server-sent events: one `notification` event per new notification, and
+    one (without an id) each time a deduplicated notification is repeated.
+
+    Reconnects resume after the `Last-Event-ID` header (sent by browsers
+    automatically) or the `last_event_id` query parameter, and re-send what
+    was created in the last `NOTIFICATION_STREAM_POLL_LAG_SECONDS` so that
+    notifications committed late with lower ids are not lost; clients
+    recognise the ones they already have by id and `occurrences`. Without
+    either the stream starts with the next notification. The database is
+    read only to catch up on connect or after falling behind; notifications
+    written by other processes arrive through the bus's poller. Idle
+    connections get a comment heartbeat every
+    `NOTIFICATION_STREAM_HEARTBEAT_SECONDS`.
+    """
+    subscription = bus.subscribe()
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+    try:
+        newest = resume_from if resume_from is not None else await run_in_threadpool(_latest_notification_id)
+    except BaseException:
+        bus.unsubscribe(subscription)
+        raise
+
+    async def events() -> AsyncIterator[str]:
+        # ``newest`` is the highest id delivered. ``sent`` holds the
+        # occurrences sent for recent notifications, so catch-up reads and
+        # the bus can overlap without repeating a frame; entries are dropped
+        # once they are older than anything either can still deliver.
+        nonlocal newest
+        sent: dict[int, tuple[int, datetime]] = {}
+        pruned_at = datetime.utcnow()
+
+        def send(event: NotificationEvent) -> Optional[str]:
+            nonlocal newest, sent, pruned_at
+            if sent.get(event.id, (0,))[0] >= event.occurrences:
+                return None
+            now = datetime.utcnow()
+            if now - pruned_at >= bus.poll_lag:
+                cutoff = now - 2 * bus.poll_lag
+                sent = {i: seen for i, seen in sent.items() if seen[1] >= cutoff}
+                pruned_at = now
+            sent[event.id] = (event.occurrences, event.created_at)
+            frame = _frame(event, with_id=event.id > newest)
+            newest = max(newest, event.id)
+            return frame
+
+        async def read(after: int, created_since: Optional[datetime]) -> AsyncIterator[str]:
+            while True:
+                batch, last_id = await run_in_threadpool(_notifications_after, after, created_since)
+                for event in batch:
+                    frame = send(event)
+                    if frame is not None:
+                        yield frame
+                if last_id is None:
+                    return
+                after = last_id
+
+        async def replay(created_since: Optional[datetime]) -> AsyncIterator[str]:
+            # Everything past ``newest``, then (when resuming or catching up)
+            # everything created since ``created_since`` whatever its id.
+            async for frame in read(newest, None):
+                yield frame
+            if created_since is not None:
+                async for frame in read(0, created_since):
+                    yield frame
+
+        try:
+            lag_window = datetime.utcnow() - bus.poll_lag if resume_from is not None else None
+            async for frame in replay(lag_window):
+                yield frame
+            bus.watch()
+            while True:
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    async for frame in replay(datetime.utcnow() - bus.poll_lag):
+                        yield frame
+                    continue
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), settings.notification_stream_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                frame = send(event)
+                if frame is not None:
+                    yield frame
+        finally:
+            bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/unread-count", response_model=dict[str, int])
+def unread_count(db: Session = Depends(get_db), user_id: Optional[int] = Depends(get_current_user_id)):
+    """Number of notifications the caller has not read."""
+    return {"unread": crud.count_unread_notifications(db, user_id=user_id)}
 
 
 @router.post("/", response_model=schemas.NotificationRead, status_code=status.HTTP_201_CREATED)
 def create_notification(notification_in: schemas.NotificationCreate, db: Session = Depends(get_db)):
-    return crud.create_notification(db, notification_in=notification_in)
+    """
+    Create a notification. Notifications naming a `policy_id` and/or
+    `account_id` are deduplicated: a repeat within
+    `NOTIFICATION_DEDUPE_WINDOW_SECONDS` increments `occurrences` on the
+    existing one and moves it back to the top.
+    """
+    try:
+        return crud.create_notification(db, notification_in=notification_in)
+    except IntegrityError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown policy or account") from exc
 
 
 @router.patch("/{notification_id}/read", response_model=schemas.NotificationRead)
-def mark_read(notification_id: int, db: Session = Depends(get_db)):
-    notification = crud.mark_notification_read(db, notification_id=notification_id)
+def mark_read(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    user_id: Optional[int] = Depends(get_current_user_id),
+):
+    try:
+        notification = crud.mark_notification_read(db, notification_id=notification_id, user_id=user_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     if not notification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
-    return notification
+    return crud.notifications_for_user(db, [notification], user_id)[0]
 
 
 @router.patch("/mark-all-read", response_model=dict[str, int])
-def mark_all_read(db: Session = Depends(get_db)):
-    updated = crud.mark_all_notifications_read(db)
+def mark_all_read(db: Session = Depends(get_db), user_id: Optional[int] = Depends(get_current_user_id)):
+    try:
+        updated = crud.mark_all_notifications_read(db, user_id=user_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     return {"updated": updated}
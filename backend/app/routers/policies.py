@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app import crud, schemas
-from app.deps import get_db
+from app import crud, exports, pagination, schemas
+from app.deps import get_current_user, get_db
 
 router = APIRouter(prefix="/policies", tags=["policies"])
 
 
+def _set_next_cursor(response: Response, items, keys, limit: int) -> None:
+    cursor = pagination.next_cursor(items, keys, limit)
+    if cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = cursor
+
+
 # ===========================
 # CRITICAL: Specific routes MUST come before parameterized routes
 # Put /evaluations routes BEFORE /{policy_id} routes
@@ -16,17 +26,36 @@ router = APIRouter(prefix="/policies", tags=["policies"])
 
 @router.get("/evaluations", response_model=list[schemas.EvaluationRead])
 def list_evaluations(
+    response: Response,
     skip: int = 0,
-    limit: int = 1000,
+    limit: int = Query(1000, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all policy evaluations with optional pagination.
+    Retrieve policy evaluations, most recently checked first.
     
-    - **skip**: Number of records to skip (default: 0)
+    - **cursor**: Opaque cursor from the previous page's `X-Next-Cursor` header
+    - **skip**: Number of records to skip (legacy, ignored with a cursor)
     - **limit**: Maximum number of records to return (default: 1000)
+    - **format**: `json` (default) returns one page; `ndjson` or `csv`
+      streams the full table and ignores skip/limit
     """
-    return crud.get_evaluations(db, skip=skip, limit=limit)
+    if format == "ndjson":
+        return StreamingResponse(exports.evaluations_ndjson(), media_type=exports.MEDIA_TYPES["ndjson"])
+    if format == "csv":
+        return StreamingResponse(
+            exports.evaluations_csv(),
+            media_type=exports.MEDIA_TYPES["csv"],
+            headers={"Content-Disposition": 'attachment; filename="policy_evaluations.csv"'},
+        )
+    try:
+        evaluations = crud.get_evaluations(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, evaluations, crud.EVALUATION_PAGE_KEYS, limit)
+    return evaluations
 
 
 @router.get("/evaluations/{evaluation_id}", response_model=schemas.EvaluationRead)
@@ -46,7 +75,12 @@ def get_evaluation(
     return evaluation
 
 
-@router.post("/evaluations", response_model=schemas.EvaluationRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/evaluations",
+    response_model=schemas.EvaluationRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_user)],
+)
 def create_evaluation(
     evaluation_in: schemas.EvaluationCreate,
     db: Session = Depends(get_db)
@@ -65,7 +99,26 @@ def create_evaluation(
         )
 
 
-@router.patch("/evaluations/{evaluation_id}", response_model=schemas.EvaluationRead)
+@router.post("/evaluations/bulk", response_model=schemas.EvaluationBulkResult, dependencies=[Depends(get_current_user)])
+def bulk_upsert_evaluations(
+    payload: schemas.EvaluationBulkUpsert,
+    db: Session = Depends(get_db)
+):
+    """
+    Create or update many policy evaluations in one request.
+
+    Items are upserted on (policy_id, account_id) in batched transactions.
+    The response reports the outcome of every item by its position in the
+    request.
+    """
+    return crud.bulk_upsert_evaluations(db, items=payload.items)
+
+
+@router.patch(
+    "/evaluations/{evaluation_id}",
+    response_model=schemas.EvaluationRead,
+    dependencies=[Depends(get_current_user)],
+)
 def update_evaluation(
     evaluation_id: int,
     evaluation_in: schemas.EvaluationUpdate,
@@ -88,7 +141,11 @@ def update_evaluation(
     return evaluation
 
 
-@router.delete("/evaluations/{evaluation_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/evaluations/{evaluation_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_current_user)],
+)
 def delete_evaluation(
     evaluation_id: int,
     db: Session = Depends(get_db)
@@ -110,20 +167,33 @@ def delete_evaluation(
 
 @router.get("/", response_model=list[schemas.PolicyRead])
 def list_policies(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all policies with optional pagination.
+    Retrieve policies in creation order.
     
-    - **skip**: Number of records to skip (default: 0)
+    - **cursor**: Opaque cursor from the previous page's `X-Next-Cursor` header
+    - **skip**: Number of records to skip (legacy, ignored with a cursor)
     - **limit**: Maximum number of records to return (default: 100)
     """
-    return crud.get_policies(db, skip=skip, limit=limit)
+    try:
+        policies = crud.get_policies(db, skip=skip, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, policies, crud.POLICY_PAGE_KEYS, limit)
+    return policies
 
 
-@router.post("/", response_model=schemas.PolicyRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=schemas.PolicyRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_user)],
+)
 def create_policy(
     policy_in: schemas.PolicyCreate,
     db: Session = Depends(get_db)
@@ -160,7 +230,48 @@ def get_policy(
     return policy
 
 
-@router.put("/{policy_id}", response_model=schemas.PolicyRead)
+@router.get("/{policy_id}/evaluations", response_model=list[schemas.EvaluationRead])
+def list_policy_evaluations(
+    policy_id: int,
+    response: Response,
+    status_filter: Optional[str] = Query(
+        None, alias="status", pattern="^(compliant|non_compliant|warning|unknown)$"
+    ),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve evaluations of one policy, most recently checked first.
+    
+    - **status**: Only return evaluations with this status
+    - **since** / **until**: Bound `last_checked_at` (inclusive / exclusive)
+    - **cursor**: Opaque cursor from the previous page's `X-Next-Cursor` header
+    """
+    if not crud.get_policy(db, policy_id=policy_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Policy with ID {policy_id} not found"
+        )
+    try:
+        evaluations = crud.get_scoped_evaluations(
+            db,
+            policy_id=policy_id,
+            status=status_filter,
+            since=since,
+            until=until,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _set_next_cursor(response, evaluations, crud.EVALUATION_PAGE_KEYS, limit)
+    return evaluations
+
+
+@router.put("/{policy_id}", response_model=schemas.PolicyRead, dependencies=[Depends(get_current_user)])
 def update_policy(
     policy_id: int,
     policy_in: schemas.PolicyUpdate,
@@ -180,7 +291,7 @@ def update_policy(
     return policy
 
 
-@router.delete("/{policy_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{policy_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(get_current_user)])
 def delete_policy(
     policy_id: int,
     db: Session = Depends(get_db)
@@ -0,0 +1,56 @@
+"""Resource inventory API endpoints."""
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app import crud, pagination, schemas
+from app.deps import get_db
+
+router = APIRouter(prefix="/resources", tags=["resources"])
+
+
+@router.get("/", response_model=list[schemas.ResourceRead])
+def list_resources(
+    response: Response,
+    account_id: Optional[int] = None,
+    provider: Optional[str] = Query(None, pattern="^(aws|azure|gcp)$"),
+    resource_type: Optional[str] = None,
+    region: Optional[str] = None,
+    config: Optional[str] = Query(None, description='JSON the configuration must contain, e.g. {"acl": "public-read"}'),
+    policy_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Search the synced inventory across accounts.
+
+    - **config**: JSON object the resource configuration must contain
+    - **policy_id**: Only resources currently violating this policy
+    - **cursor**: Opaque cursor from the previous page's `X-Next-Cursor` header
+    """
+    try:
+        config_filter = json.loads(config) if config else None
+        if config_filter is not None and not isinstance(config_filter, dict):
+            raise ValueError("config must be a JSON object")
+        resources = crud.query_resources(
+            db,
+            account_id=account_id,
+            provider=provider,
+            resource_type=resource_type,
+            region=region,
+            config=config_filter,
+            policy_id=policy_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    next_cursor = pagination.next_cursor(resources, crud.RESOURCE_PAGE_KEYS, limit)
+    if next_cursor:
+        response.headers[pagination.NEXT_CURSOR_HEADER] = next_cursor
+    return resources
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app import crud, schemas, sync_scheduler, sync_worker
+from app.deps import get_current_user, get_db
+
+router = APIRouter(prefix="/sync-jobs", tags=["sync-jobs"])
+
+
+@router.get("/schedule", response_model=schemas.SyncSchedule)
+def get_sync_schedule(limit: int = Query(50, ge=1, le=1000), db: Session = Depends(get_db)):
+    """List the next automatic syncs, soonest first, with current queue usage."""
+    upcoming = heapq.nsmallest(limit, sync_scheduler.load_schedule(db))
+    return schemas.SyncSchedule(
+        active_jobs=crud.count_active_sync_jobs(db),
+        max_concurrent=sync_scheduler.scheduler.max_concurrent,
+        upcoming=[
+            schemas.ScheduledSyncRead(
+                account_id=entry.account_id,
+                display_name=entry.display_name,
+                provider=entry.provider.value,
+                sync_frequency=entry.sync_frequency,
+                last_synced_at=entry.last_synced_at,
+                next_sync_at=entry.due_at,
+            )
+            for entry in upcoming
+        ],
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.SyncBatchRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_user)],
+)
+def create_bulk_sync(batch_in: schemas.SyncBatchCreate, response: Response, db: Session = Depends(get_db)):
+    """
+    Sync every account of a provider and/or status (all accounts when both are omitted).
+
+    Accounts are enqueued gradually as workers free up, within per-provider
+    in-flight limits; poll the returned batch for aggregate progress.
+    """
+    batch = crud.create_sync_batch(db, provider=batch_in.provider, account_status=batch_in.status)
+    sync_worker.pool.wake()
+    response.headers["Location"] = f"/sync-jobs/batches/{batch.id}"
+    return crud.get_sync_batch_progress(db, batch)
+
+
+@router.get("/batches", response_model=list[schemas.SyncBatchRead])
+def list_bulk_syncs(limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db)):
+    """List the most recent bulk syncs with their progress."""
+    return [crud.get_sync_batch_progress(db, batch) for batch in crud.get_sync_batches(db, limit=limit)]
+
+
+@router.get("/batches/{batch_id}", response_model=schemas.SyncBatchRead)
+def get_bulk_sync(batch_id: int, db: Session = Depends(get_db)):
+    """Report how many of a bulk sync's accounts are waiting, queued, running and finished."""
+    batch = crud.get_sync_batch(db, batch_id=batch_id)
+    if not batch:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bulk sync not found")
+    return crud.get_sync_batch_progress(db, batch)
+
+
+@router.get("/runs/summary", response_model=schemas.SyncRunSummary)
+def get_sync_run_summary(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    provider: Optional[str] = Query(None, pattern="^(aws|azure|gcp)$"),
+    slowest: int = Query(10, ge=0, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    Percentiles of sync durations, phase timings, throughput and API usage
+    across the fleet (default: the last 7 days), plus the slowest runs.
+
+    Compare two windows with `since`/`until` to spot regressions.
+    """
+    return crud.summarize_sync_runs(
+        db,
+        since=since or datetime.utcnow() - timedelta(days=7),
+        until=until,
+        provider=provider,
+        slowest=slowest,
+    )
+
+
+@router.get("/{job_id}", response_model=schemas.SyncJobRead)
+def get_sync_job(job_id: int, db: Session = Depends(get_db)):
+    """Report the status, stage and progress of a queued account sync."""
+    job = crud.get_sync_job(db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+    return job
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -38,6 +38,17 @@ class UserLogin(BaseModel):
     password: str
 
 
+class TokenResponse(UserRead):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
+
 # Account schemas
 class AccountBase(BaseModel):
     provider: CloudProvider
@@ -162,6 +173,60 @@ class DashboardSnapshot(BaseModel):
     providers: list[ProviderBreakdown]
 
 
+class SeverityBreakdown(BaseModel):
+    severity: PolicySeverity
+    policies: int = 0
+    evaluations: int = 0
+    compliant: int = 0
+    non_compliant: int = 0
+    warning: int = 0
+    unknown: int = 0
+
+
+class CategoryBreakdown(BaseModel):
+    category: str
+    policies: int = 0
+    evaluations: int = 0
+    compliant: int = 0
+    non_compliant: int = 0
+    warning: int = 0
+    unknown: int = 0
+
+
+class CriticalFinding(BaseModel):
+    evaluation_id: int
+    policy_id: int
+    policy_name: str
+    control_id: str
+    account_id: int
+    account_name: str
+    provider: CloudProvider
+    resource_id: Optional[str] = None
+    last_checked_at: datetime
+
+
+class CriticalFindings(BaseModel):
+    total: int
+    items: list[CriticalFinding]
+
+
+class ComplianceTrendPoint(BaseModel):
+    bucket_start: datetime
+    compliant: int
+    non_compliant: int
+    warning: int
+    unknown: int
+    total: int
+    score: float
+
+
+class ComplianceTrend(BaseModel):
+    bucket: str
+    start: datetime
+    end: datetime
+    points: list[ComplianceTrendPoint]
+
+
 # Notification schemas
 class NotificationBase(BaseModel):
     title: str = Field(min_length=2, max_length=255)
@@ -177,6 +242,24 @@ class NotificationRead(NotificationBase):
     id: int
     is_read: bool
     created_at: datetime
+    policy_id: Optional[int] = None
+    account_id: Optional[int] = None
+    occurrences: int = 1
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationArchiveRead(BaseModel):
+    id: int
+    title: str
+    message: str
+    type: NotificationType
+    policy_id: Optional[int] = None
+    account_id: Optional[int] = None
+    occurrences: int
+    created_at: datetime
+    archived_at: datetime
 
     class Config:
         from_attributes = True
@@ -243,6 +326,28 @@ class CloudAccountResponse(BaseModel):
         from_attributes = True
 
 
+class AccountValidationRead(BaseModel):
+    """Outcome of checking an account's credentials against its provider."""
+    account_id: int
+    is_valid: bool
+    message: str
+    provider: str
+    validated_at: datetime
+    cached: bool = False
+
+
+class AccountValidationBatch(BaseModel):
+    """Schema for validating many accounts' credentials in one request."""
+    account_ids: list[int] = Field(..., min_length=1, max_length=1000)
+    force: bool = False
+
+
+class AccountValidationBatchResult(BaseModel):
+    """Per-account validation results, plus requested ids that do not exist."""
+    results: list[AccountValidationRead]
+    not_found: list[int]
+
+
 # ===========================
 # Policy Schemas
 # ===========================
@@ -365,6 +470,72 @@ class EvaluationRead(BaseModel):
     last_checked_at: datetime
     findings: Optional[str] = None
     resource_id: Optional[str] = None
+    resource_ref_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class EvaluationBulkUpsert(BaseModel):
+    """Schema for upserting many policy evaluations in one request."""
+    items: list[EvaluationCreate] = Field(..., min_length=1, max_length=50000)
+
+
+class EvaluationBulkItemResult(BaseModel):
+    """Outcome of a single item in a bulk evaluation upsert."""
+    index: int
+    policy_id: int
+    account_id: int
+    outcome: str = Field(..., pattern="^(created|updated|skipped|failed)$")
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class EvaluationBulkResult(BaseModel):
+    """Schema for bulk evaluation upsert response."""
+    created: int
+    updated: int
+    skipped: int
+    failed: int
+    results: list[EvaluationBulkItemResult]
+
+
+class ResourceSnapshot(BaseModel):
+    """Configuration snapshot of one cloud resource, evaluated as a request context."""
+    resource_id: str = Field(..., min_length=1)
+    resource_type: Optional[str] = None
+    actions: list[str] = Field(default_factory=list)
+    context: dict[str, Any] = Field(default_factory=dict)
+    region: Optional[str] = None
+    configuration: Optional[dict[str, Any]] = None
+
+
+class ResourceSnapshotBatch(BaseModel):
+    """Schema for evaluating an account's policies against resource snapshots."""
+    resources: list[ResourceSnapshot] = Field(..., max_length=200000)
+
+
+class InventorySyncResult(BaseModel):
+    """Outcome of storing an account's inventory and re-evaluating what changed."""
+    total: int
+    changed: int
+    deleted: int
+    skipped: int
+    evaluations: EvaluationBulkResult
+
+
+class ResourceRead(BaseModel):
+    """Schema for an inventory resource."""
+    id: int
+    account_id: int
+    provider: CloudProvider
+    resource_type: Optional[str] = None
+    native_id: str
+    region: Optional[str] = None
+    config: Optional[dict[str, Any]] = None
+    violations: Optional[dict[str, list[str]]] = None
+    first_seen: datetime
+    last_seen: datetime = Field(validation_alias="seen_at")
 
     class Config:
         from_attributes = True
@@ -382,6 +553,8 @@ class NotificationCreate(BaseModel):
         default="broadcast",
         pattern="^(policy_violation|account_sync|build_complete|provisioning|broadcast)$"
     )
+    policy_id: Optional[int] = None
+    account_id: Optional[int] = None
 
     class Config:
         json_schema_extra = {
@@ -406,6 +579,128 @@ class NotificationResponse(BaseModel):
         from_attributes = True
 
 
+# ===========================
+# Sync Job Schemas
+# ===========================
+
+class SyncJobRead(BaseModel):
+    """Schema for sync job status."""
+    id: int
+    account_id: int
+    status: str
+    stage: Optional[str] = None
+    progress: int
+    message: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    resources_total: Optional[int] = None
+    resources_changed: Optional[int] = None
+    resources_deleted: Optional[int] = None
+    resources_skipped: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ScheduledSyncRead(BaseModel):
+    """An upcoming automatic sync."""
+    account_id: int
+    display_name: str
+    provider: str
+    sync_frequency: str
+    last_synced_at: Optional[datetime] = None
+    next_sync_at: datetime
+
+
+class SyncSchedule(BaseModel):
+    """Schema for the automatic sync schedule."""
+    active_jobs: int
+    max_concurrent: int
+    upcoming: list[ScheduledSyncRead]
+
+
+class SyncRunRead(BaseModel):
+    """Timings (milliseconds) and counters of one sync attempt."""
+    id: int
+    job_id: Optional[int] = None
+    account_id: int
+    provider: CloudProvider
+    status: str
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: datetime
+    duration_ms: float
+    auth_ms: Optional[float] = None
+    list_ms: Optional[float] = None
+    fetch_ms: Optional[float] = None
+    evaluate_ms: Optional[float] = None
+    persist_ms: Optional[float] = None
+    resources: int
+    resources_per_second: Optional[float] = None
+    api_calls: int
+    bytes_transferred: int
+    errors: int
+
+    class Config:
+        from_attributes = True
+
+
+class SyncRunPercentiles(BaseModel):
+    """Distribution of one sync run metric."""
+    metric: str
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+    max: Optional[float] = None
+
+
+class SyncRunSummary(BaseModel):
+    """Fleet-wide sync run percentiles over a time window, with the slowest runs."""
+    since: datetime
+    until: Optional[datetime] = None
+    provider: Optional[str] = None
+    runs: int
+    failed: int
+    metrics: list[SyncRunPercentiles]
+    slowest: list[SyncRunRead]
+
+
+class SyncBatchCreate(BaseModel):
+    """Schema for syncing every account of a provider and/or status; omit both for all accounts."""
+    provider: Optional[str] = Field(None, pattern="^(aws|azure|gcp)$")
+    status: Optional[str] = Field(None, pattern="^(connected|pending|error)$")
+
+
+class SyncBatchProviderProgress(BaseModel):
+    """Job counts of one provider's accounts in a bulk sync."""
+    provider: str
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+
+
+class SyncBatchRead(BaseModel):
+    """Aggregate progress of a bulk sync; ``waiting`` accounts are not enqueued yet."""
+    id: int
+    provider: Optional[str] = None
+    account_status: Optional[str] = None
+    total: int
+    dispatched: int
+    waiting: int
+    queued: int
+    running: int
+    succeeded: int
+    failed: int
+    progress: int
+    done: bool
+    created_at: datetime
+    dispatched_at: Optional[datetime] = None
+    providers: list[SyncBatchProviderProgress]
+
+
 # ===========================
 # User Schemas
 # ===========================
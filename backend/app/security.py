@@ -3,7 +3,12 @@ from __future__ import annotations
 import hashlib
 import secrets
 import warnings
-from typing import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple
+
+from jose import JWTError, jwt
+
+from app.config import settings
 
 try:
     from passlib.context import CryptContext  # type: ignore
@@ -74,3 +79,43 @@ def get_password_hasher() -> Callable[[str], str]:
 def get_password_verifier() -> Callable[[str, str], bool]:
     manager = PasswordManager()
     return manager.verify
+
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+
+class TokenError(ValueError):
+    """A bearer token is malformed, expired, badly signed or of the wrong type."""
+
+
+class TokenClaims(NamedTuple):
+    user_id: int
+    token_type: str
+    expires_at: datetime
+
+
+def create_token(user_id: int, token_type: str, expires_in: timedelta) -> str:
+    now = datetime.now(timezone.utc)
+    claims = {"sub": str(user_id), "type": token_type, "iat": now, "exp": now + expires_in}
+    return jwt.encode(claims, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+
+def create_access_token(user_id: int) -> str:
+    return create_token(user_id, ACCESS_TOKEN, timedelta(minutes=settings.access_token_expire_minutes))
+
+
+def create_refresh_token(user_id: int) -> str:
+    return create_token(user_id, REFRESH_TOKEN, timedelta(days=settings.refresh_token_expire_days))
+
+
+def decode_token(token: str, token_type: str = ACCESS_TOKEN) -> TokenClaims:
+    """Verify a token's signature and expiry and return its claims; no database access."""
+    try:
+        claims = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+        user_id = int(claims["sub"])
+    except (JWTError, KeyError, TypeError, ValueError) as exc:
+        raise TokenError("Invalid or expired token") from exc
+    if claims.get("type") != token_type:
+        raise TokenError(f"Wrong token type, expected {token_type!r}")
+    return TokenClaims(user_id, token_type, datetime.fromtimestamp(claims["exp"], timezone.utc))
@@ -0,0 +1,171 @@
+"""Schedule automatic account syncs from ``sync_frequency`` and ``auto_sync``.
+
+The scheduler keeps a min-heap of accounts ordered by when their next sync is
+due. An account is due one interval after its last sync (or last sync attempt,
+so failing accounts are retried at their normal cadence rather than on every
+tick), offset by a per-account jitter that spreads accounts sharing a
+frequency across a slice of the interval. Due accounts are enqueued for the
+sync workers only while fewer than ``SYNC_MAX_CONCURRENT`` jobs are queued or
+running fleet-wide. Each tick also tops up open bulk syncs, which workers
+otherwise advance as their jobs finish.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import crud, models, sync_worker
+from app.config import settings
+from app.database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+SYNC_INTERVALS: dict[str, timedelta] = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+
+
+@dataclass(frozen=True, order=True)
+class ScheduledSync:
+    due_at: datetime
+    account_id: int
+    display_name: str = field(compare=False)
+    provider: models.CloudProvider = field(compare=False)
+    sync_frequency: str = field(compare=False)
+    last_synced_at: Optional[datetime] = field(compare=False)
+
+
+def jitter(account_id: int, interval: timedelta, ratio: float) -> timedelta:
+    """Stable per-account offset in ``[0, interval * ratio)``."""
+    fraction = zlib.crc32(str(account_id).encode()) / 2**32
+    return interval * (ratio * fraction)
+
+
+def next_due(
+    account_id: int,
+    sync_frequency: Optional[str],
+    last_synced_at: Optional[datetime],
+    last_attempt_at: Optional[datetime],
+    now: datetime,
+    jitter_ratio: float,
+) -> Optional[datetime]:
+    """Return when the account should next sync, or None if it is not scheduled."""
+    interval = SYNC_INTERVALS.get((sync_frequency or "").lower())
+    if interval is None:
+        return None
+    offset = jitter(account_id, interval, jitter_ratio)
+    anchors = [moment for moment in (last_synced_at, last_attempt_at) if moment is not None]
+    if not anchors:
+        return now + offset
+    return max(anchors) + interval + offset
+
+
+def load_schedule(db: Session, now: Optional[datetime] = None) -> list[ScheduledSync]:
+    """Compute the next sync of every auto-sync account, as a heap."""
+    now = now or datetime.utcnow()
+    last_attempt = (
+        select(models.SyncJob.account_id, func.max(models.SyncJob.created_at).label("last_attempt_at"))
+        .group_by(models.SyncJob.account_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            models.CloudAccount.id,
+            models.CloudAccount.display_name,
+            models.CloudAccount.provider,
+            models.CloudAccount.sync_frequency,
+            models.CloudAccount.last_synced_at,
+            last_attempt.c.last_attempt_at,
+        )
+        .outerjoin(last_attempt, last_attempt.c.account_id == models.CloudAccount.id)
+        .where(models.CloudAccount.auto_sync.is_(True))
+    ).all()
+
+    heap = []
+    for account_id, display_name, provider, frequency, last_synced_at, last_attempt_at in rows:
+        due_at = next_due(account_id, frequency, last_synced_at, last_attempt_at, now, settings.sync_jitter_ratio)
+        if due_at is not None:
+            heap.append(ScheduledSync(due_at, account_id, display_name, provider, frequency, last_synced_at))
+    heapq.heapify(heap)
+    return heap
+
+
+class SyncScheduler:
+    """Background thread that enqueues due syncs from the schedule heap."""
+
+    def __init__(self, max_concurrent: int, refresh_seconds: float) -> None:
+        self.max_concurrent = max_concurrent
+        self.refresh_seconds = refresh_seconds
+        self._heap: list[ScheduledSync] = []
+        self._refresh_at: Optional[datetime] = None
+        self._batches_open = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sync-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def tick(self, db: Session, now: datetime) -> int:
+        """Enqueue due accounts up to the concurrency cap; returns how many were dispatched."""
+        if self._refresh_at is None or now >= self._refresh_at:
+            # Reloading picks up new accounts, frequency changes and finished syncs.
+            self._heap = load_schedule(db, now)
+            self._refresh_at = now + timedelta(seconds=self.refresh_seconds)
+
+        capacity = self.max_concurrent - crud.count_active_sync_jobs(db)
+        dispatched = 0
+        while self._heap and self._heap[0].due_at <= now and capacity > 0:
+            entry = heapq.heappop(self._heap)
+            crud.enqueue_sync_job(db, account_id=entry.account_id)
+            capacity -= 1
+            dispatched += 1
+        dispatched += crud.dispatch_sync_batches(db)
+        self._batches_open = crud.count_open_sync_batches(db) > 0
+        if dispatched:
+            sync_worker.pool.wake()
+        return dispatched
+
+    def _seconds_until_next(self, now: datetime) -> float:
+        deadline = now if self._batches_open else (self._refresh_at or now)
+        if self._heap and self._heap[0].due_at < deadline:
+            deadline = self._heap[0].due_at
+        return max((deadline - now).total_seconds(), settings.sync_poll_interval_seconds)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = datetime.utcnow()
+            db = get_db_session()
+            try:
+                self.tick(db, now)
+            except Exception:  # noqa: BLE001 - keep the scheduler alive
+                db.rollback()
+                logger.exception("Sync scheduler tick failed")
+            finally:
+                db.close()
+            self._stop.wait(self._seconds_until_next(now))
+
+
+scheduler = SyncScheduler(
+    max_concurrent=settings.sync_max_concurrent,
+    refresh_seconds=settings.sync_schedule_refresh_seconds,
+)
@@ -0,0 +1,68 @@
+"""Per-sync measurements recorded as ``sync_runs`` rows.
+
+A :class:`SyncMetrics` instance travels with one account sync. Phases are
+timed with :meth:`SyncMetrics.phase`; connectors find the instance through
+the ``current_metrics`` context variable (inherited by every task the sync
+spawns on the connector loop) and count API calls, bytes and errors on it,
+even though connectors and their clients are shared between syncs.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Iterator, Optional
+
+SYNC_PHASES = ("auth", "list", "fetch", "evaluate", "persist")
+
+current_metrics: ContextVar[Optional[SyncMetrics]] = ContextVar("current_sync_metrics", default=None)
+
+
+class SyncMetrics:
+    def __init__(self) -> None:
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.phases_ms: dict[str, float] = {}
+        self.resources = 0
+        self.api_calls = 0
+        self.bytes_transferred = 0
+        self.errors = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases_ms[name] = self.phases_ms.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def record_call(self, bytes_transferred: int, *, failed: bool = False) -> None:
+        self.api_calls += 1
+        self.bytes_transferred += bytes_transferred
+        if failed:
+            self.errors += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def resources_per_second(self) -> Optional[float]:
+        seconds = self.duration_ms / 1000
+        return self.resources / seconds if self.resources and seconds > 0 else None
+
+
+def record_call(bytes_transferred: int, *, failed: bool = False) -> None:
+    """Count one provider API call against the sync running in this context, if any."""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.record_call(bytes_transferred, failed=failed)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Linearly interpolated percentile of an ascending list (as ``percentile_cont``)."""
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
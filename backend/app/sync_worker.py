@@ -0,0 +1,239 @@
+"""Background workers that drain the ``sync_jobs`` queue.
+
+The API only enqueues jobs; workers claim them under a lease, renew it on
+every progress report and release it when the sync finishes. A worker that
+dies mid-sync simply stops renewing, and another worker re-claims the job
+once the lease expires. Sync results are committed in the same transaction
+as a last renewal, so a worker that stalled past its lease cannot overwrite
+the work of the worker that took the job over.
+
+Workers normally run in a dedicated process, which also runs the sync
+scheduler (pass ``--no-scheduler`` to leave scheduling to another one)::
+
+    python -m app.sync_worker --workers 4
+
+Setting ``SYNC_WORKERS`` / ``SYNC_SCHEDULER_ENABLED`` runs them as threads of
+the API process instead, which suits a single-process development setup.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app import connectors, crud, models, schemas
+from app.config import settings
+from app.database import get_db_session
+from app.notification_writer import writer as notification_writer
+from app.sync_telemetry import SyncMetrics
+
+logger = logging.getLogger(__name__)
+
+ProgressReporter = Callable[[str, int], None]
+LeaseCheck = Callable[[], None]
+
+
+class LeaseLost(RuntimeError):
+    """Raised when a worker's lease on a job was taken over by another worker."""
+
+
+def fetch_resources(account: models.CloudAccount, metrics: SyncMetrics) -> Optional[list[dict]]:
+    """
+    Return the account's resource snapshots, or None when no provider
+    connector is available to collect them.
+    """
+    if account.provider not in connectors.CONNECTORS:
+        return None
+    return connectors.fetch_inventory(account, metrics)
+
+
+def run_account_sync(
+    db: Session,
+    account: models.CloudAccount,
+    report: ProgressReporter,
+    metrics: Optional[SyncMetrics] = None,
+    hold_lease: Optional[LeaseCheck] = None,
+) -> tuple[str, Optional[schemas.InventorySyncResult]]:
+    """
+    Collect and evaluate one account's resources. Returns a summary message
+    and inventory counts. ``hold_lease`` runs inside each transaction that
+    stores results, right before its commit.
+    """
+    metrics = metrics or SyncMetrics()
+    report("fetching", 20)
+    resources = fetch_resources(account, metrics)
+
+    summary = "No resource connector for this provider; evaluations left unchanged."
+    inventory = None
+    if resources is not None:
+        report("evaluating", 60)
+        inventory = crud.sync_account_inventory(db, account, resources, metrics, before_commit=hold_lease)
+        summary = (
+            f"{inventory.total} resources: {inventory.changed} changed, {inventory.deleted} removed, "
+            f"{inventory.skipped} unchanged and skipped; {inventory.evaluations.created + inventory.evaluations.updated} "
+            "evaluations updated."
+        )
+
+    report("finalizing", 90)
+    now = datetime.utcnow()
+    account.last_synced_at = now
+    account.updated_at = now
+    if account.status == models.AccountStatus.PENDING:
+        account.status = models.AccountStatus.CONNECTED
+    if hold_lease is not None:
+        hold_lease()
+    db.commit()
+    # Durable, so a worker process that exits right after the sync does not
+    # take the notification down with its writer thread.
+    try:
+        notification_writer.submit([
+            schemas.NotificationCreate(
+                title="Sync completed",
+                message=f"{account.display_name}: {summary}",
+                type=models.NotificationType.ACCOUNT_SYNC,
+                account_id=account.id,
+            ),
+        ], durable=True)
+    except Exception:  # noqa: BLE001 - the sync itself is committed
+        logger.exception("Could not record the sync notification for account %s", account.id)
+    return summary, inventory
+
+
+def record_run(db: Session, job_id: int, account_id: int, metrics: SyncMetrics, error: Optional[str] = None) -> None:
+    """Store the run's telemetry; a failure here never fails the sync itself."""
+    try:
+        crud.record_sync_run(db, job_id=job_id, account_id=account_id, metrics=metrics, error=error)
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Could not record telemetry for sync job %s", job_id)
+
+
+def process_job(db: Session, job: models.SyncJob, worker_id: str, lease_seconds: float) -> None:
+    def report(stage: str, progress: int) -> None:
+        if not crud.report_sync_job_progress(
+            db, job.id, worker_id, stage=stage, progress=progress, lease_seconds=lease_seconds
+        ):
+            raise LeaseLost(f"Lost lease on sync job {job.id}")
+
+    def hold_lease() -> None:
+        if not crud.hold_sync_job_lease(db, job.id, worker_id, lease_seconds):
+            raise LeaseLost(f"Lost lease on sync job {job.id}")
+
+    job_id, account_id = job.id, job.account_id
+    metrics = SyncMetrics()
+    try:
+        account = crud.get_account(db, account_id)
+        if account is None:
+            raise ValueError(f"Account {account_id} no longer exists")
+        message, inventory = run_account_sync(db, account, report, metrics, hold_lease)
+    except LeaseLost:
+        db.rollback()
+        logger.warning("Sync job %s was re-claimed by another worker", job_id)
+        return
+    except Exception as exc:  # noqa: BLE001 - any failure ends the job
+        db.rollback()
+        logger.exception("Sync job %s failed", job_id)
+        crud.finish_sync_job(db, job_id, worker_id, succeeded=False, message=str(exc))
+        if crud.get_account(db, account_id) is not None:
+            record_run(db, job_id, account_id, metrics, error=str(exc))
+        return
+    crud.finish_sync_job(db, job_id, worker_id, succeeded=True, message=message, inventory=inventory)
+    record_run(db, job_id, account_id, metrics)
+
+
+class SyncWorkerPool:
+    """A fixed set of threads claiming and running sync jobs."""
+
+    def __init__(self, size: int, poll_interval: float, lease_seconds: float) -> None:
+        self.size = size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.size):
+            thread = threading.Thread(
+                target=self._run, args=(f"{prefix}:{index}",), name=f"sync-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self.wake()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self) -> None:
+        """Cut the idle wait short, e.g. right after a job was enqueued."""
+        with self._wake:
+            self._wake.notify_all()
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            db = get_db_session()
+            try:
+                job = crud.claim_sync_job(db, worker_id, self.lease_seconds)
+                if job is not None:
+                    batch_id = job.batch_id
+                    process_job(db, job, worker_id, self.lease_seconds)
+                    # Top up the bulk sync this job belonged to now that a slot is free.
+                    if batch_id is not None and crud.dispatch_sync_batches(db):
+                        self.wake()
+                    continue
+            except Exception:  # noqa: BLE001 - keep the worker alive
+                db.rollback()
+                logger.exception("Sync worker %s failed to claim a job", worker_id)
+            finally:
+                db.close()
+            with self._wake:
+                self._wake.wait(self.poll_interval)
+
+
+pool = SyncWorkerPool(
+    size=settings.sync_workers,
+    poll_interval=settings.sync_poll_interval_seconds,
+    lease_seconds=settings.sync_lease_seconds,
+)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run Cloud Guard sync workers")
+    parser.add_argument("--workers", type=int, default=settings.sync_workers or 2)
+    parser.add_argument(
+        "--no-scheduler", dest="scheduler", action="store_false", help="do not enqueue scheduled syncs"
+    )
+    args = parser.parse_args(argv)
+
+    # Run the pool of the imported module rather than of ``__main__``: that is
+    # the one the scheduler wakes when it enqueues jobs.
+    from app import sync_scheduler, sync_worker
+
+    logging.basicConfig(level=logging.INFO)
+    workers = sync_worker.pool
+    workers.size = args.workers
+    workers.start()
+    if args.scheduler:
+        sync_scheduler.scheduler.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        sync_scheduler.scheduler.stop(timeout=5)
+        workers.stop()
+
+
+if __name__ == "__main__":
+    main()
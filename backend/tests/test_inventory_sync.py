@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from app import crud, models, schemas
+
+DENY_PUBLIC_ACL = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Sid": "DenyPublicAcl",
+            "Effect": "Deny",
+            "Action": "s3:PutBucketAcl",
+            "Resource": "*",
+            "Condition": {"StringEquals": {"s3:x-amz-acl": "public-read"}},
+        }
+    ],
+}
+
+PUBLIC_BUCKET = {
+    "resource_id": "arn:aws:s3:::public-bucket",
+    "resource_type": "s3:bucket",
+    "actions": ["s3:PutBucketAcl"],
+    "context": {"s3:x-amz-acl": "public-read"},
+}
+
+
+@pytest.fixture
+def account(db):
+    account = models.CloudAccount(
+        provider=models.CloudProvider.AWS, external_id="123456789012", display_name="Production"
+    )
+    db.add_all([
+        account,
+        models.Policy(
+            provider=models.CloudProvider.AWS,
+            name="Deny public bucket ACLs",
+            control_id="S3.1",
+            category="Storage",
+            policy_content=json.dumps(DENY_PUBLIC_ACL),
+        ),
+    ])
+    db.commit()
+    return account
+
+
+def stored_evaluations(db, account):
+    return db.query(models.PolicyEvaluation).filter_by(account_id=account.id).all()
+
+
+def test_sync_evaluates_changed_resources_once(db, account):
+    first = crud.sync_account_inventory(db, account, [PUBLIC_BUCKET])
+    assert (first.changed, first.evaluations.created) == (1, 1)
+    assert stored_evaluations(db, account)[0].status == models.ComplianceStatus.NON_COMPLIANT
+
+    second = crud.sync_account_inventory(db, account, [PUBLIC_BUCKET])
+    assert (second.changed, second.skipped) == (0, 1)
+
+
+def test_failed_evaluation_write_is_retried_by_the_next_sync(db, account, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("invalid evaluation payload")
+
+    monkeypatch.setattr(crud, "_changed_evaluations", fail)
+    with pytest.raises(ValueError):
+        crud.sync_account_inventory(db, account, [PUBLIC_BUCKET])
+    monkeypatch.undo()
+
+    # Nothing from the failed sync was kept, so the resource still counts as changed.
+    assert db.query(models.Resource).filter_by(account_id=account.id).count() == 0
+    retry = crud.sync_account_inventory(db, account, [PUBLIC_BUCKET])
+    assert (retry.changed, retry.evaluations.created) == (1, 1)
+    assert stored_evaluations(db, account)[0].status == models.ComplianceStatus.NON_COMPLIANT
+
+
+def test_unchanged_resources_are_seen_without_being_rewritten(db, account):
+    crud.sync_account_inventory(db, account, [PUBLIC_BUCKET])
+    written = db.query(models.Resource).one().last_seen
+
+    crud.sync_account_inventory(db, account, [PUBLIC_BUCKET])
+    resource = crud.query_resources(db, account_id=account.id)[0]
+    assert resource.last_seen == written
+    assert schemas.ResourceRead.model_validate(resource).last_seen == account.inventory_seen_at > written
+
+
+def test_evaluations_link_resources_with_long_ids(db, account):
+    long_bucket = {**PUBLIC_BUCKET, "resource_id": "arn:aws:s3:::" + "b" * 300}
+    crud.sync_account_inventory(db, account, [long_bucket])
+
+    evaluation = stored_evaluations(db, account)[0]
+    resource = db.query(models.Resource).one()
+    assert len(evaluation.resource_id) == 255
+    assert evaluation.resource_ref_id == resource.id
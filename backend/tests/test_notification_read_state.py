@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import crud, models, schemas
+from app.notification_writer import notification_row, store_notifications
+
+
+@pytest.fixture
+def user(db):
+    user = models.User(email="analyst@example.com", full_name="Analyst", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def add_notification(db, title, created_at, **fields):
+    row = notification_row(schemas.NotificationCreate(title=title, message=title, **fields), created_at=created_at)
+    notification = store_notifications(db, [row])[0]
+    db.commit()
+    return notification
+
+
+def is_read(db, user, notification):
+    db.expire_all()
+    state = crud.get_notification_read_state(db, user.id)
+    return crud.is_notification_read(state, db.get(models.Notification, notification.id))
+
+
+def test_bumped_notification_reads_as_unread_again(db, user):
+    account = models.CloudAccount(
+        provider=models.CloudProvider.AWS, external_id="123456789012", display_name="Production"
+    )
+    db.add(account)
+    db.commit()
+    now = datetime.utcnow()
+    sync = dict(type=models.NotificationType.ACCOUNT_SYNC, account_id=account.id)
+    notification = add_notification(db, "Sync completed", now - timedelta(minutes=5), **sync)
+    crud.mark_notification_read(db, notification.id, user.id)
+    assert is_read(db, user, notification)
+
+    bumped = add_notification(db, "Sync completed", now, **sync)
+    assert (bumped.id, bumped.occurrences) == (notification.id, 2)
+    assert not is_read(db, user, notification)
+    assert crud.count_unread_notifications(db, user.id) == 1
+
+
+def test_reading_in_order_compacts_into_the_mark(db, user):
+    now = datetime.utcnow()
+    first, second, third = (
+        add_notification(db, title, now - timedelta(minutes=minutes))
+        for title, minutes in (("First", 3), ("Second", 2), ("Third", 1))
+    )
+    crud.mark_notification_read(db, second.id, user.id)
+    state = crud.get_notification_read_state(db, user.id)
+    assert (state.read_through, list(state.read_ids)) == (None, [str(second.id)])
+
+    crud.mark_notification_read(db, first.id, user.id)
+    db.expire_all()
+    state = crud.get_notification_read_state(db, user.id)
+    assert (state.read_through, state.read_through_id, state.read_ids) == (second.created_at, second.id, {})
+    assert not is_read(db, user, third)
+    assert crud.count_unread_notifications(db, user.id) == 1
+
+
+def test_mark_all_read_covers_only_notifications_that_exist(db, user):
+    now = datetime.utcnow()
+    add_notification(db, "Policy updated", now - timedelta(minutes=1))
+    # Provisioning steps are dated a few seconds ahead.
+    provisioning = add_notification(
+        db, "Provisioning complete", now + timedelta(seconds=6), type=models.NotificationType.PROVISIONING
+    )
+    assert crud.mark_all_notifications_read(db, user.id) == 2
+
+    state = crud.get_notification_read_state(db, user.id)
+    assert state.read_through <= datetime.utcnow()
+    assert state.read_ids == {str(provisioning.id): provisioning.created_at.isoformat()}
+    assert crud.count_unread_notifications(db, user.id) == 0
+
+    # Submitted before the mark but written after it.
+    late = add_notification(db, "Sync completed", now - timedelta(seconds=30))
+    assert late.created_at < state.read_through
+    assert not is_read(db, user, late)
+    assert crud.count_unread_notifications(db, user.id) == 1
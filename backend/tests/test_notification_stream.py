@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from sqlalchemy import update
+
+from app import models
+from app.notification_bus import NotificationBus
+from app.routers import notifications as notifications_router
+
+
+def add_notification(db, notification_id, title):
+    # Written straight to the database, as another process would.
+    db.add(models.Notification(id=notification_id, title=title, message=title))
+    db.commit()
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return [(event.id, event.occurrences) for event in events]
+
+
+def test_poll_publishes_late_commits_and_bumps(db):
+    bus = NotificationBus(queue_size=10, poll_interval=3600, poll_lag=60)
+
+    async def run():
+        subscription = bus.subscribe()
+        bus.watch()
+        try:
+            add_notification(db, 20, "Sync completed")
+            bus._poll()
+            await asyncio.sleep(0)
+            assert drain(subscription) == [(20, 1)]
+
+            # A lower id committed after the poll read past it.
+            add_notification(db, 10, "Account provisioned")
+            bus._poll()
+            await asyncio.sleep(0)
+            assert drain(subscription) == [(10, 1)]
+
+            db.execute(update(models.Notification).where(models.Notification.id == 20).values(occurrences=2))
+            db.commit()
+            bus._poll()
+            bus._poll()
+            await asyncio.sleep(0)
+            assert drain(subscription) == [(20, 2)]
+        finally:
+            bus.stop(timeout=1)
+
+    asyncio.run(run())
+
+
+def test_stream_resume_delivers_late_commits_and_bumps(db, monkeypatch):
+    monkeypatch.setattr(notifications_router, "bus", NotificationBus(queue_size=10, poll_interval=0, poll_lag=60))
+    add_notification(db, 4, "Policy updated")
+    add_notification(db, 5, "Sync completed")
+    # While the client was away: a late commit below its Last-Event-ID, a
+    # bump of a notification it already has, and a new notification.
+    add_notification(db, 3, "Account provisioned")
+    db.execute(update(models.Notification).where(models.Notification.id == 4).values(occurrences=2))
+    db.commit()
+    add_notification(db, 6, "Sync failed")
+
+    async def run():
+        response = await notifications_router.stream_notifications(last_event_id=None, last_event_id_header=5)
+        frames = []
+        async for frame in response.body_iterator:
+            frames.append(frame)
+            if len(frames) == 4:
+                break
+        await response.body_iterator.aclose()
+        return frames
+
+    frames = asyncio.run(run())
+    ids = [line for frame in frames for line in frame.splitlines() if line.startswith("id: ")]
+    delivered = {
+        json.loads(line[len("data: "):])["id"]: json.loads(line[len("data: "):])["occurrences"]
+        for frame in frames for line in frame.splitlines() if line.startswith("data: ")
+    }
+    assert ids == ["id: 6"]
+    assert delivered == {3: 1, 4: 2, 5: 1, 6: 1}
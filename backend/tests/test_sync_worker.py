@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import crud, models, sync_worker
+
+
+@pytest.fixture
+def account(db):
+    account = models.CloudAccount(
+        provider=models.CloudProvider.AWS, external_id="123456789012", display_name="Production"
+    )
+    db.add(account)
+    db.commit()
+    return account
+
+
+BUCKET = {"resource_id": "arn:aws:s3:::logs", "resource_type": "s3:bucket"}
+
+
+def test_expired_lease_keeps_the_stalled_worker_from_committing(db, account, monkeypatch):
+    job = crud.enqueue_sync_job(db, account.id)
+    assert crud.claim_sync_job(db, "worker-a", lease_seconds=60).id == job.id
+
+    provider_policies = crud._provider_policies
+
+    def stalled_evaluation(*args):
+        # worker-a stalls past its lease mid-sync and worker-b re-claims the job.
+        db.query(models.SyncJob).filter_by(id=job.id).update(
+            {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+        assert crud.claim_sync_job(db, "worker-b", lease_seconds=60).id == job.id
+        return provider_policies(*args)
+
+    monkeypatch.setattr(sync_worker, "fetch_resources", lambda account, metrics: [BUCKET])
+    monkeypatch.setattr(crud, "_provider_policies", stalled_evaluation)
+    sync_worker.process_job(db, crud.get_sync_job(db, job.id), "worker-a", lease_seconds=60)
+
+    db.expire_all()
+    assert db.query(models.Resource).filter_by(account_id=account.id).count() == 0
+    assert db.get(models.CloudAccount, account.id).last_synced_at is None
+    job = crud.get_sync_job(db, job.id)
+    assert (job.status, job.lease_owner, job.attempts) == (models.SyncJobStatus.RUNNING, "worker-b", 2)
+
+
+def test_sync_commits_while_the_lease_is_held(db, account, monkeypatch):
+    job = crud.enqueue_sync_job(db, account.id)
+    crud.claim_sync_job(db, "worker-a", lease_seconds=60)
+    monkeypatch.setattr(sync_worker, "fetch_resources", lambda account, metrics: [BUCKET])
+    sync_worker.process_job(db, crud.get_sync_job(db, job.id), "worker-a", lease_seconds=60)
+
+    db.expire_all()
+    assert db.query(models.Resource).filter_by(account_id=account.id).count() == 1
+    assert crud.get_sync_job(db, job.id).status == models.SyncJobStatus.SUCCEEDED
@@ -4,6 +4,7 @@ import { useEffect, useMemo, useState } from "react";
 import { useAuth } from "../context/AuthContext";
 import {
   useNotifications,
+  useUnreadNotificationCount,
   useMarkNotificationRead,
   useMarkAllNotificationsRead,
 } from "../services/hooks";
@@ -106,6 +107,7 @@ export default function MainLayout() {
   const [dismissedNotificationIds, setDismissedNotificationIds] = useState(new Set());
 
   const { data: notifications = [] } = useNotifications();
+  const { data: unreadCount = 0 } = useUnreadNotificationCount();
   const markNotificationRead = useMarkNotificationRead();
   const markAllRead = useMarkAllNotificationsRead();
 
@@ -130,7 +132,6 @@ export default function MainLayout() {
     [notifications, dismissedNotificationIds]
   );
 
-  const unreadCount = visibleNotifications.filter((notification) => !notification.is_read).length;
 
   const handleLogout = () => {
     runAppTransition("exit", () => {
@@ -264,7 +265,12 @@ export default function MainLayout() {
                             {!["policy_violation", "account_sync", "build_complete", "provisioning"].includes(notification.type) && "📢"}
                           </div>
                           <div className="notification-item__content">
-                            <div className="notification-item__title">{notification.title}</div>
+                            <div className="notification-item__title">
+                              {notification.title}
+                              {notification.occurrences > 1 && (
+                                <span className="notification-item__count">×{notification.occurrences}</span>
+                              )}
+                            </div>
                             <div className="notification-item__message">{notification.message}</div>
                             <div className="notification-item__time">
                               {new Date(notification.created_at ?? Date.now()).toLocaleString()}
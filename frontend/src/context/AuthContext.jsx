@@ -1,6 +1,6 @@
 import { createContext, useCallback, useContext, useEffect, useMemo, useState } from "react";
 
-const TOKEN_KEY = "cloud_guard_token";
+import { REFRESH_TOKEN_KEY, TOKEN_KEY } from "../services/apiClient";
 
 const AuthContext = createContext({
   token: null,
@@ -19,11 +19,17 @@ export function AuthProvider({ children }) {
     }
   }, [token]);
 
-  const login = useCallback((value) => {
-    setToken(value || "demo-token");
+  const login = useCallback((value, refreshToken) => {
+    if (refreshToken) {
+      window.localStorage.setItem(REFRESH_TOKEN_KEY, refreshToken);
+    } else {
+      window.localStorage.removeItem(REFRESH_TOKEN_KEY);
+    }
+    setToken(value || null);
   }, []);
 
   const logout = useCallback(() => {
+    window.localStorage.removeItem(REFRESH_TOKEN_KEY);
     setToken(null);
   }, []);
 
@@ -2,7 +2,13 @@ import { useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 
 
-import { useDashboard, useEvaluations, usePolicies } from "../services/hooks";
+import {
+  useCategoryBreakdown,
+  useComplianceTrends,
+  useCriticalFindings,
+  useDashboard,
+  useSeverityBreakdown,
+} from "../services/hooks";
 import PageHero from "../components/PageHero";
 import dashboardIllustration from "../assets/illustrations/dashboard-hero.svg";
 
@@ -25,14 +31,16 @@ export default function DashboardPage() {
     isLoading: summaryLoading,
     isError: summaryError,
   } = useDashboard();
-  const { data: evaluations = [], isLoading: evalLoading } = useEvaluations();
-  const { data: policies = [], isLoading: policyLoading } = usePolicies();
+  const { data: severityRows = [], isLoading: severityLoading } = useSeverityBreakdown();
+  const { data: categoryRows = [], isLoading: categoryLoading } = useCategoryBreakdown();
+  const { data: findings, isLoading: findingsLoading } = useCriticalFindings();
+  const { data: trends } = useComplianceTrends();
 
   const handleGenerateReport = () => {
     const reportData = {
       summary: safeSummary,
-      policies,
-      evaluations,
+      categories: categoryRows,
+      recentCriticalFindings: findings?.items ?? [],
       timestamp: new Date().toISOString(),
       complianceRate,
       securityScore,
@@ -54,10 +62,10 @@ export default function DashboardPage() {
     URL.revokeObjectURL(url);
   };
 
-  const loading = summaryLoading || evalLoading || policyLoading;
+  const loading = summaryLoading || severityLoading || categoryLoading || findingsLoading;
   const safeSummary = summary ?? { summary: {}, providers: [] };
 
-  const totalPolicies = safeSummary.summary?.total_policies ?? policies.length;
+  const totalPolicies = safeSummary.summary?.total_policies ?? 0;
   const compliantPolicies = safeSummary.summary?.compliant ?? 0;
   const nonCompliantPolicies = safeSummary.summary?.non_compliant ?? 0;
   const pendingPolicies = safeSummary.summary?.unknown ?? Math.max(
@@ -74,7 +82,7 @@ export default function DashboardPage() {
     70 + Math.round(complianceRate * 0.3 + (100 - nonCompliantPolicies * 2) / 4)
   );
 
-  // Calculate severity breakdown from policies
+  // Severity counts are aggregated server-side
   const severityBreakdown = useMemo(() => {
     const breakdown = {
       critical: 0,
@@ -83,33 +91,36 @@ export default function DashboardPage() {
       low: 0
     };
     
-    policies.forEach(policy => {
-      if (policy.severity && breakdown.hasOwnProperty(policy.severity)) {
-        breakdown[policy.severity]++;
+    severityRows.forEach(row => {
+      if (breakdown.hasOwnProperty(row.severity)) {
+        breakdown[row.severity] = row.policies;
       }
     });
     
     return breakdown;
-  }, [policies]);
+  }, [severityRows]);
 
-  const criticalFindings = useMemo(() => {
-    return policies.filter(p => 
-      p.severity === 'critical' && 
-      p.compliance_status === 'non_compliant'
-    ).length;
-  }, [policies]);
+  const criticalFindings = findings?.total ?? 0;
 
-  const resourcesMonitored = evaluations.length;
+  const resourcesMonitored = totalPolicies;
   const connectedAccounts = safeSummary.providers?.reduce((sum, p) => sum + (p.accounts || 0), 0) || 0;
 
+  // Fall back to the illustrative template until there is enough history to plot.
+  const trendPoints = trends?.points?.filter((point) => point.total > 0) ?? [];
+  const hasTrendHistory = trendPoints.length > 1;
+
   const trendScores = useMemo(
-    () => TREND_TEMPLATE.map((value) => Math.min(100, value + (complianceRate - 85) / 5)),
-    [complianceRate]
+    () => hasTrendHistory
+      ? trendPoints.map((point) => point.score)
+      : TREND_TEMPLATE.map((value) => Math.min(100, value + (complianceRate - 85) / 5)),
+    [hasTrendHistory, trends, complianceRate]
   );
 
   const trendViolations = useMemo(
-    () => VIOLATION_TEMPLATE.map((value) => Math.max(20, value + nonCompliantPolicies)),
-    [nonCompliantPolicies]
+    () => hasTrendHistory
+      ? trendPoints.map((point) => point.non_compliant)
+      : VIOLATION_TEMPLATE.map((value) => Math.max(20, value + nonCompliantPolicies)),
+    [hasTrendHistory, trends, nonCompliantPolicies]
   );
 
   const providerBreakdown = safeSummary.providers ?? [];
@@ -121,26 +132,16 @@ export default function DashboardPage() {
     [compliantPolicies, nonCompliantPolicies, pendingPolicies]
   );
 
-  // Calculate category distribution
-  const categoryDistribution = useMemo(() => {
-    const categories = {};
-    policies.forEach(policy => {
-      const category = policy.category || 'Uncategorized';
-      if (!categories[category]) {
-        categories[category] = { total: 0, compliant: 0, nonCompliant: 0 };
-      }
-      categories[category].total++;
-      if (policy.compliance_status === 'compliant') {
-        categories[category].compliant++;
-      } else if (policy.compliance_status === 'non_compliant') {
-        categories[category].nonCompliant++;
-      }
-    });
-    return Object.entries(categories)
-      .map(([name, data]) => ({ name, ...data }))
-      .sort((a, b) => b.nonCompliant - a.nonCompliant)
-      .slice(0, 5);
-  }, [policies]);
+  const categoryDistribution = useMemo(
+    () => categoryRows.map((row) => ({
+      name: row.category,
+      total: row.policies,
+      evaluated: row.evaluations,
+      compliant: row.compliant,
+      nonCompliant: row.non_compliant,
+    })),
+    [categoryRows]
+  );
 
   if (loading) {
     return (
@@ -361,6 +362,7 @@ export default function DashboardPage() {
                   rank={index + 1}
                   name={category.name}
                   total={category.total}
+                  evaluated={category.evaluated}
                   compliant={category.compliant}
                   nonCompliant={category.nonCompliant}
                 />
@@ -553,8 +555,8 @@ function SeverityCard({ severity, count, color, icon }) {
   );
 }
 
-function CategoryItem({ rank, name, total, compliant, nonCompliant }) {
-  const complianceRate = total ? Math.round((compliant / total) * 100) : 0;
+function CategoryItem({ rank, name, total, evaluated, compliant, nonCompliant }) {
+  const complianceRate = evaluated ? Math.round((compliant / evaluated) * 100) : 0;
   
   return (
     <div className="category-item">
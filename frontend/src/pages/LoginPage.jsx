@@ -32,8 +32,7 @@ export default function LoginPage() {
       { email: formState.email.trim(), password: formState.password },
       {
         onSuccess: (response) => {
-          const token = response?.token ?? "demo-token";
-          setAuthToken(token);
+          setAuthToken(response?.access_token, response?.refresh_token);
           const redirectTo = location.state?.from?.pathname ?? "/";
           runAppTransition("enter", () => navigate(redirectTo, { replace: true }));
         },
@@ -1,5 +1,5 @@
 import { useParams, useNavigate, Link } from "react-router-dom";
-import { usePolicies, useEvaluations, useDeletePolicy, useUpdatePolicy } from "../services/hooks";
+import { usePolicies, usePolicyEvaluations, useDeletePolicy, useUpdatePolicy } from "../services/hooks";
 import { useMemo, useState, useCallback } from "react";
 import "../styles.css";
 
@@ -72,7 +72,7 @@ export default function PolicyViewPage() {
   const { policyId } = useParams();
   const navigate = useNavigate();
   const { data: policies = [], isLoading: policiesLoading } = usePolicies();
-  const { data: evaluations = [], isLoading: evaluationsLoading } = useEvaluations();
+  const { data: policyEvaluations = [], isLoading: evaluationsLoading } = usePolicyEvaluations(policyId);
   const deletePolicy = useDeletePolicy();
   const updatePolicy = useUpdatePolicy();
   
@@ -104,11 +104,6 @@ export default function PolicyViewPage() {
     return policies.find(p => p.id === parseInt(policyId));
   }, [policies, policyId]);
 
-  // Memoized evaluations filter
-  const policyEvaluations = useMemo(() => {
-    return evaluations.filter(evaluation => evaluation.policy_id === parseInt(policyId));
-  }, [evaluations, policyId]);
-
   // Memoized computed values
   const policyMetrics = useMemo(() => {
     const resourceCount = policyEvaluations.length;
@@ -1,7 +1,14 @@
 import { useMemo, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 
-import { useAccounts, useEvaluations, usePolicies, useSyncAccount, useDeleteAccount } from "../services/hooks";
+import {
+  useAccounts,
+  useAccountEvaluations,
+  usePolicies,
+  useSyncAccount,
+  useSyncJob,
+  useDeleteAccount,
+} from "../services/hooks";
 import PageHero from "../components/PageHero";
 
 const PROVIDER_IMAGES = {
@@ -38,8 +45,9 @@ export default function ServiceDetailsPage() {
 
   const { data: accounts } = useAccounts();
   const { data: policies } = usePolicies();
-  const { data: evaluations } = useEvaluations();
   const syncAccount = useSyncAccount();
+  const { data: syncJob } = useSyncJob(syncAccount.data?.id);
+  const isSyncing = syncAccount.isPending || ["queued", "running"].includes(syncJob?.status);
   const deleteAccount = useDeleteAccount();
 
   const connectedAccount = useMemo(
@@ -47,10 +55,8 @@ export default function ServiceDetailsPage() {
     [accounts, provider]
   );
 
-  const relatedEvaluations = useMemo(
-    () => (evaluations ?? []).filter((item) => item.account?.provider === provider),
-    [evaluations, provider]
-  );
+  const { data: accountEvaluations } = useAccountEvaluations(connectedAccount?.id);
+  const relatedEvaluations = accountEvaluations ?? [];
 
   const controls = useMemo(
     () => (policies ?? []).filter((policy) => policy.provider === provider),
@@ -103,12 +109,12 @@ export default function ServiceDetailsPage() {
                 <button
                   className="button button--primary"
                   onClick={handleSync}
-                  disabled={syncAccount.isPending}
+                  disabled={isSyncing}
                 >
                   <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
                     <path d="M4 8a8 8 0 0 1 13.66-3.5M20 8V3h-4M20 16a8 8 0 0 1-13.66 3.5M4 16v5h4" />
                   </svg>
-                  {syncAccount.isPending ? "Syncing..." : "Sync Now"}
+                  {isSyncing ? `Syncing... ${syncJob?.progress ?? 0}%` : "Sync Now"}
                 </button>
                 <button
                   className="button button--secondary"
@@ -206,7 +212,7 @@ export default function ServiceDetailsPage() {
                     className="icon-button"
                     title="Refresh"
                     onClick={handleSync}
-                    disabled={syncAccount.isPending}
+                    disabled={isSyncing}
                   >
                     <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
                       <path d="M4 8a8 8 0 0 1 13.66-3.5M20 8V3h-4M20 16a8 8 0 0 1-13.66 3.5M4 16v5h4" />
@@ -369,7 +375,7 @@ export default function ServiceDetailsPage() {
             <button 
               className="action-card" 
               onClick={handleSync} 
-              disabled={syncAccount.isPending}
+              disabled={isSyncing}
             >
               <div className="action-card__icon">
                 <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
@@ -525,7 +531,7 @@ export default function ServiceDetailsPage() {
                             <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2">
                               <path d="M9 5H7a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2V7a2 2 0 00-2-2h-2M9 5a2 2 0 002 2h2a2 2 0 002-2M9 5a2 2 0 012-2h2a2 2 0 012 2" />
                             </svg>
-                            <p>No evaluations found for this provider</p>
+                            <p>No evaluations found for this account</p>
                           </div>
                         </td>
                       </tr>
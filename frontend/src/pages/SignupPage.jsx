@@ -49,8 +49,7 @@ export default function SignupPage() {
       { full_name: fullName, email: formState.email.trim(), password: formState.password },
       {
         onSuccess: (response) => {
-          const token = response?.token ?? "demo-token";
-          setAuthToken(token);
+          setAuthToken(response?.access_token, response?.refresh_token);
           runAppTransition("enter", () => navigate("/", { replace: true }));
         },
         onError: (err) => {
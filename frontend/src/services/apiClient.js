@@ -2,7 +2,7 @@ import axios from 'axios';
 
 // 1. Get the base URL from environment
 // We handle both cases: with or without trailing slash
-let baseURL = import.meta.env.VITE_API_URL || '/api';
+export let baseURL = import.meta.env.VITE_API_URL || '/api';
 
 // 2. SAFETY FIX: Remove any trailing slash from the base URL to prevent double-slashes
 if (baseURL.endsWith('/')) {
@@ -18,15 +18,63 @@ export const apiClient = axios.create({
   },
 });
 
-// 4. Request Interceptor (Optional)
+// Tokens issued by /auth/login and /auth/register (see AuthContext)
+export const TOKEN_KEY = 'cloud_guard_token';
+export const REFRESH_TOKEN_KEY = 'cloud_guard_refresh_token';
+
+// 4. Request Interceptor (send the signed-in user's access token)
 apiClient.interceptors.request.use((config) => {
+  const token = window.localStorage.getItem(TOKEN_KEY);
+  if (token) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
   return config;
 });
 
-// 5. Response Interceptor (Better error handling)
+// One refresh at a time, shared by every request that hit an expired token
+let refreshing = null;
+
+function refreshAccessToken() {
+  const refreshToken = window.localStorage.getItem(REFRESH_TOKEN_KEY);
+  if (!refreshToken) {
+    return Promise.reject(new Error('No refresh token'));
+  }
+  refreshing ??= axios
+    .post(`${baseURL}/auth/refresh`, { refresh_token: refreshToken })
+    .then(({ data }) => {
+      window.localStorage.setItem(TOKEN_KEY, data.access_token);
+      window.localStorage.setItem(REFRESH_TOKEN_KEY, data.refresh_token);
+      return data.access_token;
+    })
+    .finally(() => {
+      refreshing = null;
+    });
+  return refreshing;
+}
+
+// The session cannot be renewed: forget both tokens and start over at the login page
+function signOut() {
+  window.localStorage.removeItem(TOKEN_KEY);
+  window.localStorage.removeItem(REFRESH_TOKEN_KEY);
+  if (window.location.pathname !== '/login') {
+    window.location.assign('/login');
+  }
+}
+
+// 5. Response Interceptor (Better error handling, renew expired access tokens)
 apiClient.interceptors.response.use(
   (response) => response.data, // Return data directly to match common React Query patterns
-  (error) => {
+  async (error) => {
+    const { config, response } = error;
+    if (response?.status === 401 && config && !config._retried && !config.url?.startsWith('auth/')) {
+      try {
+        await refreshAccessToken();
+        return apiClient({ ...config, _retried: true });
+      } catch {
+        // Fall through and report the original 401
+        signOut();
+      }
+    }
     console.error(`API Error on ${error.config?.url}:`, error.response?.data || error.message);
     return Promise.reject(error);
   }
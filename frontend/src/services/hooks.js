@@ -1,13 +1,20 @@
+import { useEffect } from "react";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 
-import { apiClient } from "./apiClient";
+import { apiClient, baseURL } from "./apiClient";
 
 const queryKeys = {
   dashboard: ["dashboard", "summary"],
+  trends: ["dashboard", "trends"],
+  severity: ["dashboard", "severity"],
+  categories: ["dashboard", "categories"],
+  criticalFindings: ["dashboard", "critical-findings"],
   accounts: ["accounts"],
+  syncJobs: ["sync-jobs"],
   policies: ["policies"],
   evaluations: ["evaluations"],
   notifications: ["notifications"],
+  unreadNotifications: ["notifications", "unread-count"],
 };
 
 export function useDashboard() {
@@ -17,6 +24,34 @@ export function useDashboard() {
   });
 }
 
+export function useComplianceTrends(bucket = "daily") {
+  return useQuery({
+    queryKey: [...queryKeys.trends, bucket],
+    queryFn: () => apiClient.get("dashboard/trends", { params: { bucket } }),
+  });
+}
+
+export function useSeverityBreakdown() {
+  return useQuery({
+    queryKey: queryKeys.severity,
+    queryFn: () => apiClient.get("dashboard/severity"),
+  });
+}
+
+export function useCategoryBreakdown(limit = 5) {
+  return useQuery({
+    queryKey: [...queryKeys.categories, limit],
+    queryFn: () => apiClient.get("dashboard/categories", { params: { limit } }),
+  });
+}
+
+export function useCriticalFindings(limit = 10) {
+  return useQuery({
+    queryKey: [...queryKeys.criticalFindings, limit],
+    queryFn: () => apiClient.get("dashboard/critical-findings", { params: { limit } }),
+  });
+}
+
 export function useAccounts() {
   return useQuery({
     queryKey: queryKeys.accounts,
@@ -40,6 +75,26 @@ export function useSyncAccount() {
   });
 }
 
+const ACTIVE_SYNC_STATUSES = ["queued", "running"];
+
+export function useSyncJob(jobId) {
+  const client = useQueryClient();
+  return useQuery({
+    queryKey: [...queryKeys.syncJobs, jobId],
+    queryFn: async () => {
+      const job = await apiClient.get(`sync-jobs/${jobId}`);
+      if (!ACTIVE_SYNC_STATUSES.includes(job.status)) {
+        client.invalidateQueries({ queryKey: queryKeys.accounts });
+        client.invalidateQueries({ queryKey: queryKeys.evaluations });
+        client.invalidateQueries({ queryKey: queryKeys.notifications });
+      }
+      return job;
+    },
+    enabled: Boolean(jobId),
+    refetchInterval: (query) => (ACTIVE_SYNC_STATUSES.includes(query.state.data?.status) ? 1000 : false),
+  });
+}
+
 export function useDeleteAccount() {
   const client = useQueryClient();
   return useMutation({
@@ -95,6 +150,22 @@ export function useEvaluations() {
   });
 }
 
+export function useAccountEvaluations(accountId, params = {}) {
+  return useQuery({
+    queryKey: [...queryKeys.evaluations, "account", accountId, params],
+    queryFn: () => apiClient.get(`accounts/${accountId}/evaluations`, { params }),
+    enabled: Boolean(accountId),
+  });
+}
+
+export function usePolicyEvaluations(policyId, params = {}) {
+  return useQuery({
+    queryKey: [...queryKeys.evaluations, "policy", policyId, params],
+    queryFn: () => apiClient.get(`policies/${policyId}/evaluations`, { params }),
+    enabled: Boolean(policyId),
+  });
+}
+
 export function useLogin() {
   return useMutation({
     mutationFn: (payload) => apiClient.post("auth/login", payload),
@@ -108,10 +179,53 @@ export function useSignup() {
 }
 
 export function useNotifications() {
-  return useQuery({
+  const client = useQueryClient();
+  const query = useQuery({
     queryKey: queryKeys.notifications,
     queryFn: () => apiClient.get("notifications"),
-    refetchInterval: 30000, // Refetch every 30 seconds
+    staleTime: Infinity, // Kept current by the event stream below
+  });
+  const loaded = query.isSuccess;
+
+  useEffect(() => {
+    if (!loaded) return undefined;
+    // Start after the newest notification we already have; on reconnect the
+    // browser resumes from the last received event via Last-Event-ID.
+    const latest = (client.getQueryData(queryKeys.notifications) || []).reduce(
+      (max, item) => Math.max(max, item.id),
+      0
+    );
+    const source = new EventSource(`${baseURL}/notifications/stream?last_event_id=${latest}`);
+    source.addEventListener("notification", (event) => {
+      const notification = JSON.parse(event.data);
+      // A known id is a repeat of a deduplicated notification: it comes back
+      // to the top with its new count, unread again.
+      const known = (client.getQueryData(queryKeys.notifications) || []).find(
+        (item) => item.id === notification.id
+      );
+      if (known && known.occurrences >= notification.occurrences) return;
+      client.setQueryData(queryKeys.notifications, (data = []) => [
+        notification,
+        ...data.filter((item) => item.id !== notification.id),
+      ]);
+      if (!notification.is_read && (!known || known.is_read)) {
+        client.setQueryData(queryKeys.unreadNotifications, (data) =>
+          data ? { unread: data.unread + 1 } : data
+        );
+      }
+    });
+    return () => source.close();
+  }, [client, loaded]);
+
+  return query;
+}
+
+export function useUnreadNotificationCount() {
+  return useQuery({
+    queryKey: queryKeys.unreadNotifications,
+    queryFn: () => apiClient.get("notifications/unread-count"),
+    select: (data) => data.unread,
+    staleTime: Infinity, // Adjusted by the event stream and the read mutations
   });
 }
 
@@ -130,17 +244,27 @@ export function useMarkNotificationRead() {
     onMutate: async (notificationId) => {
       await client.cancelQueries({ queryKey: queryKeys.notifications });
       const previous = client.getQueryData(queryKeys.notifications);
+      const previousUnread = client.getQueryData(queryKeys.unreadNotifications);
+      const wasUnread = (previous || []).some((item) => item.id === notificationId && !item.is_read);
       client.setQueryData(queryKeys.notifications, (data = []) =>
         data.map((item) =>
           item.id === notificationId ? { ...item, is_read: true } : item
         )
       );
-      return { previous };
+      if (wasUnread && previousUnread) {
+        client.setQueryData(queryKeys.unreadNotifications, {
+          unread: Math.max(previousUnread.unread - 1, 0),
+        });
+      }
+      return { previous, previousUnread };
     },
     onError: (_error, _notificationId, context) => {
       if (context?.previous) {
         client.setQueryData(queryKeys.notifications, context.previous);
       }
+      if (context?.previousUnread) {
+        client.setQueryData(queryKeys.unreadNotifications, context.previousUnread);
+      }
     },
     onSettled: () => client.invalidateQueries({ queryKey: queryKeys.notifications }),
   });
@@ -153,15 +277,20 @@ export function useMarkAllNotificationsRead() {
     onMutate: async () => {
       await client.cancelQueries({ queryKey: queryKeys.notifications });
       const previous = client.getQueryData(queryKeys.notifications);
+      const previousUnread = client.getQueryData(queryKeys.unreadNotifications);
       client.setQueryData(queryKeys.notifications, (data = []) =>
         data.map((item) => ({ ...item, is_read: true }))
       );
-      return { previous };
+      client.setQueryData(queryKeys.unreadNotifications, { unread: 0 });
+      return { previous, previousUnread };
     },
     onError: (_error, _variables, context) => {
       if (context?.previous) {
         client.setQueryData(queryKeys.notifications, context.previous);
       }
+      if (context?.previousUnread) {
+        client.setQueryData(queryKeys.unreadNotifications, context.previousUnread);
+      }
     },
     onSettled: () => client.invalidateQueries({ queryKey: queryKeys.notifications }),
   });